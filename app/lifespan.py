@@ -0,0 +1,101 @@
+"""
+Application startup and shutdown.
+
+On startup the Redis pool, the OpenAI client and the transcript proxy
+clients are created and warmed up in parallel, so the first request after
+a deploy or scale-out doesn't pay for imports, connection setup and TLS
+handshakes. A warmup step that fails (Redis down, no API key, proxy
+unreachable) is logged and skipped; the app starts regardless, bounded by
+``startup_warmup_timeout_seconds``.
+
+Batch job workers are started once warmup is done, after re-queueing
+items abandoned by workers that crashed. On shutdown, background work is
+stopped and connections are closed.
+"""
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+from fastapi import FastAPI
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+async def _warm_redis() -> None:
+    from app.services.cache import cache_service
+
+    await cache_service.warm(connections=settings.redis_warm_connections)
+
+async def _warm_openai() -> None:
+    from app.routers.transcript import get_summarizer_service
+
+    # Constructing the client imports openai; keep that off the event loop
+    summarizer = await asyncio.to_thread(get_summarizer_service)
+    await summarizer.warm()
+
+async def _warm_proxies() -> None:
+    from app.services.youtube_service import proxy_pool
+
+    await proxy_pool.warm()
+
+WARMUP_STEPS: Dict[str, Callable[[], Awaitable[None]]] = {
+    "redis": _warm_redis,
+    "openai": _warm_openai,
+    "proxies": _warm_proxies,
+}
+
+async def warm_up() -> Dict[str, Optional[float]]:
+    """
+    Run all warmup steps concurrently. Returns the seconds each step took,
+    or None for steps that failed.
+    """
+    async def timed(name: str, step: Callable[[], Awaitable[None]]) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            await step()
+        except Exception as e:
+            logger.warning("startup warmup step failed", extra={"step": name, "error": type(e).__name__})
+            return None
+        return time.perf_counter() - start
+
+    results = await asyncio.gather(*(timed(name, step) for name, step in WARMUP_STEPS.items()))
+    durations = dict(zip(WARMUP_STEPS, results))
+    logger.info("startup warmup finished", extra={"durations": durations})
+    return durations
+
+async def start_background() -> None:
+    """Re-queue abandoned job items and start the job workers."""
+    from app.routers import jobs
+
+    await jobs.job_queue.recover()
+    jobs.job_queue.start()
+
+async def shut_down() -> None:
+    """Stop background workers, flush buffered state and close connections."""
+    from app.routers import jobs, transcript
+    from app.services.cache import cache_service
+    from app.services.youtube_service import fetch_executor
+
+    await jobs.job_queue.stop()
+    await transcript.summary_refresher.stop()
+    try:
+        await transcript.summary_refresher.flush()
+    except Exception as e:
+        logger.warning("access count flush failed", extra={"error": type(e).__name__})
+    if transcript._summarizer_service is not None:
+        await transcript._summarizer_service.close()
+    await cache_service.close()
+    fetch_executor.shutdown()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.startup_warmup:
+        try:
+            await asyncio.wait_for(warm_up(), settings.startup_warmup_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning("startup warmup timed out", extra={"timeout": settings.startup_warmup_timeout_seconds})
+    await start_background()
+    yield
+    await shut_down()
@@ -1,13 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import health, metrics, transcript
+from app.lifespan import lifespan
+from app.routers import health, jobs, metrics, summary, transcript
 
 app = FastAPI(
     title="FastAPI Transcript Summarizer",
     description="A FastAPI application that fetches YouTube video transcripts and summarizes them using OpenAI's API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -18,9 +20,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.middleware("http")(metrics.track_requests)
+
 app.include_router(health.router)
 app.include_router(metrics.router)
 app.include_router(transcript.router)
+app.include_router(summary.router)
+app.include_router(jobs.router)
 
 @app.get(
     "/",
@@ -0,0 +1,130 @@
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from app.routers.transcript import summarize_video
+from app.services.cache import cache_service
+from app.services.jobs import JobQueue, build_job_backend
+from app.services.youtube_service import extract_video_id
+from app.config import get_settings
+
+settings = get_settings()
+
+router = APIRouter(tags=["Jobs"])
+job_queue = JobQueue(build_job_backend(), processor=summarize_video, workers=settings.job_workers)
+
+class BatchRequest(BaseModel):
+    url_or_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.job_max_items,
+        description="YouTube video URLs or video IDs",
+        json_schema_extra={"example": ["https://www.youtube.com/watch?v=dQw4w9WgXcQ", "https://youtu.be/9bZkp7q19f0"]}
+    )
+    language: str = Field(
+        "en",
+        min_length=2,
+        max_length=16,
+        description="Transcript language for every video (ISO 639-1 code, e.g. en, de, pt-BR)",
+    )
+
+class BatchResponse(BaseModel):
+    job_id: str = Field(..., description="ID to poll with GET /jobs/{job_id}")
+    items: int = Field(..., description="Number of distinct videos in the job")
+
+class JobItem(BaseModel):
+    video_id: str = Field(..., description="Normalized video ID (or the raw input if it was invalid)")
+    status: str = Field(..., description="queued, running, done or failed")
+    summary: Optional[str] = Field(None, description="Summary, once done")
+    error: Optional[str] = Field(None, description="Failure reason, if failed")
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str = Field(..., description="queued, running or done (all items finished)")
+    created_at: float = Field(..., description="Unix timestamp")
+    counts: Dict[str, int] = Field(..., description="Number of items per status")
+    items: List[JobItem]
+
+@router.post(
+    "/summarize/batch",
+    response_model=BatchResponse,
+    status_code=202,
+    summary="Summarize Many Transcripts",
+    description="Queue many YouTube videos for summarization and return a job ID to poll",
+    responses={
+        202: {"description": "Job accepted"},
+        422: {"description": "Validation error - invalid request format"}
+    }
+)
+async def summarize_batch(request: BatchRequest):
+    """
+    Queue a batch of videos for background summarization.
+
+    Inputs are normalized to video IDs and de-duplicated, and every video
+    is summarized in ``language``. Videos with a cached summary are marked
+    done immediately. Videos already queued or running for another job are
+    not summarized twice; both jobs receive the result. Invalid inputs are
+    reported as failed items (once each).
+
+    Args:
+        request: BatchRequest containing YouTube URLs or video IDs
+
+    Returns:
+        BatchResponse: The job ID and number of distinct videos
+    """
+    video_ids: List[str] = []
+    invalid: List[str] = []
+    for url_or_id in request.url_or_ids:
+        try:
+            video_id = extract_video_id(url_or_id)
+        except ValueError:
+            if url_or_id not in invalid:
+                invalid.append(url_or_id)
+            continue
+        if video_id not in video_ids:
+            video_ids.append(video_id)
+
+    try:
+        # One MGET for the whole batch; cached videos finish immediately
+        cached = await cache_service.get_summaries(video_ids, request.language)
+        done = {video_id: summary for video_id, summary in cached.items() if summary}
+        job_id = await job_queue.submit(video_ids, language=request.language, invalid=invalid, done=done)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Job queue unavailable: {type(e).__name__}")
+    return BatchResponse(job_id=job_id, items=len(video_ids) + len(invalid))
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    summary="Get Job Status",
+    description="Get the status and per-video results of a batch summarization job",
+    responses={
+        404: {
+            "description": "Unknown or expired job",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Job not found"}
+                }
+            }
+        }
+    }
+)
+async def get_job(job_id: str):
+    """
+    Get the status of a batch job.
+
+    Args:
+        job_id: ID returned by POST /summarize/batch
+
+    Returns:
+        JobResponse: Overall status, per-status counts and per-item results
+
+    Raises:
+        HTTPException: 404 if the job is unknown or expired, 503 if the job store is down
+    """
+    try:
+        job = await job_queue.get(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Job queue unavailable: {type(e).__name__}")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(**job)
@@ -1,5 +1,9 @@
-from fastapi import APIRouter, Response
-from prometheus_client import Counter, generate_latest
+import os
+import time
+from fastapi import APIRouter, Request, Response
+from starlette.routing import Match
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, generate_latest, multiprocess
+from app.services.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_LATENCY
 
 router = APIRouter(tags=["Monitoring"])
 
@@ -18,15 +22,39 @@ async def get_metrics():
     
     Returns Prometheus-formatted metrics including request counts and other application metrics.
     This endpoint is typically used by monitoring systems like Prometheus or Grafana.
+    With PROMETHEUS_MULTIPROC_DIR set, metrics are aggregated across all worker processes.
     
     Returns:
         Response: Prometheus-formatted metrics text
     """
-    REQUEST_COUNT.labels(method="GET", endpoint="/metrics").inc()
-    return Response(content=generate_latest(), media_type="text/plain")
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
-# @router.middleware("http")
-# async def track_requests(request, call_next):
-#     response = await call_next(request)
-#     REQUEST_COUNT.labels(method=request.method, endpoint=request.url.path).inc()
-#     return response
\ No newline at end of file
+async def track_requests(request: Request, call_next):
+    """HTTP middleware recording request counts, latency and in-flight requests per route."""
+    # Label by route template (e.g. /jobs/{job_id}), not raw path, to keep cardinality bounded
+    path = _match_route(request)
+    in_flight = HTTP_IN_FLIGHT.labels(route=path)
+    in_flight.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        in_flight.dec()
+        HTTP_REQUEST_LATENCY.labels(method=request.method, route=path, status=str(status)).observe(
+            time.perf_counter() - start
+        )
+        REQUEST_COUNT.labels(method=request.method, endpoint=path).inc()
+
+def _match_route(request: Request) -> str:
+    for route in request.app.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", request.url.path)
+    return "unmatched"
@@ -0,0 +1,101 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from app.routers.transcript import get_cached_summary
+from app.services.cache import summary_content_hash
+from app.services.local_cache import LocalCache
+from app.services.youtube_service import extract_video_id
+from app.utils.http import choose_encoding, compress, etag_matches, json_bytes
+from app.config import get_settings
+
+settings = get_settings()
+
+router = APIRouter(tags=["Transcript"])
+
+# Serialized (and compressed) bodies by content hash; a hash never changes meaning
+_bodies = LocalCache(max_bytes=settings.http_body_cache_bytes, default_ttl_seconds=60 * 60)
+
+@router.get(
+    "/summary/{video_id}",
+    summary="Get Cached Summary",
+    description="Read an already computed summary; cacheable by CDNs and supports conditional requests",
+    responses={
+        200: {
+            "description": "The cached summary, in the same shape as POST /summarize",
+            "headers": {
+                "ETag": {"description": "Hash of the summary content"},
+                "Cache-Control": {"description": "Public caching policy"},
+            }
+        },
+        304: {"description": "Not modified - the client's copy (If-None-Match) is current"},
+        404: {
+            "description": "No summary cached for this video; use POST /summarize to create one",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Summary not found"}
+                }
+            }
+        }
+    }
+)
+async def get_summary(
+    video_id: str,
+    language: str = Query("en", min_length=2, max_length=16, description="Summary language"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """
+    Return a cached summary without summarizing anything.
+
+    The ``ETag`` is the stored content hash of the summary, so a client or
+    CDN revalidating with ``If-None-Match`` gets an empty 304 while the
+    summary is unchanged. Large bodies are compressed with brotli (when
+    installed) or gzip, according to ``Accept-Encoding``. Stale summaries are
+    served and refreshed in the background, as with POST /summarize.
+
+    Args:
+        video_id: YouTube video ID (or URL)
+        language: Summary language
+
+    Returns:
+        Response: JSON ``{"summary", "chapters"}``, or 304
+
+    Raises:
+        HTTPException: 404 if no summary is cached for the video
+    """
+    try:
+        video_id = extract_video_id(video_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Summary not found")
+
+    entry = await get_cached_summary(video_id, language)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Summary not found")
+
+    content_hash = entry.content_hash or summary_content_hash(entry.summary, entry.chapters)
+    # Weak: the gzip, brotli and identity representations share one tag
+    etag = f'W/"{content_hash}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.summary_http_max_age_seconds}, "
+            f"stale-while-revalidate={settings.summary_http_stale_while_revalidate_seconds}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    body = _bodies.get(content_hash)
+    if body is None:
+        body = json_bytes({"summary": entry.summary, "chapters": entry.chapters})
+        _bodies.set(content_hash, body)
+    encoding = choose_encoding(accept_encoding) if len(body) >= settings.http_compress_min_bytes else None
+    if encoding is not None:
+        key = f"{content_hash}:{encoding}"
+        encoded = _bodies.get(key)
+        if encoded is None:
+            encoded = compress(body, encoding)
+            _bodies.set(key, encoded)
+        body = encoded
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
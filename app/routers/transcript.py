@@ -1,13 +1,22 @@
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from app.services.cache import cache_service
+from app.services import duplicates
+from app.services.cache import SummaryEntry, cache_service
+from app.services.fetch_executor import FetchPoolSaturated, FetchTimeout
 from app.services.summarizer import SummarizerService
-from app.services.youtube_service import YouTubeService
+from app.services.singleflight import SingleFlight
+from app.services.summary_refresh import SummaryRefresher
+from app.services.youtube_service import TranscriptNotFound, YouTubeService, extract_video_id
 
 router = APIRouter(tags=["Transcript"])
 cache_svc = cache_service
 _summarizer_service = None
 youtube_service = YouTubeService()
+summarize_flight = SingleFlight("summarize")
 
 def get_summarizer_service():
     """Lazy-load summarizer service to avoid startup errors if OpenAI key is not set."""
@@ -22,9 +31,36 @@ class TranscriptRequest(BaseModel):
         description="YouTube video URL or video ID",
         json_schema_extra={"example": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"}
     )
+    language: str = Field(
+        "en",
+        min_length=2,
+        max_length=16,
+        description="Preferred transcript language (ISO 639-1 code, e.g. en, de, pt-BR)",
+    )
+    languages: Optional[List[str]] = Field(
+        None,
+        max_length=10,
+        description=(
+            "Fallback languages, in order of preference, tried after `language`. "
+            "If the video has none of them, a translated transcript is used."
+        ),
+        json_schema_extra={"example": ["de", "fr"]}
+    )
+
+    def preferences(self) -> List[str]:
+        """``language`` followed by ``languages``, without duplicates."""
+        return list(dict.fromkeys([self.language, *(self.languages or [])]))
+
+class Chapter(BaseModel):
+    start: float = Field(..., description="Start of the section, in seconds")
+    end: float = Field(..., description="End of the section, in seconds")
+    summary: str = Field(..., description="Summary of this section of the video")
 
 class TranscriptResponse(BaseModel):
     summary: str = Field(..., description="The summarized transcript of the YouTube video")
+    chapters: Optional[List[Chapter]] = Field(
+        None, description="Timestamped summaries of consecutive sections, when available"
+    )
 
 @router.post(
     "/summarize",
@@ -37,7 +73,10 @@ class TranscriptResponse(BaseModel):
             "content": {
                 "application/json": {
                     "example": {
-                        "summary": "This video discusses the main topics covered in the transcript..."
+                        "summary": "This video discusses the main topics covered in the transcript...",
+                        "chapters": [
+                            {"start": 0.0, "end": 612.4, "summary": "The host introduces..."}
+                        ]
                     }
                 }
             }
@@ -60,6 +99,12 @@ class TranscriptResponse(BaseModel):
         },
         422: {
             "description": "Validation error - invalid request format"
+        },
+        503: {
+            "description": "Transcript fetch pool is saturated; retry later"
+        },
+        504: {
+            "description": "Transcript fetch timed out"
         }
     }
 )
@@ -69,10 +114,16 @@ async def summarize_transcript(request: TranscriptRequest):
     
     This endpoint:
     1. Checks cache for existing summary
-    2. Fetches the transcript from YouTube if not cached
+    2. Fetches the transcript from YouTube if not cached, in the first
+       available of ``language`` and ``languages`` (or translated into one)
     3. Summarizes the transcript using OpenAI API
     4. Caches the result for future requests
     
+    A transcript that is a near-duplicate of an already summarized video
+    (re-upload, mirror) reuses that video's summary instead of step 3.
+    
+    Concurrent requests for the same video share a single fetch and summarization.
+    
     Args:
         request: TranscriptRequest containing YouTube URL or video ID
         
@@ -82,21 +133,247 @@ async def summarize_transcript(request: TranscriptRequest):
     Raises:
         HTTPException: 404 if transcript not found, 400 for other errors
     """
-    cache_key = request.url_or_id
-    cached_summary = await cache_svc.get_summary(cache_key)
-    
-    if cached_summary:
-        return TranscriptResponse(summary=cached_summary)
+    try:
+        video_id = extract_video_id(request.url_or_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+
+    language = await resolve_summary_language(video_id, request.preferences(), request.url_or_id)
+    summary, chapters = await summarize_video_with_chapters(video_id, language, url_or_id=request.url_or_id)
+    return TranscriptResponse(summary=summary, chapters=chapters)
+
+async def resolve_summary_language(video_id: str, languages: List[str], url_or_id: Optional[str] = None) -> str:
+    """
+    Language to summarize a video in, given languages in order of preference.
+
+    A single language is used as is (the fetch falls back to a translation
+    by itself). With fallbacks, a cached summary in the first language wins;
+    otherwise the video's caption tracks (cached per video) decide. Raises
+    HTTPException when the video has no usable transcript.
+    """
+    if len(languages) == 1:
+        return languages[0]
+    if await cache_svc.get_summary_entry(video_id, languages[0], url_or_id=url_or_id) is not None:
+        return languages[0]
+    try:
+        return await youtube_service.resolve_language(video_id, languages)
+    except TranscriptNotFound:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+    except FetchPoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except FetchTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def summarize_video(video_id: str, language: str = "en", url_or_id: Optional[str] = None) -> str:
+    """Summary text for a video; see ``summarize_video_with_chapters``."""
+    summary, _ = await summarize_video_with_chapters(video_id, language, url_or_id)
+    return summary
+
+async def summarize_video_with_chapters(
+    video_id: str, language: str = "en", url_or_id: Optional[str] = None
+) -> Tuple[str, Optional[List[Dict]]]:
+    """
+    Return the summary and timed chapters for a video: from cache, or by
+    joining/starting a coalesced fetch-and-summarize run. Raises
+    HTTPException on failure. Chapters are None for summaries cached before
+    they were recorded.
+
+    A cached summary past its soft TTL is still returned, and a background
+    refresh is scheduled.
+    """
+    summary_refresher.record_access(video_id, language)
+    cached = await _cached_entry(video_id, language, url_or_id)
+    if cached:
+        return cached.summary, cached.chapters
+
+    return await summarize_flight.do(
+        f"{video_id}:{language}",
+        lambda: _fetch_and_summarize(video_id, language),
+        check=lambda: _lookup_summary(video_id, language),
+    )
+
+async def _lookup_summary(video_id: str, language: str) -> Optional[Tuple[str, Optional[List[Dict]]]]:
+    """Summary written by another worker, for distributed single-flight waiters."""
+    entry = await cache_svc.get_summary_entry(video_id, language)
+    return (entry.summary, entry.chapters) if entry is not None else None
+
+async def get_cached_summary(video_id: str, language: str = "en") -> Optional[SummaryEntry]:
+    """
+    Cached summary entry for read-only paths, or None on a miss. Counts the
+    access towards pre-warming and refreshes stale entries in the background.
+    """
+    summary_refresher.record_access(video_id, language)
+    return await _cached_entry(video_id, language, None)
+
+async def _cached_entry(video_id: str, language: str, url_or_id: Optional[str]) -> Optional[SummaryEntry]:
+    """Cached summary entry (stale-while-revalidate), or None on a miss."""
+    entry = await cache_svc.get_summary_entry(video_id, language, url_or_id=url_or_id)
+    if entry is None:
+        return None
+    if entry.is_stale():
+        summary_refresher.schedule(video_id, language)
+    return entry
+
+async def _refresh_summary(video_id: str, language: str) -> Tuple[str, List[Dict]]:
+    # Shares the run with any request that misses the cache meanwhile
+    return await summarize_flight.do(
+        f"{video_id}:{language}",
+        lambda: _fetch_and_summarize(video_id, language),
+    )
+
+summary_refresher = SummaryRefresher(refresh=_refresh_summary)
+
+async def _fetch_and_summarize(
+    video_id: str, language: str, emit: Optional[Callable[[Dict], None]] = None
+) -> Tuple[str, List[Dict]]:
+    """
+    Fetch, summarize and cache a transcript; shared by coalesced requests.
 
+    With ``emit``, the summary is streamed and progress events (everything
+    but the final "summary" event) are passed to it as they happen.
+    """
     try:
-        transcript = await youtube_service.fetch_transcript(request.url_or_id)
-        if not transcript:
+        segments = await youtube_service.fetch_transcript_segments(video_id, language)
+        if not segments:
             raise HTTPException(status_code=404, detail="Transcript not found")
+        if emit is not None:
+            emit({
+                "event": "transcript",
+                "chars": sum(len(s["text"]) for s in segments),
+                "duration": _transcript_duration(segments),
+            })
+        reused, fingerprint = await duplicates.reuse_summary(video_id, language, segments)
+        if reused is not None:
+            return reused
         summarizer_service = get_summarizer_service()
-        summary = await summarizer_service.summarize_transcript(transcript)
-        await cache_svc.set_summary(cache_key, summary)
-        return TranscriptResponse(summary=summary)
+        if emit is None:
+            summary, chapters = await summarizer_service.summarize_segments(segments)
+        else:
+            async for event in summarizer_service.summarize_transcript_stream(segments):
+                if event["event"] == "summary":
+                    summary, chapters = event["summary"], event.get("chapters")
+                else:
+                    emit(event)
+        await cache_svc.set_summary(video_id, summary, language, chapters=chapters)
+        await duplicates.remember(video_id, language, fingerprint)
+        return summary, chapters
     except HTTPException:
         raise
+    except FetchPoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except FetchTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post(
+    "/summarize/stream",
+    summary="Summarize Transcript (streaming)",
+    description="Fetch and summarize a YouTube video transcript, streaming progress as NDJSON",
+    responses={
+        200: {
+            "description": "Newline-delimited JSON events",
+            "content": {
+                "application/x-ndjson": {
+                    "example": (
+                        '{"event": "transcript", "chars": 48213, "duration": 3012.5}\n'
+                        '{"event": "chunks", "count": 5}\n'
+                        '{"event": "chunk", "index": 2, "summary": "...", "start": 1204.1, "end": 1810.7}\n'
+                        '{"event": "delta", "text": "This video"}\n'
+                        '{"event": "summary", "summary": "This video discusses...", "chapters": [...]}\n'
+                    )
+                }
+            }
+        },
+        404: {
+            "description": "Invalid YouTube URL or video ID"
+        }
+    }
+)
+async def summarize_transcript_stream(request: TranscriptRequest):
+    """
+    Summarize a YouTube video transcript, streaming progress as it happens.
+    
+    Emits one JSON object per line:
+    - ``transcript``: the transcript was fetched (with its length and duration)
+    - ``chunks``: number of chunks being summarized
+    - ``chunk``: a chunk summary with its ``start``/``end`` time, in completion order
+    - ``delta``: a token of the final reduce step
+    - ``summary``: the final summary with timed ``chapters`` (always the last event on success)
+    - ``error``: the pipeline failed; carries ``status`` and ``detail``
+    
+    Cached summaries are returned as a single ``summary`` event.
+    
+    Args:
+        request: TranscriptRequest containing YouTube URL or video ID
+        
+    Returns:
+        StreamingResponse: NDJSON event stream
+    """
+    try:
+        video_id = extract_video_id(request.url_or_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+
+    return StreamingResponse(
+        _ndjson(_summarize_events(video_id, request.preferences(), request.url_or_id)),
+        media_type="application/x-ndjson",
+    )
+
+async def _summarize_events(video_id: str, languages: List[str], url_or_id: str) -> AsyncIterator[Dict]:
+    try:
+        language = await resolve_summary_language(video_id, languages, url_or_id)
+    except HTTPException as e:
+        yield {"event": "error", "status": e.status_code, "detail": e.detail}
+        return
+
+    summary_refresher.record_access(video_id, language)
+    cached = await _cached_entry(video_id, language, url_or_id)
+    if cached:
+        yield _summary_event(cached.summary, cached.chapters)
+        return
+
+    # The streamed run is registered in the single-flight, so concurrent /summarize
+    # calls and refreshes share it. If a run is already in flight, only its
+    # result is streamed (no progress events).
+    events: "asyncio.Queue[Dict]" = asyncio.Queue()
+    run = asyncio.ensure_future(summarize_flight.do(
+        f"{video_id}:{language}",
+        lambda: _fetch_and_summarize(video_id, language, emit=events.put_nowait),
+        check=lambda: _lookup_summary(video_id, language),
+    ))
+    try:
+        while not run.done():
+            next_event = asyncio.ensure_future(events.get())
+            await asyncio.wait({run, next_event}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                yield next_event.result()
+            else:
+                next_event.cancel()
+        while not events.empty():
+            yield events.get_nowait()
+        try:
+            summary, chapters = run.result()
+        except HTTPException as e:
+            yield {"event": "error", "status": e.status_code, "detail": e.detail}
+            return
+        yield _summary_event(summary, chapters)
+    finally:
+        # The shared run is shielded; this only stops waiting for it
+        run.cancel()
+
+def _summary_event(summary: str, chapters: Optional[List[Dict]]) -> Dict:
+    event = {"event": "summary", "summary": summary}
+    if chapters is not None:
+        event["chapters"] = chapters
+    return event
+
+def _transcript_duration(segments: List[Dict]) -> float:
+    last = segments[-1]
+    return round(float(last["start"]) + float(last.get("duration", 0.0)), 2)
+
+async def _ndjson(events: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    async for event in events:
+        yield (json.dumps(event) + "\n").encode("utf-8")
@@ -1,78 +1,549 @@
-from typing import Any, Optional
-import redis.asyncio as redis
+from typing import (
+    TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple,
+    TypeVar,
+)
+import asyncio
+import hashlib
 import json
+import logging
+import time
+import uuid
 from app.config import get_settings
+from app.services import cache_keys
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.local_cache import LocalCache
+from app.services.metrics import CACHE_REQUESTS
+from app.utils.transcript_codec import CompactTranscript, encode_transcript, is_encoded_transcript
+
+if TYPE_CHECKING:
+    import redis.asyncio as redis
 
 settings = get_settings()
 
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Opens after repeated connection failures so a down Redis costs nothing per request
+redis_breaker = CircuitBreaker(
+    "redis",
+    failure_threshold=settings.redis_breaker_failure_threshold,
+    reset_timeout_seconds=settings.redis_breaker_reset_seconds,
+)
+
+def _build_redis_client(decode_responses: bool) -> "redis.Redis":
+    # Imported on first use: redis is not needed to serve /health
+    import redis.asyncio as redis
+
+    pool = redis.ConnectionPool.from_url(
+        str(settings.redis_url),
+        decode_responses=decode_responses,
+        max_connections=settings.redis_max_connections,
+        socket_timeout=settings.redis_socket_timeout_seconds,
+        socket_connect_timeout=settings.redis_connect_timeout_seconds,
+        health_check_interval=settings.redis_health_check_interval_seconds,
+    )
+    return redis.Redis(connection_pool=pool)
+
 # Global Redis client instance
-_redis_client: Optional[redis.Redis] = None
+_redis_client: Optional["redis.Redis"] = None
 
-async def get_redis_client() -> redis.Redis:
+async def get_redis_client() -> "redis.Redis":
     """Get or create Redis client instance."""
     global _redis_client
     if _redis_client is None:
-        _redis_client = redis.from_url(
-            str(settings.redis_url),
-            decode_responses=True
-        )
+        _redis_client = _build_redis_client(decode_responses=True)
     return _redis_client
 
+# Separate client for binary values (compact transcripts); decode_responses must be off.
+_binary_redis_client: Optional["redis.Redis"] = None
+
+async def get_binary_redis_client() -> "redis.Redis":
+    """Get or create the Redis client used for binary values."""
+    global _binary_redis_client
+    if _binary_redis_client is None:
+        _binary_redis_client = _build_redis_client(decode_responses=False)
+    return _binary_redis_client
+
+async def close_redis_clients() -> None:
+    """Close both Redis clients and their connection pools; they are rebuilt on next use."""
+    global _redis_client, _binary_redis_client
+    clients = [c for c in (_redis_client, _binary_redis_client) if c is not None]
+    _redis_client = _binary_redis_client = None
+    for client in clients:
+        await client.aclose()
+
+async def _guarded(operation: Callable[[], Awaitable[T]]) -> T:
+    """Run a Redis operation through the circuit breaker."""
+    redis_breaker.before_call()
+    answered = False
+    try:
+        result = await operation()
+        answered = True
+        return result
+    except Exception as e:
+        if _is_connection_error(e):
+            redis_breaker.record_failure()
+        else:
+            # Redis answered (e.g. a ResponseError); the connection is fine
+            answered = True
+        raise
+    finally:
+        if answered:
+            redis_breaker.record_success()
+        else:
+            # Failed, cancelled or interrupted: never leave a half-open trial pending
+            redis_breaker.release_trial()
+
+def _is_connection_error(e: Exception) -> bool:
+    from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+    return isinstance(e, (RedisConnectionError, RedisTimeoutError, OSError))
+
+def _log_redis_error(message: str, key: str, e: Exception) -> None:
+    # An open circuit is expected while Redis is down; don't log it per request
+    level = logging.DEBUG if isinstance(e, CircuitOpenError) else logging.WARNING
+    logger.log(level, message, extra={"key": key, "error": type(e).__name__})
+
+class SummaryEntry(NamedTuple):
+    """
+    A cached summary, the time after which it should be refreshed, its timed
+    chapters and a hash of its content (None for entries stored before hashes).
+    """
+    summary: str
+    soft_expires_at: Optional[float]
+    chapters: Optional[List[Dict]] = None
+    content_hash: Optional[str] = None
+
+    def is_stale(self, ahead_seconds: float = 0) -> bool:
+        """Past (or within ``ahead_seconds`` of) its soft TTL; entries without metadata count as stale."""
+        return self.soft_expires_at is None or time.time() + ahead_seconds >= self.soft_expires_at
+
+def summary_content_hash(summary: str, chapters: Optional[List[Dict]] = None) -> str:
+    """Short hash of a summary and its chapters; changes whenever either does."""
+    payload = json.dumps([summary, chapters], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+def _wrap_summary(summary: str, chapters: Optional[List[Dict]] = None) -> str:
+    data = {
+        "summary": summary,
+        "soft_expires_at": time.time() + settings.cache_soft_ttl_summary_seconds,
+    }
+    if chapters is not None:
+        data["chapters"] = chapters
+    data["content_hash"] = summary_content_hash(summary, chapters)
+    return json.dumps(data)
+
+def _unwrap_summary(raw: Optional[str]) -> Optional[SummaryEntry]:
+    """Parse a stored summary; plain-text values from before soft TTLs have no expiry."""
+    if not raw:
+        return None
+    if raw.startswith('{"summary":'):
+        try:
+            data = json.loads(raw)
+            return SummaryEntry(
+                data["summary"], data.get("soft_expires_at"), data.get("chapters"), data.get("content_hash")
+            )
+        except (ValueError, KeyError):
+            pass
+    return SummaryEntry(raw, None)
+
 class CacheService:
+    """
+    Two-tier cache: a bounded in-process LRU (L1) in front of Redis (L2).
+
+    Reads check L1 first, then Redis, populating L1 on a Redis hit. Writes go
+    through to both. If Redis is unreachable, expired L1 entries are still
+    served rather than turning every request into a miss. With
+    ``cache_l1_invalidation`` enabled, writes are broadcast on a Redis pub/sub
+    channel so other workers drop their L1 copy; otherwise L1 staleness is
+    bounded by ``cache_l1_ttl_seconds``.
+    """
+
     def __init__(self):
-        self._redis_client: Optional[redis.Redis] = None
+        self._redis_client: Optional["redis.Redis"] = None
+        self._local = LocalCache(
+            max_bytes=settings.cache_l1_max_bytes,
+            default_ttl_seconds=settings.cache_l1_ttl_seconds,
+        )
+        self._instance_id = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
 
-    async def _get_client(self) -> redis.Redis:
+    async def _get_client(self) -> "redis.Redis":
         """Get Redis client."""
         if self._redis_client is None:
             self._redis_client = await get_redis_client()
+        if settings.cache_l1_invalidation and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen_for_invalidations())
         return self._redis_client
 
-    async def get_transcript(self, video_id: str) -> Optional[str]:
-        """Get cached transcript."""
+    async def warm(self, connections: int = 1) -> None:
+        """
+        Open ``connections`` pooled connections on each Redis client, so the
+        first requests don't pay for connection setup. Raises if Redis is down.
+        """
+        client = await self._get_client()
+        binary_client = await get_binary_redis_client()
+        await asyncio.gather(*(
+            _guarded(c.ping) for c in (client, binary_client) for _ in range(max(1, connections))
+        ))
+
+    async def close(self) -> None:
+        """Stop the invalidation listener and close Redis connections (L1 is kept)."""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
+        self._redis_client = None
+        await close_redis_clients()
+
+    async def _read(self, key: str, ttl: int, legacy_keys: Sequence[str] = (), binary: bool = False) -> Optional[Any]:
+        """Read through L1 and Redis; fall back to stale L1 data if Redis fails."""
+        kind = cache_keys.key_kind(key)
+        if settings.cache_l1_enabled:
+            result = self._local.get(key)
+            CACHE_REQUESTS.labels(tier="l1", kind=kind, result="miss" if result is None else "hit").inc()
+            if result is not None:
+                return result
+        try:
+            if binary:
+                result = await _guarded(lambda: self._get_transcript_blob(key, legacy_keys, ttl))
+            else:
+                result = await _guarded(lambda: self._get_aliased(key, legacy_keys, ttl))
+        except Exception as e:
+            # Redis not available - serve stale L1 data if we have it, else miss
+            CACHE_REQUESTS.labels(tier="redis", kind=kind, result="error").inc()
+            _log_redis_error("redis cache read failed", key, e)
+            return self._local.get(key, allow_stale=True) if settings.cache_l1_enabled else None
+        CACHE_REQUESTS.labels(tier="redis", kind=kind, result="miss" if result is None else "hit").inc()
+        if result is not None and settings.cache_l1_enabled:
+            self._local.set(key, result, ttl)
+        return result
+
+    async def _write(self, key: str, value: Any, ttl: int, binary: bool = False) -> None:
+        """Write through to L1 and Redis, and tell other workers to drop their L1 copy."""
+        if settings.cache_l1_enabled:
+            self._local.set(key, value, ttl)
         try:
             client = await self._get_client()
-            key = f"transcript:{video_id}"
-            result = await client.get(key)
-            return result
+            writer = await get_binary_redis_client() if binary else client
+            await _guarded(lambda: writer.set(key, value, ex=ttl))
+            if settings.cache_l1_invalidation:
+                await client.publish(cache_keys.invalidation_channel(), f"{self._instance_id} {key}")
         except Exception as e:
-            # Redis not available - return None (cache miss)
-            print(f"Redis cache miss (connection error): {type(e).__name__}")
-            return None
+            # Redis not available - cache write miss
+            _log_redis_error("redis cache write failed", key, e)
 
-    async def set_transcript(self, video_id: str, transcript: str) -> None:
-        """Cache transcript."""
+    async def _delete(self, key: str) -> None:
+        """Drop a key from L1 and Redis (and other workers' L1)."""
+        self._local.delete(key)
         try:
             client = await self._get_client()
-            key = f"transcript:{video_id}"
-            await client.set(key, transcript, ex=settings.cache_ttl_transcript_seconds)
+            await _guarded(lambda: client.delete(key))
+            if settings.cache_l1_invalidation:
+                await client.publish(cache_keys.invalidation_channel(), f"{self._instance_id} {key}")
         except Exception as e:
-            # Redis not available - silently fail (cache write miss)
-            print(f"Redis cache write failed (connection error): {type(e).__name__}")
-            pass
+            _log_redis_error("redis cache delete failed", key, e)
 
-    async def get_summary(self, key: str) -> Optional[str]:
-        """Get cached summary."""
+    async def get_many(self, keys: Iterable[str], ttl: int) -> Dict[str, Optional[str]]:
+        """
+        Bulk read: L1 first, then one MGET for the rest. Legacy keys are not
+        consulted. On Redis failure, missing keys fall back to stale L1 data.
+        """
+        results: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+        for key in keys:
+            value = self._local.get(key) if settings.cache_l1_enabled else None
+            if settings.cache_l1_enabled:
+                CACHE_REQUESTS.labels(tier="l1", kind=cache_keys.key_kind(key), result="miss" if value is None else "hit").inc()
+            results[key] = value
+            if value is None:
+                missing.append(key)
+        if not missing:
+            return results
         try:
             client = await self._get_client()
-            cache_key = f"summary:{key}"
-            result = await client.get(cache_key)
-            return result
+            values = await _guarded(lambda: client.mget(missing))
         except Exception as e:
-            # Redis not available - return None (cache miss)
-            print(f"Redis cache miss (connection error): {type(e).__name__}")
+            _log_redis_error("redis bulk read failed", missing[0], e)
+            for key in missing:
+                CACHE_REQUESTS.labels(tier="redis", kind=cache_keys.key_kind(key), result="error").inc()
+                if settings.cache_l1_enabled:
+                    results[key] = self._local.get(key, allow_stale=True)
+            return results
+        for key, value in zip(missing, values):
+            CACHE_REQUESTS.labels(tier="redis", kind=cache_keys.key_kind(key), result="miss" if value is None else "hit").inc()
+            results[key] = value
+            if value is not None and settings.cache_l1_enabled:
+                self._local.set(key, value, ttl)
+        return results
+
+    async def _get_aliased(self, key: str, legacy_keys: Sequence[str], ttl: int) -> Optional[str]:
+        """Get a key, falling back to legacy keys and migrating the first hit to ``key``."""
+        client = await self._get_client()
+        if not legacy_keys:
+            return await client.get(key)
+        # One round trip for the key and all its aliases
+        values = await client.mget([key, *legacy_keys])
+        if values[0] is not None:
+            return values[0]
+        for legacy_key, result in zip(legacy_keys, values[1:]):
+            if result is not None:
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.set(key, result, ex=ttl)
+                    pipe.delete(legacy_key)
+                    await pipe.execute()
+                return result
+        return None
+
+    async def _get_transcript_blob(self, key: str, legacy_keys: Sequence[str], ttl: int) -> Optional[bytes]:
+        """
+        Get an encoded transcript, converting values stored in older formats
+        (JSON segment lists or plain text) and rewriting them in place.
+        """
+        binary_client = await get_binary_redis_client()
+        result = await binary_client.get(key)
+        if result is not None and is_encoded_transcript(result):
+            return result
+        candidates = ([key] if result is not None else []) + list(legacy_keys)
+        if not candidates:
             return None
+        client = await self._get_client()
+        for candidate, raw in zip(candidates, await client.mget(candidates)):
+            if raw is None:
+                continue
+            data = encode_transcript(
+                cache_keys.legacy_transcript_to_segments(raw), settings.transcript_compression
+            )
+            await binary_client.set(key, data, ex=ttl)
+            if candidate != key:
+                await client.delete(candidate)
+            return data
+        return None
+
+    async def _listen_for_invalidations(self) -> None:
+        """Evict L1 entries written by other workers; reconnects on failure."""
+        channel = cache_keys.invalidation_channel()
+        while True:
+            try:
+                pubsub = self._redis_client.pubsub()
+                await pubsub.subscribe(channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    origin, _, key = message["data"].partition(" ")
+                    if origin != self._instance_id:
+                        self._local.delete(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("redis invalidation listener error", extra={"error": type(e).__name__})
+                await asyncio.sleep(1)
 
-    async def set_summary(self, key: str, summary: str) -> None:
-        """Cache summary."""
+    async def get_transcript_data(self, video_id: str, language: str = "en") -> Optional[CompactTranscript]:
+        """Get the cached transcript; segments and text are decoded lazily from one value."""
+        data = await self._read(
+            cache_keys.transcript_key(video_id, language),
+            settings.cache_ttl_transcript_seconds,
+            cache_keys.legacy_transcript_keys(video_id, language),
+            binary=True,
+        )
+        return CompactTranscript(data) if data is not None else None
+
+    async def get_transcript(self, video_id: str, language: str = "en") -> Optional[str]:
+        """Get cached transcript text."""
+        data = await self.get_transcript_data(video_id, language)
+        return data.text if data is not None else None
+
+    async def get_transcript_segments(self, video_id: str, language: str = "en") -> Optional[List[Dict]]:
+        """Get cached transcript segments (text/start/duration)."""
+        data = await self.get_transcript_data(video_id, language)
+        return data.segments if data is not None else None
+
+    async def set_transcript_segments(self, video_id: str, segments: List[Dict], language: str = "en") -> None:
+        """Cache transcript segments in the compact binary format."""
+        await self._write(
+            cache_keys.transcript_key(video_id, language),
+            encode_transcript(segments, settings.transcript_compression),
+            settings.cache_ttl_transcript_seconds,
+            binary=True,
+        )
+
+    async def set_transcript(self, video_id: str, transcript: str, language: str = "en") -> None:
+        """Cache transcript text without timing (stored as a single segment)."""
+        await self.set_transcript_segments(
+            video_id, [{"text": transcript, "start": 0.0, "duration": 0.0}], language
+        )
+
+    async def get_transcript_tracks(self, video_id: str) -> Optional[Dict]:
+        """Get the cached caption track listing (or negative result) for a video."""
+        raw = await self._read(cache_keys.transcript_tracks_key(video_id), settings.cache_ttl_transcript_tracks_seconds)
+        return json.loads(raw) if raw else None
+
+    async def set_transcript_tracks(self, video_id: str, tracks: Dict, ttl: Optional[int] = None) -> None:
+        """Cache a caption track listing; pass a short ``ttl`` for negative results."""
+        await self._write(
+            cache_keys.transcript_tracks_key(video_id),
+            json.dumps(tracks),
+            ttl or settings.cache_ttl_transcript_tracks_seconds,
+        )
+
+    async def delete_transcript_tracks(self, video_id: str) -> None:
+        """Forget a track listing, e.g. when its caption URLs have expired."""
+        await self._delete(cache_keys.transcript_tracks_key(video_id))
+
+    async def get_summary_entry(
+        self, video_id: str, language: str = "en", url_or_id: Optional[str] = None
+    ) -> Optional[SummaryEntry]:
+        """
+        Get a cached summary together with its soft expiry.
+
+        ``url_or_id`` is the raw client input; it is only used to find entries
+        written under the legacy ``summary:{url_or_id}`` scheme.
+        """
+        raw = await self._read(
+            cache_keys.summary_key(video_id, language),
+            settings.cache_ttl_summary_seconds,
+            cache_keys.legacy_summary_keys(video_id, language, url_or_id),
+        )
+        return _unwrap_summary(raw)
+
+    async def get_summary(self, video_id: str, language: str = "en", url_or_id: Optional[str] = None) -> Optional[str]:
+        """Get cached summary for a video, stale or not."""
+        entry = await self.get_summary_entry(video_id, language, url_or_id)
+        return entry.summary if entry is not None else None
+
+    async def set_summary(
+        self, video_id: str, summary: str, language: str = "en", chapters: Optional[List[Dict]] = None
+    ) -> None:
+        """Cache summary (and optional timed chapters) for a video, starting a new soft TTL."""
+        await self._write(
+            cache_keys.summary_key(video_id, language),
+            _wrap_summary(summary, chapters),
+            settings.cache_ttl_summary_seconds,
+        )
+
+    async def get_summary_entries(
+        self, items: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Optional[SummaryEntry]]:
+        """Bulk lookup (one MGET) of ``(video_id, language)`` pairs."""
+        keys = {item: cache_keys.summary_key(*item) for item in items}
+        values = await self.get_many(keys.values(), settings.cache_ttl_summary_seconds)
+        return {item: _unwrap_summary(values[key]) for item, key in keys.items()}
+
+    async def get_summaries(self, video_ids: Iterable[str], language: str = "en") -> Dict[str, Optional[str]]:
+        """Bulk summary lookup (one MGET) for multi-video flows."""
+        entries = await self.get_summary_entries((video_id, language) for video_id in video_ids)
+        return {
+            video_id: entry.summary if entry is not None else None
+            for (video_id, _), entry in entries.items()
+        }
+
+    async def try_lock(self, name: str, ttl_seconds: int) -> bool:
+        """
+        Take a short-lived cross-worker lock (SET NX) that is left to expire.
+        Returns False if someone else holds it or Redis is unavailable.
+        """
+        key = cache_keys.refresh_lock_key(name)
         try:
             client = await self._get_client()
-            cache_key = f"summary:{key}"
-            await client.set(cache_key, summary, ex=settings.cache_ttl_summary_seconds)
+            return bool(await _guarded(lambda: client.set(key, "1", nx=True, ex=ttl_seconds)))
         except Exception as e:
-            # Redis not available - silently fail (cache write miss)
-            print(f"Redis cache write failed (connection error): {type(e).__name__}")
-            pass
+            _log_redis_error("redis lock failed", key, e)
+            return False
+
+    async def record_accesses(self, counts: Dict[str, float]) -> None:
+        """Add request counts (keyed "{video_id}:{language}") to the popularity set."""
+        if not counts:
+            return
+        key = cache_keys.popularity_key()
+        try:
+            client = await self._get_client()
+
+            async def write():
+                async with client.pipeline(transaction=False) as pipe:
+                    for member, count in counts.items():
+                        pipe.zincrby(key, count, member)
+                    await pipe.execute()
+
+            await _guarded(write)
+        except Exception as e:
+            _log_redis_error("redis access count write failed", key, e)
+
+    async def most_requested(self, n: int) -> List[Tuple[str, str]]:
+        """The ``n`` most requested ``(video_id, language)`` pairs."""
+        key = cache_keys.popularity_key()
+        client = await self._get_client()
+        members = await _guarded(lambda: client.zrevrange(key, 0, n - 1))
+        return [tuple(member.rsplit(":", 1)) for member in members]
+
+    async def decay_accesses(self, factor: float, keep: int) -> None:
+        """Scale all access counts by ``factor`` and keep only the top ``keep`` members."""
+        key = cache_keys.popularity_key()
+        client = await self._get_client()
+
+        async def decay():
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.zunionstore(key, {key: factor})
+                pipe.zremrangebyrank(key, 0, -keep - 1)
+                await pipe.execute()
+
+        await _guarded(decay)
+
+    async def index_fingerprint(self, video_id: str, language: str, fingerprint: Dict, bands: Sequence[str]) -> None:
+        """Store a transcript fingerprint and add the video to the set of each of its LSH bands."""
+        key = cache_keys.fingerprint_key(video_id, language)
+        ttl = settings.cache_ttl_summary_seconds
+        try:
+            client = await self._get_client()
+
+            async def write():
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.set(key, json.dumps(fingerprint), ex=ttl)
+                    for band in bands:
+                        band_key = cache_keys.fingerprint_band_key(language, band)
+                        pipe.sadd(band_key, video_id)
+                        pipe.expire(band_key, ttl)
+                    await pipe.execute()
+
+            await _guarded(write)
+        except Exception as e:
+            _log_redis_error("redis fingerprint write failed", key, e)
+
+    async def fingerprint_candidates(self, language: str, bands: Sequence[str]) -> Set[str]:
+        """Video IDs sharing at least one LSH band, in one pipeline (empty if Redis is unavailable)."""
+        keys = [cache_keys.fingerprint_band_key(language, band) for band in bands]
+        try:
+            client = await self._get_client()
+
+            async def read():
+                async with client.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.smembers(key)
+                    return await pipe.execute()
+
+            members = await _guarded(read)
+        except Exception as e:
+            _log_redis_error("redis fingerprint lookup failed", keys[0] if keys else "", e)
+            return set()
+        return set().union(*members) if members else set()
+
+    async def get_fingerprints(self, video_ids: Sequence[str], language: str) -> Dict[str, Optional[Dict]]:
+        """Stored fingerprints by video ID, with one MGET."""
+        keys = [cache_keys.fingerprint_key(video_id, language) for video_id in video_ids]
+        values = await self.get_many(keys, settings.cache_ttl_summary_seconds)
+        return {
+            video_id: json.loads(values[key]) if values.get(key) else None
+            for video_id, key in zip(video_ids, keys)
+        }
+
+    async def get_chunk_summary(self, digest: str) -> Optional[str]:
+        """Get a cached chunk summary by content digest."""
+        return await self._read(cache_keys.chunk_summary_key(digest), settings.cache_ttl_chunk_seconds)
+
+    async def set_chunk_summary(self, digest: str, summary: str) -> None:
+        """Cache a chunk summary by content digest."""
+        await self._write(cache_keys.chunk_summary_key(digest), summary, settings.cache_ttl_chunk_seconds)
 
     # Synchronous methods for backward compatibility (will be deprecated)
     def get(self, key: str) -> Optional[str]:
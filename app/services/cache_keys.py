@@ -0,0 +1,185 @@
+"""
+Canonical Redis cache keys.
+
+Keys are built from the normalized video ID (see ``extract_video_id``) rather
+than the raw URL a client sent, so ``youtu.be/X``, ``watch?v=X&t=30`` and ``X``
+share one entry. Every key is namespaced and versioned:
+
+    {namespace}:v{version}:{kind}:{video_id}:{language}[:{fingerprint}]
+
+Summary keys also carry a fingerprint of the models and prompt version, so
+changing either produces fresh entries instead of serving stale summaries.
+
+Entries written under the pre-versioned scheme (``summary:{url_or_id}``,
+``transcript:{video_id}``) are picked up lazily by ``CacheService`` on a miss,
+or in bulk with:
+
+    python -m app.services.cache_keys
+"""
+from typing import List, Optional
+import asyncio
+import hashlib
+import json
+from app.config import get_settings
+
+settings = get_settings()
+
+# Bump when prompts in SummarizerService change meaningfully.
+SUMMARY_PROMPT_VERSION = "2"
+
+LEGACY_DEFAULT_LANGUAGE = "en"
+
+def key_prefix() -> str:
+    return f"{settings.cache_namespace}:v{settings.cache_key_version}"
+
+def key_kind(key: str) -> str:
+    """The ``{kind}`` segment of a canonical key (summary, transcript, chunk, ...)."""
+    parts = key.split(":", 3)
+    return parts[2] if len(parts) > 2 else "other"
+
+def summary_fingerprint() -> str:
+    """Short hash of everything that changes summary output besides the transcript."""
+    raw = f"{settings.openai_chunk_model}|{settings.openai_reduce_model}|{SUMMARY_PROMPT_VERSION}"
+    if settings.prefilter_enabled:
+        raw += f"|prefilter:{settings.prefilter_ratio}:{settings.prefilter_dedup_threshold}"
+    raw += (
+        f"|route:{settings.summary_single_call_max_tokens}:{settings.summary_single_call_model}"
+        f":{settings.summary_max_chunks}:{settings.summary_max_chunk_tokens}:{settings.summary_max_tokens}"
+    )
+    return hashlib.sha1(raw.encode()).hexdigest()[:10]
+
+def summary_key(video_id: str, language: str = "en") -> str:
+    return f"{key_prefix()}:summary:{video_id}:{language}:{summary_fingerprint()}"
+
+def transcript_key(video_id: str, language: str = "en") -> str:
+    return f"{key_prefix()}:transcript:{video_id}:{language}"
+
+def transcript_tracks_key(video_id: str) -> str:
+    """Caption track listing of a video (all languages), or a cached "no transcript" result."""
+    return f"{key_prefix()}:tracks:{video_id}"
+
+def chunk_summary_key(digest: str) -> str:
+    """Key for one chunk's map output; ``digest`` hashes the chunk text, model, prompt and params."""
+    return f"{key_prefix()}:chunk:{digest}"
+
+def refresh_lock_key(name: str) -> str:
+    """Lock that lets one worker at a time refresh ``name`` (e.g. "{video_id}:{language}")."""
+    return f"{key_prefix()}:refresh:{name}"
+
+def singleflight_lock_key(namespace: str, key: str) -> str:
+    """Cross-worker single-flight lock for ``key`` (e.g. "{video_id}:{language}") within ``namespace``."""
+    return f"{key_prefix()}:lock:{namespace}:{key}"
+
+def popularity_key() -> str:
+    """Sorted set of "{video_id}:{language}" members scored by (decayed) summary requests."""
+    return f"{key_prefix()}:popular:summary"
+
+def fingerprint_key(video_id: str, language: str = "en") -> str:
+    """MinHash fingerprint of a summarized transcript (see app.services.duplicates)."""
+    return f"{key_prefix()}:fingerprint:{video_id}:{language}"
+
+def fingerprint_band_key(language: str, band: str) -> str:
+    """Set of video IDs (summarized in ``language``) whose fingerprint has this LSH band."""
+    return f"{key_prefix()}:fpband:{language}:{band}"
+
+def invalidation_channel() -> str:
+    """Pub/sub channel used to evict in-process (L1) cache entries across workers."""
+    return f"{key_prefix()}:invalidate"
+
+def legacy_summary_keys(video_id: str, language: str = "en", url_or_id: Optional[str] = None) -> List[str]:
+    """Pre-versioned keys that may hold a summary for this video."""
+    if language != LEGACY_DEFAULT_LANGUAGE:
+        return []
+    keys = [f"summary:{video_id}"]
+    if url_or_id and url_or_id != video_id:
+        keys.append(f"summary:{url_or_id}")
+    return keys
+
+def legacy_transcript_keys(video_id: str, language: str = "en") -> List[str]:
+    """
+    Pre-versioned keys that may hold this transcript, best first: JSON
+    segment lists (which keep timing) before plain-text values.
+    """
+    keys = [f"transcript:{video_id}:{language}"]
+    if language == LEGACY_DEFAULT_LANGUAGE:
+        keys.append(f"transcript:{video_id}")
+    return keys
+
+def legacy_transcript_to_segments(raw) -> List[dict]:
+    """Convert a legacy transcript value (JSON segment list or plain text) to segments."""
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    if raw.lstrip().startswith("["):
+        return json.loads(raw)
+    return [{"text": raw, "start": 0.0, "duration": 0.0}]
+
+async def migrate_legacy_keys(batch_size: int = 500) -> dict:
+    """
+    Move pre-versioned entries to canonical keys.
+
+    ``summary:{url_or_id}`` entries are rekeyed by extracted video ID (the
+    first one seen per video wins, duplicates are dropped). Summaries keyed by
+    a transcript MD5 cannot be mapped back to a video and are deleted.
+    Transcript entries are re-encoded into the compact binary format (see
+    ``app.utils.transcript_codec``). Remaining TTLs are preserved.
+    """
+    from app.services.cache import get_binary_redis_client, get_redis_client
+    from app.services.youtube_service import extract_video_id
+    from app.utils.transcript_codec import encode_transcript
+
+    client = await get_redis_client()
+    binary_client = await get_binary_redis_client()
+    stats = {"migrated": 0, "dropped": 0, "skipped": 0}
+
+    async def move(old: str, new: str) -> None:
+        ttl = await client.ttl(old)
+        value = await client.get(old)
+        if value is None:
+            return
+        if await client.set(new, value, nx=True, ex=ttl if ttl > 0 else None):
+            stats["migrated"] += 1
+        else:
+            stats["dropped"] += 1
+        await client.delete(old)
+
+    async for old in client.scan_iter(match="summary:*", count=batch_size):
+        suffix = old[len("summary:"):]
+        try:
+            video_id = extract_video_id(suffix)
+        except ValueError:
+            video_id = None
+        if video_id is None:
+            await client.delete(old)
+            stats["dropped"] += 1
+            continue
+        await move(old, summary_key(video_id, LEGACY_DEFAULT_LANGUAGE))
+
+    async def reencode(old: str, new: str) -> None:
+        ttl = await client.ttl(old)
+        value = await client.get(old)
+        if value is None:
+            return
+        data = encode_transcript(legacy_transcript_to_segments(value), settings.transcript_compression)
+        if await binary_client.set(new, data, nx=True, ex=ttl if ttl > 0 else None):
+            stats["migrated"] += 1
+        else:
+            stats["dropped"] += 1
+        await client.delete(old)
+
+    # Segment lists first, so they win over plain-text copies of the same video.
+    async for old in client.scan_iter(match="transcript:*:*", count=batch_size):
+        parts = old.split(":")
+        if len(parts) == 3:
+            await reencode(old, transcript_key(parts[1], parts[2]))
+        else:
+            stats["skipped"] += 1
+
+    async for old in client.scan_iter(match="transcript:*", count=batch_size):
+        parts = old.split(":")
+        if len(parts) == 2:
+            await reencode(old, transcript_key(parts[1], LEGACY_DEFAULT_LANGUAGE))
+
+    return stats
+
+if __name__ == "__main__":
+    print(asyncio.run(migrate_legacy_keys()))
@@ -0,0 +1,59 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+class CircuitBreaker:
+    """
+    Minimal closed/open/half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    callers fail fast for ``reset_timeout_seconds``. Then a single trial call
+    is let through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if calls should not be attempted right now."""
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial_in_progress):
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        if state == "half-open":
+            self._trial_in_progress = True
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("circuit closed", extra={"circuit": self.name})
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+
+    def release_trial(self) -> None:
+        """End a call that neither succeeded nor failed (e.g. cancelled), so another trial may run."""
+        self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_progress = False
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning("circuit opened", extra={"circuit": self.name, "failures": self._failures})
+            self._opened_at = time.monotonic()
@@ -0,0 +1,114 @@
+"""
+Near-duplicate transcripts across videos: re-uploads, mirrors and
+re-encodes of something already summarized.
+
+Each summarized transcript gets a MinHash fingerprint of its word
+shingles (see app.utils.extractive). The signature is cut into LSH bands,
+and each band is a Redis set of the videos that have it, so a new
+transcript is only compared with the few videos sharing a band. Their
+similarity is the fraction of equal signature positions (an estimate of
+the Jaccard similarity of the shingle sets). If it reaches
+``duplicate_similarity_threshold``, the existing summary is reused, and
+its chapters are rescaled to the new video's duration. The new video
+does not go through map-reduce.
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+from app.services.cache import cache_service
+from app.services.metrics import DUPLICATE_REUSED
+from app.utils.extractive import LSH_BANDS, NUM_PERM, minhash_signature, text_shingles
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class Fingerprint(NamedTuple):
+    signature: List[int]
+    words: int
+    duration: float           # seconds
+
+    def bands(self) -> List[str]:
+        rows = NUM_PERM // LSH_BANDS
+        return [
+            f"{band}:" + hashlib.sha1(repr(self.signature[band * rows:(band + 1) * rows]).encode()).hexdigest()[:16]
+            for band in range(LSH_BANDS)
+        ]
+
+def similarity(a: Fingerprint, b: Fingerprint) -> float:
+    """Estimated Jaccard similarity, capped by the length ratio (which bounds the true value)."""
+    agreement = sum(x == y for x, y in zip(a.signature, b.signature)) / len(a.signature)
+    return min(agreement, min(a.words, b.words) / max(a.words, b.words))
+
+def fingerprint_segments(segments: List[Dict]) -> Optional[Fingerprint]:
+    """Fingerprint of a transcript, or None when disabled or too short to tell apart."""
+    if settings.duplicate_similarity_threshold <= 0 or not segments:
+        return None
+    text = " ".join(s["text"] for s in segments)
+    words = len(text.split())
+    if words < settings.duplicate_min_words:
+        return None
+    last = segments[-1]
+    duration = float(last.get("start", 0.0)) + float(last.get("duration", 0.0))
+    return Fingerprint(minhash_signature(text_shingles(text)), words, duration)
+
+async def find_duplicate(video_id: str, language: str, fingerprint: Fingerprint) -> Optional[Tuple[str, Fingerprint]]:
+    """The most similar already summarized video at or above the threshold, if any."""
+    candidates = await cache_service.fingerprint_candidates(language, fingerprint.bands())
+    candidates.discard(video_id)
+    if not candidates:
+        return None
+    stored = await cache_service.get_fingerprints(sorted(candidates)[:settings.duplicate_max_candidates], language)
+    best: Optional[Tuple[float, str, Fingerprint]] = None
+    for other_id, data in stored.items():
+        if data is None:
+            continue
+        other = Fingerprint(data["signature"], data["words"], data["duration"])
+        score = similarity(fingerprint, other)
+        if score >= settings.duplicate_similarity_threshold and (best is None or score > best[0]):
+            best = (score, other_id, other)
+    return (best[1], best[2]) if best is not None else None
+
+def adapt_chapters(chapters: Optional[List[Dict]], source: Fingerprint, target: Fingerprint) -> Optional[List[Dict]]:
+    """Rescale chapter times from the source video's duration to the target's (e.g. sped-up mirrors)."""
+    if not chapters or source.duration <= 0 or target.duration <= 0:
+        return chapters
+    scale = target.duration / source.duration
+    return [
+        dict(chapter, start=round(chapter["start"] * scale, 2), end=round(min(chapter["end"] * scale, target.duration), 2))
+        for chapter in chapters
+    ]
+
+async def reuse_summary(
+    video_id: str, language: str, segments: List[Dict]
+) -> Tuple[Optional[Tuple[str, Optional[List[Dict]]]], Optional[Fingerprint]]:
+    """
+    Look for an already summarized near-duplicate of a freshly fetched
+    transcript. Returns ``(summary, chapters)`` (cached for ``video_id``)
+    when one is found, else None, together with the transcript's
+    fingerprint for ``remember``.
+    """
+    # MinHash over a long transcript is tens of milliseconds of CPU; keep it off the event loop
+    fingerprint = await asyncio.to_thread(fingerprint_segments, segments)
+    if fingerprint is None:
+        return None, None
+    match = await find_duplicate(video_id, language, fingerprint)
+    if match is None:
+        return None, fingerprint
+    other_id, other = match
+    entry = await cache_service.get_summary_entry(other_id, language)
+    if entry is None:
+        return None, fingerprint
+    chapters = adapt_chapters(entry.chapters, other, fingerprint)
+    await cache_service.set_summary(video_id, entry.summary, language, chapters=chapters)
+    await remember(video_id, language, fingerprint)
+    DUPLICATE_REUSED.inc()
+    logger.info("reused summary of near-duplicate video", extra={"video_id": video_id, "duplicate_of": other_id})
+    return (entry.summary, chapters), fingerprint
+
+async def remember(video_id: str, language: str, fingerprint: Optional[Fingerprint]) -> None:
+    """Index a summarized transcript so later near-duplicates can reuse its summary."""
+    if fingerprint is None:
+        return
+    await cache_service.index_fingerprint(video_id, language, fingerprint._asdict(), fingerprint.bands())
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+import asyncio
+import threading
+from app.services.metrics import FETCH_POOL_ACTIVE, FETCH_POOL_QUEUED, FETCH_POOL_REJECTED, FETCH_TIMEOUTS
+
+T = TypeVar("T")
+
+class FetchPoolSaturated(Exception):
+    """Raised when the fetch pool's queue is full; callers should answer 503."""
+
+class FetchTimeout(Exception):
+    """Raised when a fetch does not finish within the per-fetch timeout."""
+
+class FetchExecutor:
+    """
+    Dedicated, bounded thread pool for blocking transcript fetches.
+
+    Unlike the loop's default executor it has its own size, a per-fetch
+    timeout, and a limit on queued work: once ``max_workers + max_queue``
+    fetches are pending, new ones are rejected immediately instead of
+    waiting behind a slow proxy. A timed-out fetch keeps its thread until it
+    returns, and keeps counting towards saturation until then.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout_seconds: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="transcript-fetch"
+            )
+        return self._executor
+
+    def _update_gauges(self) -> None:
+        FETCH_POOL_ACTIVE.set(self._running)
+        FETCH_POOL_QUEUED.set(self._pending - self._running)
+
+    def _wrap(self, fn: Callable[..., T], *args) -> Callable[[], T]:
+        def run() -> T:
+            with self._lock:
+                self._running += 1
+                self._update_gauges()
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._update_gauges()
+        return run
+
+    def _on_done(self, future) -> None:
+        # A fetch cancelled before it started never ran _wrap's bookkeeping
+        if future.cancelled():
+            with self._lock:
+                self._pending -= 1
+                self._update_gauges()
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run ``fn(*args)`` on the pool, subject to the queue limit and timeout."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                FETCH_POOL_REJECTED.inc()
+                raise FetchPoolSaturated("Transcript fetch pool is saturated")
+            self._pending += 1
+            self._update_gauges()
+        future = self._get_executor().submit(self._wrap(fn, *args))
+        future.add_done_callback(self._on_done)
+        try:
+            # On timeout the wrapped future is cancelled: a queued fetch is dropped,
+            # a running one can't be interrupted and finishes in the background
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            FETCH_TIMEOUTS.inc()
+            raise FetchTimeout(f"Transcript fetch timed out after {self.timeout_seconds}s")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
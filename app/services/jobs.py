@@ -0,0 +1,406 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import asyncio
+import json
+import logging
+import time
+import uuid
+from app.services import cache_keys
+from app.services.cache import _guarded, get_redis_client
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Per-item states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+TERMINAL_STATES = (DONE, FAILED)
+
+# Processes one video and returns its summary; raising marks the item failed.
+Processor = Callable[[str, str], Awaitable[str]]
+
+def _job_status(items: Dict[str, Dict]) -> str:
+    states = [item["status"] for item in items.values()]
+    if all(s in TERMINAL_STATES for s in states):
+        return DONE
+    if all(s == QUEUED for s in states):
+        return QUEUED
+    return RUNNING
+
+class InMemoryJobBackend:
+    """Process-local job backend, for tests and single-worker development."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict] = {}
+        self._queue: "asyncio.Queue[Tuple[str, str]]" = asyncio.Queue()
+        self._subscribers: Dict[Tuple[str, str], Set[str]] = {}
+
+    async def create_job(self, job_id: str, items: Dict[str, Dict]) -> None:
+        self._jobs[job_id] = {"created_at": time.time(), "items": items}
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        return self._jobs.get(job_id)
+
+    async def enqueue(self, job_id: str, video_id: str, language: str) -> bool:
+        item = (video_id, language)
+        newly_queued = item not in self._subscribers
+        self._subscribers.setdefault(item, set()).add(job_id)
+        if newly_queued:
+            self._queue.put_nowait(item)
+        return newly_queued
+
+    async def dequeue(self, timeout: float) -> Optional[Tuple[str, str]]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def heartbeat(self, video_id: str, language: str) -> None:
+        pass
+
+    async def release(self, video_id: str, language: str) -> None:
+        self._queue.put_nowait((video_id, language))
+
+    async def recover(self) -> int:
+        # Nothing survives the process, so nothing is left half-processed
+        return 0
+
+    async def update_item(self, video_id: str, language: str, state: Dict, final: bool = False) -> None:
+        item = (video_id, language)
+        job_ids = self._subscribers.pop(item, set()) if final else self._subscribers.get(item, set())
+        for job_id in job_ids:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job["items"][video_id] = state
+
+# Atomically subscribe a job to an item, queueing the item only if nobody else has.
+_ENQUEUE_SCRIPT = """
+redis.call("sadd", KEYS[2], ARGV[1])
+redis.call("expire", KEYS[2], ARGV[3])
+if redis.call("set", KEYS[1], "1", "NX", "EX", ARGV[3]) then
+    redis.call("rpush", KEYS[3], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Atomically take the subscriber list of a finished item, clear its in-flight
+# marker and lease, and drop it from the processing list.
+_FINISH_SCRIPT = """
+local members = redis.call("smembers", KEYS[2])
+redis.call("del", KEYS[1], KEYS[2], KEYS[4])
+redis.call("lrem", KEYS[3], 1, ARGV[1])
+return members
+"""
+
+# Put an interrupted item back at the head of the queue, resetting its in-flight marker.
+_RELEASE_SCRIPT = """
+redis.call("lrem", KEYS[1], 1, ARGV[1])
+redis.call("del", KEYS[2])
+redis.call("set", KEYS[3], "1", "EX", ARGV[2])
+redis.call("lpush", KEYS[4], ARGV[1])
+return 1
+"""
+
+# Move processing items whose lease has expired (their worker died) back to the queue.
+_RECOVER_SCRIPT = """
+local moved = 0
+for _, item in ipairs(redis.call("lrange", KEYS[1], 0, -1)) do
+    if redis.call("exists", ARGV[1] .. item) == 0 then
+        redis.call("lrem", KEYS[1], 1, item)
+        redis.call("lpush", KEYS[2], item)
+        moved = moved + 1
+    end
+end
+return moved
+"""
+
+class RedisJobBackend:
+    """
+    Redis-backed job backend shared by all workers and replicas.
+
+    Jobs are hashes of per-item JSON states. Videos are queued once: a video
+    already queued or running (from this or any other batch) just gains the
+    new job as a subscriber, and every subscriber is updated when it finishes.
+
+    Dequeued items move atomically to a processing list and hold a lease
+    that their worker keeps alive; they leave the list when finished. Items
+    whose worker died (expired lease) are put back on the queue by
+    ``recover``, at startup and periodically, so a crash never loses an item.
+    """
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{cache_keys.key_prefix()}:job:{job_id}"
+
+    def _queue_key(self) -> str:
+        return f"{cache_keys.key_prefix()}:jobs:queue"
+
+    def _inflight_key(self, video_id: str, language: str) -> str:
+        return f"{cache_keys.key_prefix()}:jobs:inflight:{video_id}:{language}"
+
+    def _subscribers_key(self, video_id: str, language: str) -> str:
+        return f"{cache_keys.key_prefix()}:jobs:subscribers:{video_id}:{language}"
+
+    def _processing_key(self) -> str:
+        return f"{cache_keys.key_prefix()}:jobs:processing"
+
+    def _lease_prefix(self) -> str:
+        return f"{cache_keys.key_prefix()}:jobs:lease:"
+
+    def _lease_key(self, video_id: str, language: str) -> str:
+        return f"{self._lease_prefix()}{video_id}:{language}"
+
+    async def create_job(self, job_id: str, items: Dict[str, Dict]) -> None:
+        client = await get_redis_client()
+        key = self._job_key(job_id)
+        mapping = {"created_at": str(time.time())}
+        mapping.update({f"item:{video_id}": json.dumps(state) for video_id, state in items.items()})
+
+        async def write():
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=mapping)
+                pipe.expire(key, settings.job_ttl_seconds)
+                await pipe.execute()
+
+        await _guarded(write)
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        client = await get_redis_client()
+        raw = await _guarded(lambda: client.hgetall(self._job_key(job_id)))
+        if not raw:
+            return None
+        items = {
+            field[len("item:"):]: json.loads(value)
+            for field, value in raw.items()
+            if field.startswith("item:")
+        }
+        return {"created_at": float(raw.get("created_at", 0)), "items": items}
+
+    async def enqueue(self, job_id: str, video_id: str, language: str) -> bool:
+        client = await get_redis_client()
+        queued = await _guarded(lambda: client.eval(
+            _ENQUEUE_SCRIPT,
+            3,
+            self._inflight_key(video_id, language),
+            self._subscribers_key(video_id, language),
+            self._queue_key(),
+            job_id,
+            f"{video_id}:{language}",
+            settings.job_ttl_seconds,
+        ))
+        return bool(queued)
+
+    async def dequeue(self, timeout: float) -> Optional[Tuple[str, str]]:
+        client = await get_redis_client()
+        item = await _guarded(
+            lambda: client.blmove(self._queue_key(), self._processing_key(), timeout, "LEFT", "RIGHT")
+        )
+        if item is None:
+            return None
+        video_id, _, language = item.rpartition(":")
+        await _guarded(lambda: client.set(self._lease_key(video_id, language), "1", ex=settings.job_lease_seconds))
+        return video_id, language
+
+    async def heartbeat(self, video_id: str, language: str) -> None:
+        """Keep the lease of an item being processed alive."""
+        client = await get_redis_client()
+        await _guarded(lambda: client.expire(self._lease_key(video_id, language), settings.job_lease_seconds))
+
+    async def release(self, video_id: str, language: str) -> None:
+        """Give an item being processed back to the queue (e.g. on shutdown)."""
+        client = await get_redis_client()
+        await _guarded(lambda: client.eval(
+            _RELEASE_SCRIPT,
+            4,
+            self._processing_key(),
+            self._lease_key(video_id, language),
+            self._inflight_key(video_id, language),
+            self._queue_key(),
+            f"{video_id}:{language}",
+            settings.job_ttl_seconds,
+        ))
+
+    async def recover(self) -> int:
+        """Re-queue items left in the processing list by dead workers; returns how many."""
+        client = await get_redis_client()
+        return await _guarded(lambda: client.eval(
+            _RECOVER_SCRIPT, 2, self._processing_key(), self._queue_key(), self._lease_prefix()
+        ))
+
+    async def update_item(self, video_id: str, language: str, state: Dict, final: bool = False) -> None:
+        client = await get_redis_client()
+        if final:
+            job_ids = await _guarded(lambda: client.eval(
+                _FINISH_SCRIPT,
+                4,
+                self._inflight_key(video_id, language),
+                self._subscribers_key(video_id, language),
+                self._processing_key(),
+                self._lease_key(video_id, language),
+                f"{video_id}:{language}",
+            ))
+        else:
+            job_ids = await _guarded(lambda: client.smembers(self._subscribers_key(video_id, language)))
+        value = json.dumps(state)
+
+        async def write():
+            async with client.pipeline(transaction=False) as pipe:
+                for job_id in job_ids:
+                    # Only touch jobs that still exist (HSET would resurrect an expired one)
+                    pipe.eval(
+                        "if redis.call('exists', KEYS[1]) == 1 then return redis.call('hset', KEYS[1], ARGV[1], ARGV[2]) end return 0",
+                        1,
+                        self._job_key(job_id),
+                        f"item:{video_id}",
+                        value,
+                    )
+                await pipe.execute()
+
+        await _guarded(write)
+
+class JobQueue:
+    """
+    Background summarization jobs: many videos per job, processed by a pool
+    of in-process worker tasks pulling from a shared backend queue.
+    """
+
+    def __init__(self, backend, processor: Processor, workers: int):
+        self.backend = backend
+        self.processor = processor
+        self.workers = workers
+        self._tasks: List[asyncio.Task] = []
+        self._last_recovery = time.monotonic()
+
+    def start(self) -> None:
+        """Start worker tasks if they are not already running."""
+        self._tasks = [t for t in self._tasks if not t.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    async def recover(self) -> None:
+        """
+        Re-queue items abandoned by crashed workers (or whose result could not
+        be recorded). Run before ``start`` on startup, then periodically by the
+        workers.
+        """
+        try:
+            recovered = await self.backend.recover()
+        except Exception as e:
+            logger.warning("job recovery failed", extra={"error": type(e).__name__})
+            return
+        if recovered:
+            logger.info("re-queued abandoned job items", extra={"items": recovered})
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(
+        self,
+        video_ids: List[str],
+        language: str = "en",
+        invalid: Optional[List[str]] = None,
+        done: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Create a job for ``video_ids`` (already normalized and de-duplicated) and queue them.
+
+        ``invalid`` inputs are recorded as failed items so callers can see them;
+        ``done`` maps video IDs to summaries already known (e.g. cached), which
+        are recorded as finished without being queued.
+        """
+        job_id = uuid.uuid4().hex
+        done = done or {}
+        items = {
+            video_id: {"status": DONE, "summary": done[video_id]} if video_id in done else {"status": QUEUED}
+            for video_id in video_ids
+        }
+        for raw in invalid or []:
+            items[raw] = {"status": FAILED, "error": "Invalid YouTube URL or video ID"}
+        await self.backend.create_job(job_id, items)
+        for video_id in video_ids:
+            if video_id not in done:
+                await self.backend.enqueue(job_id, video_id, language)
+        self.start()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """Job status with per-item states, or None if unknown or expired."""
+        job = await self.backend.get_job(job_id)
+        if job is None:
+            return None
+        items = job["items"]
+        counts: Dict[str, int] = {}
+        for item in items.values():
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        return {
+            "job_id": job_id,
+            "status": _job_status(items),
+            "created_at": job["created_at"],
+            "counts": counts,
+            "items": [dict(state, video_id=video_id) for video_id, state in items.items()],
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            if time.monotonic() - self._last_recovery >= settings.job_lease_seconds:
+                # Picks up items of crashed workers, and items whose result could not be recorded
+                self._last_recovery = time.monotonic()
+                await self.recover()
+            try:
+                item = await self.backend.dequeue(timeout=settings.job_poll_timeout_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("job queue unavailable", extra={"error": type(e).__name__})
+                await asyncio.sleep(1)
+                continue
+            if item is None:
+                continue
+            await self._process(*item)
+
+    async def _process(self, video_id: str, language: str) -> None:
+        keep_alive = asyncio.create_task(self._keep_alive(video_id, language))
+        try:
+            await self.backend.update_item(video_id, language, {"status": RUNNING})
+            summary = await self.processor(video_id, language)
+            state = {"status": DONE, "summary": summary}
+        except asyncio.CancelledError:
+            # Shutting down: hand the item to another worker instead of leaving it "running"
+            await self._release(video_id, language)
+            raise
+        except Exception as e:
+            state = {"status": FAILED, "error": str(getattr(e, "detail", e))}
+        finally:
+            keep_alive.cancel()
+        try:
+            await self.backend.update_item(video_id, language, state, final=True)
+        except Exception as e:
+            # The item stays in the processing list; the next periodic recovery after its lease
+            # expires re-queues it
+            logger.warning("failed to record job result", extra={"video_id": video_id, "error": type(e).__name__})
+
+    async def _keep_alive(self, video_id: str, language: str) -> None:
+        while True:
+            await asyncio.sleep(settings.job_lease_seconds / 3)
+            try:
+                await self.backend.heartbeat(video_id, language)
+            except Exception as e:
+                logger.warning("job lease renewal failed", extra={"video_id": video_id, "error": type(e).__name__})
+
+    async def _release(self, video_id: str, language: str) -> None:
+        try:
+            await self.backend.release(video_id, language)
+            await self.backend.update_item(video_id, language, {"status": QUEUED})
+        except Exception as e:
+            logger.warning("failed to re-queue job item", extra={"video_id": video_id, "error": type(e).__name__})
+
+def build_job_backend():
+    if settings.job_backend == "memory":
+        return InMemoryJobBackend()
+    return RedisJobBackend()
@@ -0,0 +1,122 @@
+from typing import Dict, Iterable, NamedTuple
+import math
+from app.config import get_settings
+
+settings = get_settings()
+
+class ModelSpec(NamedTuple):
+    context_tokens: int       # prompt + completion
+    max_output_tokens: int
+    input_price: float        # USD per 1M prompt tokens
+    output_price: float       # USD per 1M completion tokens
+
+# Built-in table; ``llm_models`` overrides or extends it per model.
+DEFAULT_MODEL_SPECS: Dict[str, ModelSpec] = {
+    "gpt-4.1": ModelSpec(1_047_576, 32_768, 2.00, 8.00),
+    "gpt-4.1-mini": ModelSpec(1_047_576, 32_768, 0.40, 1.60),
+    "gpt-4.1-nano": ModelSpec(1_047_576, 32_768, 0.10, 0.40),
+    "gpt-4o": ModelSpec(128_000, 16_384, 2.50, 10.00),
+    "gpt-4o-mini": ModelSpec(128_000, 16_384, 0.15, 0.60),
+}
+
+# Used for models in neither table: a conservative context and no known price.
+_UNKNOWN_MODEL = ModelSpec(128_000, 4_096, 0.0, 0.0)
+
+# Tokens reserved for the system/user prompt wrapped around the transcript.
+PROMPT_OVERHEAD_TOKENS = 100
+
+# Lower bound for chunk summaries, whatever the chunk size.
+MIN_CHUNK_SUMMARY_TOKENS = 200
+
+def model_spec(model: str) -> ModelSpec:
+    """Context window, output limit and prices of a model."""
+    base = DEFAULT_MODEL_SPECS.get(model, _UNKNOWN_MODEL)
+    override = settings.llm_models.get(model)
+    return base._replace(**override) if override else base
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of one call, from the price table."""
+    spec = model_spec(model)
+    return (prompt_tokens * spec.input_price + completion_tokens * spec.output_price) / 1_000_000
+
+def pick_model(preferred: str, prompt_tokens: int, max_tokens: int, candidates: Iterable[str] = ()) -> str:
+    """
+    ``preferred`` if the call fits its context window, otherwise the cheapest
+    of ``candidates`` it fits. Falls back to ``preferred`` when nothing fits.
+    """
+    def fits(model: str) -> bool:
+        spec = model_spec(model)
+        return prompt_tokens + max_tokens <= spec.context_tokens and max_tokens <= spec.max_output_tokens
+
+    if fits(preferred):
+        return preferred
+    fitting = [model for model in candidates if fits(model)]
+    if not fitting:
+        return preferred
+    return min(fitting, key=lambda model: estimate_cost(model, prompt_tokens, max_tokens))
+
+class SummaryPlan(NamedTuple):
+    """How one transcript gets summarized."""
+    single_call: bool         # summarize the whole transcript in one call, no map phase
+    transcript_tokens: int
+    chunk_model: str
+    chunk_tokens: int         # target chunk size in tokens (map-reduce only)
+    chunk_max_tokens: int     # max_tokens of each chunk summary
+    summary_model: str        # model of the single call or the final reduce
+    summary_max_tokens: int
+
+def _base_chunk_tokens() -> int:
+    if settings.max_tokens_per_chunk:
+        return settings.max_tokens_per_chunk
+    return math.ceil(settings.max_chars_per_chunk / 4)
+
+def plan_summary(transcript_tokens: int) -> SummaryPlan:
+    """
+    Route a transcript by its size in tokens.
+
+    Up to ``summary_single_call_max_tokens`` it is summarized in one call.
+    Longer ones are chunked into at most ``summary_max_chunks`` chunks, so
+    mid-sized transcripts get fewer, larger chunks (never smaller than the
+    configured chunk budget, never larger than ``summary_max_chunk_tokens``
+    or the chunk model's context). Chunk summaries get a ``max_tokens``
+    proportional to their chunk. Models that cannot fit a prompt are
+    swapped for the cheapest configured one that can.
+    """
+    candidates = [settings.openai_chunk_model, settings.openai_reduce_model]
+    summary_preferred = settings.summary_single_call_model or settings.openai_reduce_model
+    summary_max_tokens = settings.summary_max_tokens
+
+    if transcript_tokens <= settings.summary_single_call_max_tokens:
+        model = pick_model(
+            summary_preferred, transcript_tokens + PROMPT_OVERHEAD_TOKENS, summary_max_tokens, candidates
+        )
+        return SummaryPlan(
+            single_call=True,
+            transcript_tokens=transcript_tokens,
+            chunk_model=settings.openai_chunk_model,
+            chunk_tokens=transcript_tokens,
+            chunk_max_tokens=0,
+            summary_model=model,
+            summary_max_tokens=min(summary_max_tokens, model_spec(model).max_output_tokens),
+        )
+
+    base = _base_chunk_tokens()
+    chunk_tokens = max(base, math.ceil(transcript_tokens / max(1, settings.summary_max_chunks)))
+    chunk_tokens = min(chunk_tokens, max(base, settings.summary_max_chunk_tokens))
+    chunk_max_tokens = max(MIN_CHUNK_SUMMARY_TOKENS, round(chunk_tokens * settings.chunk_summary_output_ratio))
+
+    chunk_model = pick_model(
+        settings.openai_chunk_model, chunk_tokens + PROMPT_OVERHEAD_TOKENS, chunk_max_tokens, candidates
+    )
+    spec = model_spec(chunk_model)
+    chunk_max_tokens = min(chunk_max_tokens, spec.max_output_tokens)
+    chunk_tokens = min(chunk_tokens, spec.context_tokens - chunk_max_tokens - PROMPT_OVERHEAD_TOKENS)
+    return SummaryPlan(
+        single_call=False,
+        transcript_tokens=transcript_tokens,
+        chunk_model=chunk_model,
+        chunk_tokens=chunk_tokens,
+        chunk_max_tokens=chunk_max_tokens,
+        summary_model=settings.openai_reduce_model,
+        summary_max_tokens=min(summary_max_tokens, model_spec(settings.openai_reduce_model).max_output_tokens),
+    )
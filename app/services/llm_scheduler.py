@@ -0,0 +1,262 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Deque, Dict, NamedTuple, Optional, TypeVar
+import asyncio
+import itertools
+import random
+import time
+from app.config import get_settings
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+# Identifies the incoming request an LLM call belongs to, for fair queueing.
+# Set once per summarization; chunk tasks started with gather inherit it.
+current_flow: ContextVar[Optional[str]] = ContextVar("llm_flow", default=None)
+
+_flow_ids = itertools.count()
+
+def new_flow() -> str:
+    """Start a new fair-queueing flow for the current task and its children."""
+    flow = f"flow-{next(_flow_ids)}"
+    current_flow.set(flow)
+    return flow
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.tokens = float(rate_per_minute)
+        self.rate_per_second = rate_per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_second)
+        self.updated = now
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)."""
+        # A single call larger than the bucket would never fit; let it drain the bucket instead.
+        amount = min(amount, self.capacity)
+        self._refill()
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate_per_second
+
+    def take(self, amount: float = 1.0) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+class _Waiter(NamedTuple):
+    future: asyncio.Future
+    model: str
+    tokens: int
+
+def _is_retryable(exc: Exception) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    # Connection errors and timeouts carry no status code
+    return type(exc).__name__ in ("APIConnectionError", "APITimeoutError")
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+class LLMScheduler:
+    """
+    Process-wide scheduler for LLM calls.
+
+    Enforces a global concurrency cap, optional per-model requests/min and
+    tokens/min buckets, and retries 429/5xx responses with jittered
+    exponential backoff. Waiting calls are served round-robin across flows
+    (one flow per incoming request), so a short video is not queued behind
+    every chunk of a long lecture.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate_limits: Optional[Dict[str, Dict[str, float]]] = None,
+        max_retries: int = 5,
+        backoff_base_seconds: float = 0.5,
+        backoff_max_seconds: float = 20.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._rate_limits = rate_limits or {}
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._active = 0
+        self._queues: Dict[str, Deque[_Waiter]] = {}
+        self._rotation: Deque[str] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    @asynccontextmanager
+    async def _admit(self, flow: str, model: str, tokens: int):
+        """
+        Hold a concurrency slot, with the model's rate limit tokens taken.
+
+        Waiting calls are admitted by ``_dispatch``, which picks flows
+        round-robin and only then checks the head call's buckets, so rate
+        limits don't reorder flows.
+        """
+        if self._active < self.max_concurrency and not self._rotation and self._wait_time(model, tokens) == 0:
+            self._take(model, tokens)
+            self._active += 1
+        else:
+            waiter = _Waiter(asyncio.get_running_loop().create_future(), model, tokens)
+            if flow not in self._queues:
+                self._queues[flow] = deque()
+                self._rotation.append(flow)
+            self._queues[flow].append(waiter)
+            self._dispatch()
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    # Admitted just as we were cancelled; pass the slot on.
+                    self._release()
+                else:
+                    self._discard(flow, waiter)
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _discard(self, flow: str, waiter: _Waiter) -> None:
+        queue = self._queues.get(flow)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[flow]
+                self._rotation.remove(flow)
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """
+        Hand free slots to waiting flows in round-robin order.
+
+        The first flow (in rotation order) whose head call fits its model's
+        buckets is admitted and moves to the back of the rotation. A flow
+        whose head is rate limited keeps its place, and later flows can't
+        take tokens of that model ahead of it; calls to other models go on.
+        If every head is rate limited, dispatch runs again when the first
+        one's tokens are due.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._active < self.max_concurrency and self._rotation:
+            blocked: Dict[str, float] = {}
+            admitted = None
+            for flow in self._rotation:
+                waiter = self._queues[flow][0]
+                if waiter.future.done():
+                    admitted = flow
+                    break
+                if waiter.model in blocked:
+                    continue
+                wait = self._wait_time(waiter.model, waiter.tokens)
+                if wait > 0:
+                    blocked[waiter.model] = wait
+                    continue
+                admitted = flow
+                break
+            if admitted is None:
+                self._timer = asyncio.get_running_loop().call_later(min(blocked.values()), self._dispatch)
+                return
+            queue = self._queues[admitted]
+            waiter = queue.popleft()
+            self._rotation.remove(admitted)
+            if queue:
+                self._rotation.append(admitted)
+            else:
+                del self._queues[admitted]
+            if not waiter.future.done():
+                self._take(waiter.model, waiter.tokens)
+                self._active += 1
+                waiter.future.set_result(None)
+
+    def _wait_time(self, model: str, tokens: int) -> float:
+        request_bucket, token_bucket = self._buckets(model)
+        return max(
+            request_bucket.wait_time(1) if request_bucket else 0.0,
+            token_bucket.wait_time(tokens) if token_bucket else 0.0,
+        )
+
+    def _take(self, model: str, tokens: int) -> None:
+        request_bucket, token_bucket = self._buckets(model)
+        if request_bucket:
+            request_bucket.take(1)
+        if token_bucket:
+            token_bucket.take(tokens)
+
+    def _buckets(self, model: str):
+        limits = self._rate_limits.get(model, {})
+        if "rpm" in limits and model not in self._request_buckets:
+            self._request_buckets[model] = TokenBucket(limits["rpm"])
+        if "tpm" in limits and model not in self._token_buckets:
+            self._token_buckets[model] = TokenBucket(limits["tpm"])
+        return self._request_buckets.get(model), self._token_buckets.get(model)
+
+    def _backoff(self, attempt: int, exc: Exception) -> float:
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max_seconds)
+        # Full jitter: uniform over [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt))
+
+    async def submit(self, model: str, estimated_tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an LLM call under the concurrency cap and the model's rate limits.
+
+        Args:
+            model: Model name, used to pick rate limit buckets
+            estimated_tokens: Prompt plus max completion tokens, charged to the tokens/min bucket
+            call: Coroutine factory performing the request (called once per attempt)
+
+        Returns:
+            The result of ``call``
+        """
+        flow = current_flow.get() or "default"
+        attempt = 0
+        while True:
+            async with self._admit(flow, model, estimated_tokens):
+                try:
+                    return await call()
+                except Exception as e:
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        raise
+                    delay = self._backoff(attempt, e)
+            # Back off outside the slot so other calls can proceed meanwhile
+            attempt += 1
+            await asyncio.sleep(delay)
+
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.llm_max_concurrency,
+    rate_limits=settings.llm_rate_limits,
+    max_retries=settings.llm_max_retries,
+    backoff_base_seconds=settings.llm_backoff_base_seconds,
+    backoff_max_seconds=settings.llm_backoff_max_seconds,
+)
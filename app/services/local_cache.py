@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import time
+
+def _sizeof(value: Any) -> int:
+    """Approximate payload size in bytes (string length, not interpreter overhead)."""
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    return 64
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry TTL.
+
+    Eviction is by total payload bytes rather than entry count, so a handful
+    of long transcripts can't push out thousands of small summaries without
+    accounting for it. Expired entries are kept until evicted so they can be
+    served as a fallback when the backing store is unreachable.
+    """
+
+    def __init__(self, max_bytes: int, default_ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.default_ttl_seconds = default_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Return a fresh entry (or an expired one with ``allow_stale``), else None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        if expires_at < time.monotonic() and not allow_stale:
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        size = _sizeof(value)
+        self.delete(key)
+        if size > self.max_bytes:
+            return
+        ttl = self.default_ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.default_ttl_seconds)
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
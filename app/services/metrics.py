@@ -0,0 +1,75 @@
+"""
+Prometheus metrics for the summarize pipeline.
+
+All metrics live in the default registry. When PROMETHEUS_MULTIPROC_DIR is
+set (multi-worker uvicorn), prometheus_client writes samples to that
+directory and ``/metrics`` aggregates them across workers; gauges declare
+how to combine per-process values via ``multiprocess_mode``.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# HTTP
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ["route"],
+    multiprocess_mode="livesum",
+)
+
+# Cache (tier: l1 or redis; kind: summary, transcript, chunk, ...)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by tier, key type and result", ["tier", "kind", "result"]
+)
+
+# Transcript fetches
+FETCH_LATENCY = Histogram(
+    "transcript_fetch_duration_seconds", "Transcript fetch latency", ["outcome"],
+    buckets=_LATENCY_BUCKETS,
+)
+FETCH_ERRORS = Counter("transcript_fetch_errors_total", "Transcript fetch errors by type", ["error"])
+
+# Transcript fetch pool (see app.services.fetch_executor)
+FETCH_POOL_ACTIVE = Gauge(
+    "transcript_fetch_pool_active", "Transcript fetches currently running", multiprocess_mode="livesum"
+)
+FETCH_POOL_QUEUED = Gauge(
+    "transcript_fetch_pool_queued", "Transcript fetches waiting for a pool thread", multiprocess_mode="livesum"
+)
+FETCH_POOL_REJECTED = Counter("transcript_fetch_pool_rejected_total", "Transcript fetches rejected because the pool was saturated")
+FETCH_TIMEOUTS = Counter("transcript_fetch_timeouts_total", "Transcript fetches that exceeded the per-fetch timeout")
+
+# Chunking
+CHUNK_COUNT = Histogram(
+    "summarize_chunks", "Chunks per summarized transcript",
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233),
+)
+CHUNK_SIZE = Histogram(
+    "summarize_chunk_chars", "Chunk size in characters",
+    buckets=(500, 1000, 2000, 4000, 8000, 12000, 16000, 24000, 32000, 64000),
+)
+
+SUMMARY_ROUTE = Counter(
+    "summarize_route_total", "Summarized transcripts by route (single call or map-reduce)", ["route"]
+)
+
+DUPLICATE_REUSED = Counter(
+    "summarize_duplicate_reuse_total", "Summaries reused from a near-duplicate video instead of summarized"
+)
+
+PREFILTER_KEPT_RATIO = Histogram(
+    "summarize_prefilter_kept_ratio", "Fraction of transcript characters kept by the extractive pre-filter",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+)
+
+# LLM calls
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds", "LLM call latency per model", ["model", "outcome"],
+    buckets=_LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter("llm_tokens_total", "LLM tokens per model", ["model", "kind"])
+LLM_COST = Counter("llm_cost_usd_total", "Estimated LLM cost per model, from the model price table", ["model"])
+LLM_IN_FLIGHT = Gauge("llm_requests_in_flight", "LLM calls currently running", multiprocess_mode="livesum")
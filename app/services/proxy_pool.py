@@ -0,0 +1,266 @@
+from collections import deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Deque, List, Optional, TypeVar, Union
+import asyncio
+import logging
+import time
+from app.services.fetch_executor import FetchPoolSaturated, FetchTimeout
+from app.config import get_settings
+
+if TYPE_CHECKING:
+    import requests
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Runs a blocking callable off the event loop (the fetch executor in production).
+Runner = Callable[..., Awaitable[Any]]
+
+# Errors that say something about the video rather than the proxy; they
+# should not count against a proxy's health.
+_VIDEO_ERRORS = (
+    "NoTranscriptFound",
+    "TranscriptsDisabled",
+    "VideoUnavailable",
+    "VideoUnplayable",
+    "InvalidVideoId",
+    "AgeRestricted",
+    "NotTranslatable",
+    "TranslationLanguageNotAvailable",
+)
+
+def is_proxy_error(exc: BaseException) -> bool:
+    """Whether a fetch failure should be blamed on the proxy that served it."""
+    # A full or timed-out local fetch pool says nothing about the proxy, and
+    # retrying on another endpoint would only add load to the same pool
+    if isinstance(exc, (FetchPoolSaturated, FetchTimeout)):
+        return False
+    return type(exc).__name__ not in _VIDEO_ERRORS
+
+class ProxyEndpoint:
+    """One transcript client (direct or behind a proxy) with its health stats."""
+
+    def __init__(self, name: str, client: Any, window: int = 50):
+        self.name = name
+        self.client = client
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.ewma_latency: Optional[float] = None
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.ejected_until = 0.0
+        self.in_flight = 0
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < settings.proxy_hedge_min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def score(self) -> float:
+        """Lower is better: smoothed latency, penalized by recent error rate and load."""
+        latency = self.ewma_latency if self.ewma_latency is not None else 1.0
+        error_rate = self.errors / self.requests if self.requests else 0.0
+        return latency * (1 + 4 * error_rate) * (1 + self.in_flight)
+
+    def record_success(self, latency: float) -> None:
+        self.requests += 1
+        self.consecutive_errors = 0
+        self.latencies.append(latency)
+        alpha = 0.2
+        self.ewma_latency = latency if self.ewma_latency is None else (
+            alpha * latency + (1 - alpha) * self.ewma_latency
+        )
+
+    def record_error(self, now: float) -> None:
+        self.requests += 1
+        self.errors += 1
+        self.consecutive_errors += 1
+        if self.consecutive_errors >= settings.proxy_eject_after_errors:
+            self.ejected_until = now + settings.proxy_cooldown_seconds
+            # Give it a clean slate when it comes back from cooldown
+            self.consecutive_errors = 0
+            self.requests = self.errors = 0
+
+class ProxyPool:
+    """
+    Pool of transcript clients with latency/error scoring.
+
+    Each fetch goes to the best-scoring available endpoint. Endpoints that
+    fail ``proxy_eject_after_errors`` times in a row are ejected for
+    ``proxy_cooldown_seconds`` and then retried. When hedging is enabled and
+    the chosen endpoint hasn't answered within its p95 latency, the same
+    fetch is sent to a second endpoint and the first success wins.
+
+    ``endpoints`` may be a factory, called on first use (or by ``warm``), so
+    the transcript client libraries aren't imported until needed.
+    """
+
+    def __init__(
+        self,
+        endpoints: Union[List[ProxyEndpoint], Callable[[], List[ProxyEndpoint]]],
+        runner: Runner,
+        hedging: bool = True,
+    ):
+        if callable(endpoints):
+            self._endpoints: Optional[List[ProxyEndpoint]] = None
+            self._build_endpoints = endpoints
+        else:
+            if not endpoints:
+                raise ValueError("ProxyPool needs at least one endpoint")
+            self._endpoints = endpoints
+        self.runner = runner
+        self.hedging = hedging
+
+    @property
+    def endpoints(self) -> List[ProxyEndpoint]:
+        if self._endpoints is None:
+            endpoints = self._build_endpoints()
+            if not endpoints:
+                raise ValueError("ProxyPool needs at least one endpoint")
+            self._endpoints = endpoints
+        return self._endpoints
+
+    async def warm(self) -> None:
+        """
+        Build the endpoints and open a keep-alive connection through each
+        one (``client.warm()``, in the runner). Failures are logged, not
+        raised: a proxy that is down at startup is handled by scoring.
+        """
+        endpoints = await asyncio.to_thread(lambda: self.endpoints)
+
+        async def warm_one(endpoint: ProxyEndpoint) -> None:
+            warm = getattr(endpoint.client, "warm", None)
+            if warm is None:
+                return
+            try:
+                await self.runner(warm)
+            except Exception as e:
+                logger.warning("proxy warmup failed", extra={"proxy": endpoint.name, "error": type(e).__name__})
+
+        await asyncio.gather(*(warm_one(e) for e in endpoints))
+
+    def _pick(self, exclude: Optional[ProxyEndpoint] = None) -> Optional[ProxyEndpoint]:
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e is not exclude and e.available(now)]
+        if not candidates:
+            if exclude is not None:
+                return None
+            # Everything is ejected: use whichever comes back soonest rather than failing
+            return min(self.endpoints, key=lambda e: e.ejected_until)
+        return min(candidates, key=lambda e: e.score())
+
+    def _hedge_delay(self, endpoint: ProxyEndpoint) -> float:
+        p95 = endpoint.p95()
+        return p95 if p95 is not None else settings.proxy_hedge_default_delay_seconds
+
+    async def _attempt(self, endpoint: ProxyEndpoint, fn: Callable[[Any], T]) -> T:
+        endpoint.in_flight += 1
+        start = time.monotonic()
+        try:
+            result = await self.runner(fn, endpoint.client)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if is_proxy_error(e):
+                endpoint.record_error(time.monotonic())
+            raise
+        finally:
+            endpoint.in_flight -= 1
+        endpoint.record_success(time.monotonic() - start)
+        return result
+
+    async def fetch(self, fn: Callable[[Any], T]) -> T:
+        """
+        Run blocking ``fn(client)`` on the best endpoint.
+
+        With hedging enabled, a second endpoint is tried when the first is
+        slower than its p95 or fails for proxy reasons.
+        """
+        primary = self._pick()
+        first = asyncio.ensure_future(self._attempt(primary, fn))
+        if not self.hedging:
+            return await first
+
+        done, _ = await asyncio.wait({first}, timeout=self._hedge_delay(primary))
+        if done and (first.exception() is None or not is_proxy_error(first.exception())):
+            return first.result()
+
+        # Slow (hedge) or failed because of the proxy (fail over): try a second endpoint
+        secondary = self._pick(exclude=primary)
+        if secondary is None:
+            return await first
+        second = asyncio.ensure_future(self._attempt(secondary, fn))
+
+        pending = {second} if done else {first, second}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "name": e.name,
+                "available": e.available(now),
+                "ewma_latency": e.ewma_latency,
+                "p95": e.p95(),
+                "requests": e.requests,
+                "errors": e.errors,
+            }
+            for e in self.endpoints
+        ]
+
+def build_session() -> "requests.Session":
+    """HTTP session with a keep-alive connection pool sized to the fetch pool."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=settings.fetch_pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def build_endpoints() -> List[ProxyEndpoint]:
+    """
+    Build transcript clients from configuration: ``webshare_clients`` Webshare
+    clients (each with its own session, so its own exit connections), one per
+    URL in ``proxy_urls``, or a single direct client if none are configured.
+    """
+    from youtube_transcript_api import YouTubeTranscriptApi
+    from youtube_transcript_api.proxies import GenericProxyConfig, WebshareProxyConfig
+    from app.services.transcript_client import TranscriptClient
+
+    def client(proxy_config=None) -> TranscriptClient:
+        session = build_session()
+        return TranscriptClient(YouTubeTranscriptApi(proxy_config=proxy_config, http_client=session), session)
+
+    endpoints: List[ProxyEndpoint] = []
+    if settings.webshare_username and settings.webshare_password:
+        for i in range(max(1, settings.webshare_clients)):
+            proxy_config = WebshareProxyConfig(
+                proxy_username=settings.webshare_username,
+                proxy_password=settings.webshare_password,
+            )
+            endpoints.append(ProxyEndpoint(f"webshare-{i}", client(proxy_config)))
+    for i, url in enumerate(settings.proxy_urls):
+        proxy_config = GenericProxyConfig(http_url=url, https_url=url)
+        endpoints.append(ProxyEndpoint(f"proxy-{i}", client(proxy_config)))
+    if not endpoints:
+        endpoints.append(ProxyEndpoint("direct", client()))
+    return endpoints
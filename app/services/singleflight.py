@@ -0,0 +1,132 @@
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import logging
+import uuid
+from app.services import cache_keys
+from app.services.cache import _guarded, get_redis_client
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Delete the lock only if we still own it (another worker may have taken it after expiry).
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single execution.
+
+    Within a process, callers for a key that is already in flight await the
+    same task instead of starting their own. With ``distributed=True`` a
+    Redis lock extends this across workers and replicas: the lock holder does
+    the work, and everyone else polls ``check`` (typically a cache lookup)
+    until a result appears or the lock is released.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        distributed: Optional[bool] = None,
+        lock_ttl_seconds: Optional[int] = None,
+        poll_interval_seconds: Optional[float] = None,
+    ):
+        self.namespace = namespace
+        self.distributed = settings.singleflight_redis_lock if distributed is None else distributed
+        self.lock_ttl_seconds = lock_ttl_seconds or settings.singleflight_lock_ttl_seconds
+        self.poll_interval_seconds = poll_interval_seconds or settings.singleflight_poll_interval_seconds
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for ``key`` is currently running in this process."""
+        return key in self._inflight
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        check: Optional[Callable[[], Awaitable[Optional[T]]]] = None,
+    ) -> T:
+        """
+        Run ``fn`` once for all concurrent callers of ``key``.
+
+        Args:
+            key: Coalescing key, e.g. "{video_id}:{language}"
+            fn: Coroutine factory that produces the result
+            check: Optional lookup used by distributed waiters to pick up the
+                result written by another worker
+
+        Returns:
+            The result of ``fn`` (or of ``check`` for distributed waiters)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            if self.distributed and check is not None:
+                coro = self._run_distributed(key, fn, check)
+            else:
+                coro = fn()
+            task = asyncio.ensure_future(coro)
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        # Shield so one caller disconnecting doesn't cancel the shared work.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every waiter has gone away.
+        if not task.cancelled():
+            task.exception()
+
+    async def _run_distributed(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        check: Callable[[], Awaitable[Optional[T]]],
+    ) -> T:
+        lock_key = cache_keys.singleflight_lock_key(self.namespace, key)
+        token = uuid.uuid4().hex
+        try:
+            client = await get_redis_client()
+        except Exception as e:
+            logger.warning("single-flight lock unavailable, running locally", extra={"key": key, "error": type(e).__name__})
+            return await fn()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_ttl_seconds
+        while True:
+            try:
+                acquired = await _guarded(lambda: client.set(lock_key, token, nx=True, ex=self.lock_ttl_seconds))
+            except Exception as e:
+                logger.warning("single-flight lock unavailable, running locally", extra={"key": key, "error": type(e).__name__})
+                return await fn()
+
+            if acquired:
+                try:
+                    return await fn()
+                finally:
+                    try:
+                        await _guarded(lambda: client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token))
+                    except Exception as e:
+                        logger.warning("single-flight lock release failed", extra={"key": key, "error": type(e).__name__})
+
+            # Another worker holds the lock: wait for its result to show up.
+            while loop.time() < deadline:
+                await asyncio.sleep(self.poll_interval_seconds)
+                result = await check()
+                if result:
+                    return result
+                try:
+                    if not await _guarded(lambda: client.exists(lock_key)):
+                        break
+                except Exception:
+                    return await fn()
+            else:
+                # Lock holder is stuck or gone without a result; do the work ourselves.
+                return await fn()
@@ -1,67 +1,399 @@
-from typing import List
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from contextlib import contextmanager
 import asyncio
 import hashlib
-from openai import AsyncOpenAI
-from app.utils.chunking import chunk_text
+import json
+import math
+import sys
+import time
+from app.utils.chunking import (
+    SizeCounter, TimedChunk, char_counter, chunk_text, chunk_timed_segments, chunk_units, get_token_counter,
+)
+from app.utils.extractive import extractive_reduce_segments
 from app.services.cache import cache_service
+from app.services.metrics import (
+    CHUNK_COUNT, CHUNK_SIZE, LLM_COST, LLM_IN_FLIGHT, LLM_LATENCY, LLM_TOKENS, PREFILTER_KEPT_RATIO, SUMMARY_ROUTE,
+)
+from app.services.llm_routing import SummaryPlan, estimate_cost, plan_summary
+from app.services.llm_scheduler import llm_scheduler, new_flow
 from app.config import get_settings
 
 settings = get_settings()
 
+CHUNK_SYSTEM_PROMPT = "You are a helpful assistant that summarizes text concisely."
+CHUNK_USER_PROMPT = "Summarize the following text:\n\n{chunk}"
+CHUNK_MAX_TOKENS = 200
+SUMMARY_SYSTEM_PROMPT = "You are a helpful assistant that creates concise summaries."
+TRANSCRIPT_USER_PROMPT = "Create a concise summary of the following transcript:\n\n{transcript}"
+REDUCE_USER_PROMPT = "Create a concise summary of the following summaries:\n\n{summaries}"
+TEMPERATURE = 0.3
+
+def chunk_digest(chunk: str, model: str, max_tokens: int = CHUNK_MAX_TOKENS) -> str:
+    """Content hash identifying a chunk's map output: text, model, prompt and params."""
+    payload = json.dumps(
+        [model, CHUNK_SYSTEM_PROMPT, CHUNK_USER_PROMPT, max_tokens, TEMPERATURE, chunk]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+@contextmanager
+def _observe_llm_call(model: str):
+    """Record latency and outcome of one LLM call attempt."""
+    LLM_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        LLM_IN_FLIGHT.dec()
+        LLM_LATENCY.labels(model=model, outcome=outcome).observe(time.perf_counter() - start)
+
+def _chapter(chunk: TimedChunk, summary: str) -> Dict:
+    return {"start": round(chunk.start, 2), "end": round(chunk.end, 2), "summary": summary}
+
+def _truncate_batches(batches: List[str], budget: int, counter: SizeCounter) -> str:
+    """Join batches within ``budget``, keeping an equal-size head (whole words) of each."""
+    share = max(1, (budget - counter(" ") * (len(batches) - 1)) // len(batches))
+    heads = []
+    for batch in batches:
+        words = chunk_text(batch, share, boundary="word", counter=counter)
+        if words:
+            heads.append(words[0])
+    return " ".join(heads)
+
+def _record_usage(model: str, usage) -> None:
+    if usage is None:
+        return
+    LLM_TOKENS.labels(model=model, kind="prompt").inc(usage.prompt_tokens or 0)
+    LLM_TOKENS.labels(model=model, kind="completion").inc(usage.completion_tokens or 0)
+    LLM_COST.labels(model=model).inc(estimate_cost(model, usage.prompt_tokens or 0, usage.completion_tokens or 0))
+
 class SummarizerService:
     def __init__(self):
         self.cache = cache_service
         if not settings.openai_api_key:
             raise ValueError("OPENAI_API_KEY is required but not set. Please set it in your environment variables.")
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        # Imported here: openai is by far the slowest import, and not needed to serve /health
+        from openai import AsyncOpenAI
+
+        # Retries are handled by the LLM scheduler, which frees the concurrency slot while backing off
+        self.client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+
+    async def warm(self) -> None:
+        """Open a keep-alive connection to the API with a cheap request (no tokens used)."""
+        await self.client.models.list()
+
+    async def close(self) -> None:
+        await self.client.close()
 
     async def summarize_transcript(self, transcript: str) -> str:
-        key = hashlib.md5(transcript.encode()).hexdigest()
-        cached_summary = await self.cache.get_summary(key)
-        if cached_summary:
-            return cached_summary
+        """Summarize plain transcript text (no timing); see ``summarize_segments``."""
+        # Final summaries are cached by the caller under the canonical video key
+        # (see app.services.cache_keys), not by transcript content here.
+        summary, _ = await self.summarize_segments([{"text": transcript, "start": 0.0, "duration": 0.0}])
+        return summary
+
+    async def summarize_segments(self, segments: List[Dict]) -> Tuple[str, List[Dict]]:
+        """
+        Summarize a transcript given as segments (text/start/duration, sorted).
 
-        chunks = chunk_text(transcript, max_chunk_size=settings.max_chars_per_chunk)
-        summaries = await self._summarize_chunks(chunks)
-        final_summary = await self._combine_summaries(summaries)
+        Chunks are cut between segments and keep their time range, so each
+        chunk summary comes back as a chapter: ``{"start", "end", "summary"}``.
+        A transcript summarized in a single call is one chapter.
+        """
+        new_flow()
+        segments = await self._prefilter_segments(segments)
+        plan, sizes = self._plan(segments)
+        chunks = self._chunk_segments(segments, plan, sizes)
+        if plan.single_call:
+            summary = await self._summarize_whole(chunks[0].text, plan)
+            return summary, [_chapter(chunks[0], summary)]
+        summaries = await self._summarize_chunks(
+            [chunk.text for chunk in chunks], plan.chunk_model, plan.chunk_max_tokens
+        )
+        chapters = [_chapter(chunk, summary) for chunk, summary in zip(chunks, summaries)]
+        return await self._combine_summaries(summaries), chapters
 
-        await self.cache.set_summary(key, final_summary)
-        return final_summary
+    async def summarize_transcript_stream(self, segments: List[Dict]) -> AsyncIterator[Dict]:
+        """
+        Like ``summarize_segments``, but yielding progress events as they happen.
 
-    async def _summarize_chunks(self, chunks: List[str]) -> List[str]:
-        return await asyncio.gather(*(self._summarize_chunk(chunk) for chunk in chunks))
+        Yields dicts with an ``event`` field: "chunks" once the transcript is
+        split, "chunk" for each chunk summary in completion order (with its
+        ``start``/``end`` seconds), "delta" for each streamed token of the
+        reduce step, and finally "summary" (with ``chapters``). A transcript
+        summarized in a single call has one chunk and no "chunk" events; its
+        tokens stream as "delta" events.
+        """
+        new_flow()
+        segments = await self._prefilter_segments(segments)
+        plan, sizes = self._plan(segments)
+        chunks = self._chunk_segments(segments, plan, sizes)
+        texts = [chunk.text for chunk in chunks]
+        yield {"event": "chunks", "count": len(chunks)}
 
-    async def _summarize_chunk(self, chunk: str) -> str:
+        summaries: List[Optional[str]] = [None] * len(chunks)
+
+        async def indexed(index: int, chunk: str):
+            return index, await self._summarize_chunk(chunk, plan.chunk_model, plan.chunk_max_tokens)
+
+        tasks = [] if plan.single_call else [asyncio.ensure_future(indexed(i, text)) for i, text in enumerate(texts)]
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.openai_chunk_model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that summarizes text concisely."},
-                    {"role": "user", "content": f"Summarize the following text:\n\n{chunk}"}
+            for next_done in asyncio.as_completed(tasks):
+                index, summary = await next_done
+                summaries[index] = summary
+                yield {"event": "chunk", "index": index, **_chapter(chunks[index], summary)}
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        deltas: asyncio.Queue = asyncio.Queue()
+        if plan.single_call:
+            final = self._summarize_whole(texts[0], plan, on_delta=deltas.put)
+        else:
+            final = self._combine_summaries(summaries, on_delta=deltas.put)
+        reduce_task = asyncio.ensure_future(final)
+        reduce_task.add_done_callback(lambda _: deltas.put_nowait(None))
+        try:
+            while (delta := await deltas.get()) is not None:
+                yield {"event": "delta", "text": delta}
+            summary = await reduce_task
+            if plan.single_call:
+                summaries = [summary]
+            chapters = [_chapter(chunk, chunk_summary) for chunk, chunk_summary in zip(chunks, summaries)]
+            yield {"event": "summary", "summary": summary, "chapters": chapters}
+        finally:
+            reduce_task.cancel()
+
+    def _plan(self, segments: List[Dict]) -> Tuple[SummaryPlan, List[int]]:
+        """
+        Route a (pre-filtered) transcript by its size in chunk-model tokens.
+        Also returns each segment's size, so chunking doesn't measure them again.
+        """
+        counter = get_token_counter(settings.openai_chunk_model)
+        sizes = [counter(text) if (text := s["text"].strip()) else 0 for s in segments]
+        plan = plan_summary(sum(sizes))
+        SUMMARY_ROUTE.labels(route="single" if plan.single_call else "map_reduce").inc()
+        return plan, sizes
+
+    def _chunk_budget(self, plan: SummaryPlan, chars: int) -> Tuple[int, SizeCounter]:
+        """The plan's chunk size in the configured chunking unit (tokens or characters)."""
+        if settings.max_tokens_per_chunk:
+            return plan.chunk_tokens, get_token_counter(plan.chunk_model)
+        # Scale the token target by this transcript's own characters per token
+        scaled = math.ceil(plan.chunk_tokens * chars / plan.transcript_tokens) if plan.transcript_tokens else 0
+        return max(settings.max_chars_per_chunk, scaled), char_counter
+
+    def _chunk_segments(self, segments: List[Dict], plan: SummaryPlan, sizes: List[int]) -> List[TimedChunk]:
+        """Split segments into chunks of the planned size, keeping each chunk's time range."""
+        if plan.single_call:
+            # One chunk spanning the whole transcript
+            return chunk_timed_segments(segments, sys.maxsize)
+        budget, counter = self._chunk_budget(plan, sum(len(s["text"]) + 1 for s in segments))
+        # The plan measured segments in chunk-model tokens; reuse that when chunking in the same unit
+        reuse = settings.max_tokens_per_chunk and plan.chunk_model == settings.openai_chunk_model
+        chunks = chunk_timed_segments(
+            segments,
+            budget,
+            overlap=settings.chunk_overlap,
+            counter=counter,
+            boundary=settings.chunk_boundary,
+            sizes=sizes if reuse else None,
+        )
+        CHUNK_COUNT.observe(len(chunks))
+        for chunk in chunks:
+            CHUNK_SIZE.observe(len(chunk.text))
+        return chunks
+
+    async def _prefilter_segments(self, segments: List[Dict]) -> List[Dict]:
+        """
+        Drop repeated and low-information segments locally before any LLM
+        call; kept segments keep their timing.
+        """
+        if not settings.prefilter_enabled or not segments:
+            return segments
+        # Pure CPU (about half a second on a three-hour transcript); keep it off the event loop
+        kept = await asyncio.to_thread(
+            extractive_reduce_segments,
+            segments,
+            ratio=settings.prefilter_ratio,
+            dedup_threshold=settings.prefilter_dedup_threshold,
+        )
+        total = sum(len(s["text"]) for s in segments)
+        if total:
+            PREFILTER_KEPT_RATIO.observe(sum(len(s["text"]) for s in kept) / total)
+        return kept
+
+    async def _summarize_chunks(
+        self, chunks: List[str], model: Optional[str] = None, max_tokens: int = CHUNK_MAX_TOKENS
+    ) -> List[str]:
+        return await asyncio.gather(*(self._summarize_chunk(chunk, model, max_tokens) for chunk in chunks))
+
+    async def _complete(self, model: str, messages: List[Dict[str, str]], max_tokens: int) -> str:
+        """Run a chat completion through the process-wide LLM scheduler."""
+        count_tokens = get_token_counter(model)
+        estimated_tokens = sum(count_tokens(m["content"]) for m in messages) + max_tokens
+
+        async def call():
+            with _observe_llm_call(model):
+                response = await self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=TEMPERATURE
+                )
+            _record_usage(model, response.usage)
+            return response
+
+        response = await llm_scheduler.submit(model, estimated_tokens, call)
+        return response.choices[0].message.content.strip()
+
+    async def _stream_complete(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        on_delta: Callable[[str], Awaitable[None]],
+    ) -> str:
+        """Like ``_complete``, but streams tokens to ``on_delta`` as they arrive."""
+        count_tokens = get_token_counter(model)
+        estimated_tokens = sum(count_tokens(m["content"]) for m in messages) + max_tokens
+
+        async def call() -> str:
+            parts: List[str] = []
+            try:
+                with _observe_llm_call(model):
+                    stream = await self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=TEMPERATURE,
+                        stream=True,
+                        stream_options={"include_usage": True}
+                    )
+                    async for event in stream:
+                        if event.usage is not None:
+                            _record_usage(model, event.usage)
+                        delta = event.choices[0].delta.content if event.choices else None
+                        if delta:
+                            parts.append(delta)
+                            await on_delta(delta)
+            except Exception as e:
+                if parts:
+                    # Tokens already went out to the client; retrying would duplicate them
+                    raise RuntimeError(f"Stream interrupted: {e}") from e
+                raise
+            return "".join(parts).strip()
+
+        return await llm_scheduler.submit(model, estimated_tokens, call)
+
+    async def _summarize_chunk(
+        self, chunk: str, model: Optional[str] = None, max_tokens: int = CHUNK_MAX_TOKENS
+    ) -> str:
+        # Chunk outputs are cached by content, so re-summarizing a revised
+        # transcript only calls the LLM for chunks that actually changed.
+        model = model or settings.openai_chunk_model
+        digest = chunk_digest(chunk, model, max_tokens)
+        cached = await self.cache.get_chunk_summary(digest)
+        if cached:
+            return cached
+        try:
+            summary = await self._complete(
+                model,
+                [
+                    {"role": "system", "content": CHUNK_SYSTEM_PROMPT},
+                    {"role": "user", "content": CHUNK_USER_PROMPT.format(chunk=chunk)}
                 ],
-                max_tokens=200,
-                temperature=0.3
+                max_tokens=max_tokens,
             )
-            return response.choices[0].message.content.strip()
         except Exception as e:
             raise Exception(f"Failed to summarize chunk: {str(e)}")
+        await self.cache.set_chunk_summary(digest, summary)
+        return summary
 
-    async def _combine_summaries(self, summaries: List[str]) -> str:
-        combined = ' '.join(summaries)
-        # If combined summary is too long, summarize it further
-        if len(combined) > settings.max_chars_per_chunk:
-            try:
-                response = await self.client.chat.completions.create(
-                    model=settings.openai_reduce_model,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant that creates concise summaries."},
-                        {"role": "user", "content": f"Create a concise summary of the following summaries:\n\n{combined}"}
-                    ],
-                    max_tokens=500,
-                    temperature=0.3
+    def _reduce_budget(self) -> Tuple[int, SizeCounter]:
+        """Per-prompt budget for reduce input, in the same unit as chunking."""
+        if settings.max_tokens_per_chunk:
+            return settings.max_tokens_per_chunk, get_token_counter(settings.openai_reduce_model)
+        return settings.max_chars_per_chunk, char_counter
+
+    async def _summarize_whole(
+        self,
+        transcript: str,
+        plan: SummaryPlan,
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> str:
+        """Summarize a short transcript in one call, skipping the map phase."""
+        messages = [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": TRANSCRIPT_USER_PROMPT.format(transcript=transcript)}
+        ]
+        try:
+            if on_delta is not None:
+                return await self._stream_complete(
+                    plan.summary_model, messages, max_tokens=plan.summary_max_tokens, on_delta=on_delta
                 )
-                return response.choices[0].message.content.strip()
-            except Exception as e:
-                # If final summarization fails, return the combined summaries
-                return combined
-        return combined
\ No newline at end of file
+            return await self._complete(plan.summary_model, messages, max_tokens=plan.summary_max_tokens)
+        except Exception as e:
+            raise Exception(f"Failed to summarize transcript: {str(e)}")
+
+    async def _reduce(self, text: str, on_delta: Optional[Callable[[str], Awaitable[None]]] = None) -> str:
+        messages = [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": REDUCE_USER_PROMPT.format(summaries=text)}
+        ]
+        if on_delta is not None:
+            return await self._stream_complete(
+                settings.openai_reduce_model, messages, max_tokens=settings.summary_max_tokens, on_delta=on_delta
+            )
+        return await self._complete(settings.openai_reduce_model, messages, max_tokens=settings.summary_max_tokens)
+
+    async def _combine_summaries(
+        self,
+        summaries: List[str],
+        on_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> str:
+        """
+        Reduce chunk summaries to one summary.
+
+        If they fit in one prompt they are joined as-is. Otherwise they are
+        reduced as a tree: summaries are packed into batches under the prompt
+        budget and each batch is reduced in parallel, level by level, until a
+        single batch remains for the final reduce. Latency grows with
+        log(chunks) and no prompt exceeds the budget.
+        """
+        budget, counter = self._reduce_budget()
+        combined = ' '.join(summaries)
+        if counter(combined) <= budget:
+            return combined
+
+        level = list(summaries)
+        batches = chunk_units(level, budget, counter=counter)
+        for _ in range(settings.reduce_max_levels):
+            if len(batches) <= 1:
+                break
+            level = await asyncio.gather(*(self._reduce_batch(batch) for batch in batches))
+            next_batches = chunk_units(level, budget, counter=counter)
+            if len(next_batches) >= len(batches):
+                # Reduce outputs aren't shrinking (budget too close to max_tokens); stop here
+                batches = next_batches
+                break
+            batches = next_batches
+
+        final_input = ' '.join(batches)
+        if counter(final_input) > budget:
+            # Depth limit hit or reduces stopped shrinking: keep the head of every
+            # batch rather than send an over-budget prompt
+            final_input = _truncate_batches(batches, budget, counter)
+        try:
+            return await self._reduce(final_input, on_delta=on_delta)
+        except Exception as e:
+            # If final summarization fails, return the combined summaries
+            return final_input
+
+    async def _reduce_batch(self, batch: str) -> str:
+        """Reduce one batch of an intermediate tree level; keeps the raw batch on failure."""
+        try:
+            return await self._reduce(batch)
+        except Exception:
+            return batch
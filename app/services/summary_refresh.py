@@ -0,0 +1,123 @@
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+import asyncio
+import logging
+from app.services.cache import cache_service
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Regenerates and caches the summary for (video_id, language).
+Refresh = Callable[[str, str], Awaitable[str]]
+
+class SummaryRefresher:
+    """
+    Keeps popular summaries warm.
+
+    ``schedule`` starts a background refresh of one stale entry; a Redis lock
+    makes sure only one worker refreshes a given video at a time. With
+    ``summary_prewarm_top_n`` set, requests are also counted (buffered in
+    process and flushed to a Redis sorted set), and a periodic pass refreshes
+    the most requested summaries that are about to go stale, so popular
+    videos never make a caller wait for a cold summarization.
+    """
+
+    def __init__(
+        self,
+        refresh: Refresh,
+        top_n: Optional[int] = None,
+        interval_seconds: Optional[float] = None,
+    ):
+        self.refresh = refresh
+        self.top_n = settings.summary_prewarm_top_n if top_n is None else top_n
+        self.interval_seconds = interval_seconds or settings.summary_prewarm_interval_seconds
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._counts: Counter = Counter()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+
+    def schedule(self, video_id: str, language: str) -> None:
+        """Refresh one summary in the background, unless already being refreshed."""
+        name = f"{video_id}:{language}"
+        if name in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh_once(video_id, language))
+        self._refreshing[name] = task
+        task.add_done_callback(lambda t, n=name: self._refreshing.pop(n, None))
+
+    async def _refresh_once(self, video_id: str, language: str) -> None:
+        name = f"{video_id}:{language}"
+        if not await cache_service.try_lock(name, settings.singleflight_lock_ttl_seconds):
+            return
+        try:
+            await self.refresh(video_id, language)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                "summary refresh failed",
+                extra={"video_id": video_id, "language": language, "error": type(e).__name__},
+            )
+
+    def record_access(self, video_id: str, language: str) -> None:
+        """Count a request towards pre-warming; a no-op when pre-warming is off."""
+        if self.top_n <= 0:
+            return
+        self._counts[f"{video_id}:{language}"] += 1
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+        self.start()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(settings.summary_access_flush_seconds)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered access counts to Redis in one pipeline."""
+        counts, self._counts = self._counts, Counter()
+        await cache_service.record_accesses(dict(counts))
+
+    def start(self) -> None:
+        """Start the pre-warm loop if enabled and not already running."""
+        if self.top_n > 0 and (self._prewarm_task is None or self._prewarm_task.done()):
+            self._prewarm_task = asyncio.create_task(self._prewarm_loop())
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._flush_task, self._prewarm_task) if t is not None]
+        tasks += list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._flush_task = self._prewarm_task = None
+
+    async def _prewarm_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.prewarm()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("summary pre-warm failed", extra={"error": type(e).__name__})
+
+    async def prewarm(self) -> List[str]:
+        """
+        Refresh the top-N most requested summaries that are missing or will
+        go stale before the next pass. One worker per interval does this.
+        Returns the refreshed "{video_id}:{language}" names.
+        """
+        # Slightly shorter than the interval so the next pass can take it
+        if not await cache_service.try_lock("prewarm", max(1, int(self.interval_seconds * 0.9))):
+            return []
+        popular = await cache_service.most_requested(self.top_n)
+        entries = await cache_service.get_summary_entries(popular)
+        refreshed = []
+        # Sequential on purpose: pre-warming should not compete with live traffic
+        for (video_id, language), entry in entries.items():
+            if entry is None or entry.is_stale(ahead_seconds=self.interval_seconds):
+                await self._refresh_once(video_id, language)
+                refreshed.append(f"{video_id}:{language}")
+        await cache_service.decay_accesses(settings.summary_access_decay, keep=self.top_n * 10)
+        return refreshed
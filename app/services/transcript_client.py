@@ -0,0 +1,82 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+class TranscriptClient:
+    """
+    Thin wrapper around one YouTubeTranscriptApi instance and its HTTP session.
+
+    Splits a transcript fetch into its two round trips so the first can be
+    cached: ``list_tracks`` (watch page + player API, the expensive part)
+    returns plain, JSON-serializable track metadata, and ``fetch_track``
+    downloads one track (optionally translated) from that metadata alone.
+    Everything that depends on youtube_transcript_api internals lives here.
+    """
+
+    # Opened by ``warm`` to set up the TLS connection (through the proxy) ahead of the first fetch
+    WARM_URL = "https://www.youtube.com/robots.txt"
+
+    def __init__(self, api: Any, session: "requests.Session"):
+        self.api = api
+        self.session = session
+
+    def warm(self, timeout: float = 5.0) -> None:
+        # Read the body so the connection goes back to the pool instead of being closed
+        self.session.get(self.WARM_URL, timeout=timeout).content
+
+    def list_tracks(self, video_id: str) -> Dict:
+        """
+        Metadata of every caption track of a video:
+        ``{"tracks": [{language_code, language, is_generated, translatable, url}],
+        "translation_languages": [{language_code, language}]}``.
+        """
+        # youtube-transcript-api >= 1.0 renamed list_transcripts to list
+        list_transcripts = getattr(self.api, "list", None) or self.api.list_transcripts
+        tracks: List[Dict] = []
+        translation_languages: Dict[str, str] = {}
+        for transcript in list_transcripts(video_id):
+            for lang in transcript.translation_languages:
+                code, name = _translation_language(lang)
+                translation_languages[code] = name
+            tracks.append({
+                "language_code": transcript.language_code,
+                "language": transcript.language,
+                "is_generated": transcript.is_generated,
+                "translatable": bool(transcript.translation_languages),
+                # Signed caption URL; not exposed publicly by the library
+                "url": transcript._url,
+            })
+        return {
+            "tracks": tracks,
+            "translation_languages": [
+                {"language_code": code, "language": name} for code, name in translation_languages.items()
+            ],
+        }
+
+    def fetch_track(self, video_id: str, track: Dict, translate_to: Optional[str] = None) -> List[Dict]:
+        """Download one caption track described by ``list_tracks`` metadata."""
+        from youtube_transcript_api import Transcript
+        from youtube_transcript_api._transcripts import _TranslationLanguage
+
+        translation_languages = []
+        if track["translatable"] and translate_to:
+            translation_languages = [_TranslationLanguage(language=translate_to, language_code=translate_to)]
+        transcript = Transcript(
+            self.session,
+            video_id,
+            track["url"],
+            track["language"],
+            track["language_code"],
+            track["is_generated"],
+            translation_languages,
+        )
+        if translate_to:
+            transcript = transcript.translate(translate_to)
+        return transcript.fetch().to_raw_data()
+
+def _translation_language(lang: Any):
+    # Dataclasses in youtube-transcript-api >= 1.0, dicts before
+    if isinstance(lang, dict):
+        return lang["language_code"], lang["language"]
+    return lang.language_code, lang.language
@@ -1,31 +1,26 @@
-from typing import Optional, List, Dict
-import asyncio
-import json
+from typing import Optional, List, Dict, Sequence, Tuple
+import logging
+import time
 from urllib.parse import urlparse, parse_qs
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api.proxies import WebshareProxyConfig
-from app.services.cache import cache_service, get_redis_client
+from app.services.cache import cache_service
+from app.services.metrics import FETCH_ERRORS, FETCH_LATENCY
+from app.services.fetch_executor import FetchExecutor, FetchPoolSaturated, FetchTimeout
+from app.services.proxy_pool import ProxyPool, build_endpoints, is_proxy_error
 from app.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-# --- Configure youtube-transcript-api with optional Webshare proxies ---
-def _build_ytt_client() -> YouTubeTranscriptApi:
-    """
-    Build a YouTubeTranscriptApi client.
-    If WEBSHARE_USERNAME / WEBSHARE_PASSWORD are set, use Webshare proxies.
-    Otherwise, use direct connection.
-    """
-    if settings.webshare_username and settings.webshare_password:
-        proxy_config = WebshareProxyConfig(
-            proxy_username=settings.webshare_username,
-            proxy_password=settings.webshare_password,
-        )
-        return YouTubeTranscriptApi(proxy_config=proxy_config)
-    else:
-        return YouTubeTranscriptApi()
+# Dedicated pool for blocking fetches, so a slow proxy can't exhaust the default executor
+fetch_executor = FetchExecutor(
+    max_workers=settings.fetch_pool_size,
+    max_queue=settings.fetch_queue_limit,
+    timeout_seconds=settings.fetch_timeout_seconds,
+)
 
-_ytt_client = _build_ytt_client()
+# Transcript clients (direct, Webshare and/or generic proxies) with health scoring and hedging
+# (built on first use or at startup warmup; see app.lifespan)
+proxy_pool = ProxyPool(build_endpoints, runner=fetch_executor.run, hedging=settings.proxy_hedging)
 
 def extract_video_id(url_or_id: str) -> str:
     """Extract a YouTube video ID from a URL or ID string."""
@@ -49,40 +44,115 @@ def extract_video_id(url_or_id: str) -> str:
     
     raise ValueError("Cannot extract video id from input")
 
-def _fetch_transcript_blocking(video_id: str, language: str = "en") -> List[Dict]:
+class TranscriptNotFound(Exception):
+    """No transcript in any requested language (and no translation to one)."""
+
+def choose_track(listing: Dict, languages: Sequence[str]) -> Tuple[Dict, Optional[str]]:
     """
-    Blocking call that uses the global _ytt_client, which may be proxy-backed.
+    Pick the caption track for an ordered list of preferred languages.
+
+    Returns ``(track, translate_to)``. A track in a preferred language wins,
+    earlier languages first and manual captions before generated ones.
+    Otherwise the best translatable track is translated into the first
+    preferred language YouTube can translate to.
     """
-    transcript_list = _ytt_client.list_transcripts(video_id)
-    # Prefer manual transcript if available; otherwise generated
-    try:
-        t = transcript_list.find_manually_created_transcript([language])
-    except Exception:
-        t = transcript_list.find_generated_transcript([language])
-    return t.fetch()
+    tracks = listing.get("tracks", [])
+    for language in languages:
+        for generated in (False, True):
+            for track in tracks:
+                if track["language_code"] == language and track["is_generated"] == generated:
+                    return track, None
+
+    available = {t["language_code"] for t in listing.get("translation_languages", [])}
+    translatable = sorted((t for t in tracks if t["translatable"]), key=lambda t: t["is_generated"])
+    for language in languages:
+        if translatable and language in available:
+            return translatable[0], language
+    raise TranscriptNotFound(f"No transcript in {', '.join(languages)}")
+
+def _fetch_transcript_blocking(video_id: str, language: str = "en", client=None) -> List[Dict]:
+    """
+    Blocking list-and-fetch through ``client``, a TranscriptClient from the
+    proxy pool (no track listing cache).
+    """
+    client = client or proxy_pool.endpoints[0].client
+    track, translate_to = choose_track(client.list_tracks(video_id), [language])
+    return client.fetch_track(video_id, track, translate_to)
+
+async def get_transcript_tracks(video_id: str) -> Dict:
+    """
+    Caption track listing for a video, from cache or YouTube.
+
+    Videos without any transcript (disabled, unavailable, invalid ID) are
+    cached as negative results for ``cache_ttl_negative_seconds`` and raise
+    TranscriptNotFound without another round trip to YouTube.
+    """
+    listing = await cache_service.get_transcript_tracks(video_id)
+    if listing is None:
+        try:
+            listing = await proxy_pool.fetch(lambda client: client.list_tracks(video_id))
+        except Exception as e:
+            if is_proxy_error(e) or isinstance(e, (FetchPoolSaturated, FetchTimeout)):
+                raise
+            # The video itself has no transcripts; remember that briefly
+            listing = {"error": type(e).__name__}
+            await cache_service.set_transcript_tracks(video_id, listing, ttl=settings.cache_ttl_negative_seconds)
+        else:
+            await cache_service.set_transcript_tracks(video_id, listing)
+    if "error" in listing or not listing.get("tracks"):
+        raise TranscriptNotFound(listing.get("error", "No transcripts"))
+    return listing
+
+async def resolve_language(video_id: str, languages: Sequence[str]) -> str:
+    """The language a request for ``languages`` is served in (native or translated)."""
+    track, translate_to = choose_track(await get_transcript_tracks(video_id), languages)
+    return translate_to or track["language_code"]
 
 async def fetch_transcript_async(video_id: str, language: str = "en") -> List[Dict]:
-    """Fetch transcript asynchronously using executor."""
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(
-        None, _fetch_transcript_blocking, video_id, language
-    )
+    """
+    Fetch transcript asynchronously on the dedicated fetch pool, through the
+    best available proxy (hedged to a second one when slow).
+
+    The track listing comes from cache when possible, so only the caption
+    download goes to YouTube; if the cached caption URL has expired the
+    listing is refreshed once. Falls back to a translated track when there
+    is none in ``language``.
+
+    Raises FetchPoolSaturated when too many fetches are pending,
+    FetchTimeout when the fetch exceeds ``fetch_timeout_seconds`` and
+    TranscriptNotFound when the video has no usable transcript.
+    """
+    start = time.perf_counter()
+    try:
+        for attempt in range(2):
+            listing = await get_transcript_tracks(video_id)
+            track, translate_to = choose_track(listing, [language])
+            try:
+                transcript = await proxy_pool.fetch(
+                    lambda client: client.fetch_track(video_id, track, translate_to)
+                )
+                break
+            except (FetchPoolSaturated, FetchTimeout):
+                raise
+            except Exception:
+                if attempt:
+                    raise
+                await cache_service.delete_transcript_tracks(video_id)
+    except Exception as e:
+        FETCH_LATENCY.labels(outcome="error").observe(time.perf_counter() - start)
+        FETCH_ERRORS.labels(error=type(e).__name__).inc()
+        raise
+    FETCH_LATENCY.labels(outcome="ok").observe(time.perf_counter() - start)
+    return transcript
 
 async def get_or_fetch_transcript(video_id: str, language: str = "en") -> List[Dict]:
-    """Get transcript from cache or fetch from YouTube."""
-    key = f"transcript:{video_id}:{language}"
-    client = await get_redis_client()
-    
-    cached = await client.get(key)
-    if cached:
-        return json.loads(cached)
+    """Get transcript segments from cache or fetch from YouTube."""
+    cached = await cache_service.get_transcript_segments(video_id, language)
+    if cached is not None:
+        return cached
     
     transcript = await fetch_transcript_async(video_id, language)
-    await client.set(
-        key,
-        json.dumps(transcript),
-        ex=settings.cache_ttl_transcript_seconds,
-    )
+    await cache_service.set_transcript_segments(video_id, transcript, language)
     return transcript
 
 def transcript_to_text(transcript: List[Dict]) -> str:
@@ -94,30 +164,50 @@ class YouTubeService:
     def __init__(self):
         self.cache_service = cache_service
 
-    async def fetch_transcript(self, url_or_id: str, language: str = "en") -> Optional[str]:
-        """Fetch transcript from YouTube, using cache if available."""
+    async def fetch_transcript_segments(self, url_or_id: str, language: str = "en") -> Optional[List[Dict]]:
+        """
+        Fetch transcript segments (text/start/duration, sorted by start) from
+        YouTube, using cache if available.
+        """
         try:
             video_id = extract_video_id(url_or_id)
         except ValueError:
             return None
-        
-        # Check cache first
-        cached_transcript = await self.cache_service.get_transcript(video_id)
-        if cached_transcript:
-            return cached_transcript
 
         try:
-            # Fetch transcript (may use Webshare proxies if configured)
-            transcript = await get_or_fetch_transcript(video_id, language)
-            transcript_text = transcript_to_text(transcript)
-            
-            # Cache the text version
-            await self.cache_service.set_transcript(video_id, transcript_text)
-            return transcript_text
+            return await get_or_fetch_transcript(video_id, language)
+        except (FetchPoolSaturated, FetchTimeout):
+            raise
+        except TranscriptNotFound:
+            return None
         except Exception as e:
-            print(f"Error fetching transcript for video ID {video_id}: {e}")
+            logger.warning(
+                "transcript fetch failed",
+                extra={"video_id": video_id, "language": language, "error": type(e).__name__, "detail": str(e)},
+            )
+            return None
+
+    async def fetch_transcript(self, url_or_id: str, language: str = "en") -> Optional[str]:
+        """Fetch transcript text from YouTube, using cache if available."""
+        try:
+            video_id = extract_video_id(url_or_id)
+        except ValueError:
             return None
 
+        # The text view is decoded straight from the stored segments
+        cached_transcript = await self.cache_service.get_transcript(video_id, language)
+        if cached_transcript:
+            return cached_transcript
+        segments = await self.fetch_transcript_segments(video_id, language)
+        return transcript_to_text(segments) if segments else None
+
+    async def resolve_language(self, video_id: str, languages: Sequence[str]) -> str:
+        """
+        Language a request for ``languages`` (in order of preference) is
+        served in. Raises TranscriptNotFound, FetchPoolSaturated or FetchTimeout.
+        """
+        return await resolve_language(video_id, languages)
+
     async def fetch_transcript_by_url(self, url: str) -> Optional[str]:
         """Fetch transcript by URL (alias for fetch_transcript)."""
         return await self.fetch_transcript(url)
@@ -1,19 +1,254 @@
-def chunk_text(text, max_chunk_size=500):
-    words = text.split()
-    chunks = []
-    current_chunk = []
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
-    for word in words:
-        current_chunk.append(word)
-        if len(' '.join(current_chunk)) >= max_chunk_size:
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
+# A size counter maps a piece of text to its "cost" against the chunk budget:
+# characters by default, or model tokens when a tokenizer is plugged in.
+SizeCounter = Callable[[str], int]
 
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Rough chars-per-token ratio for English text, used when tiktoken is missing.
+_APPROX_CHARS_PER_TOKEN = 4
+
+
+def char_counter(text: str) -> int:
+    """Count characters (the default chunk budget unit)."""
+    return len(text)
+
+
+@lru_cache()
+def get_token_counter(model: Optional[str] = None) -> SizeCounter:
+    """
+    Return a counter that measures text in model tokens.
+
+    Uses tiktoken when it is installed; otherwise falls back to a
+    chars/4 approximation so token-budget mode still works without it.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return lambda text: max(1, -(-len(text) // _APPROX_CHARS_PER_TOKEN))
+
+    try:
+        encoding = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("o200k_base")
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return lambda text: len(encoding.encode_ordinary(text))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation followed by whitespace."""
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+
+def chunk_units(
+    units: Iterable[str],
+    max_chunk_size: int,
+    counter: SizeCounter = char_counter,
+    overlap: int = 0,
+    separator: str = " ",
+) -> List[str]:
+    """
+    Pack text units (words, sentences, segments) into chunks in a single pass.
+
+    A running size is kept so each unit is measured once. A chunk is closed
+    before it would exceed ``max_chunk_size``; a single unit larger than the
+    budget becomes its own chunk. With ``overlap`` > 0, trailing units whose
+    combined size fits within ``overlap`` are repeated at the start of the
+    next chunk.
+    """
+    sep_size = counter(separator) if separator else 0
+    chunks: List[str] = []
+    current: List[str] = []
+    sizes: List[int] = []
+    current_size = 0
+
+    for unit in units:
+        unit_size = counter(unit)
+        added = unit_size + (sep_size if current else 0)
+        if current and current_size + added > max_chunk_size:
+            chunks.append(separator.join(current))
+            current, sizes, current_size = _carry_overlap(current, sizes, overlap, sep_size)
+            if current and current_size + sep_size + unit_size > max_chunk_size:
+                current, sizes, current_size = [], [], 0
+            added = unit_size + (sep_size if current else 0)
+        current.append(unit)
+        sizes.append(unit_size)
+        current_size += added
+
+    if current:
+        chunks.append(separator.join(current))
 
     return chunks
 
 
+def _overlap_len(sizes: List[int], overlap: int, sep_size: int) -> int:
+    """Number of trailing units that fit within the overlap budget."""
+    if overlap <= 0:
+        return 0
+    total = 0
+    count = 0
+    for size in reversed(sizes):
+        total += size + (sep_size if count else 0)
+        if total > overlap:
+            break
+        count += 1
+    # Never carry the whole chunk over, or the next chunk would make no progress.
+    return min(count, len(sizes) - 1)
+
+
+def _carry_overlap(current: List[str], sizes: List[int], overlap: int, sep_size: int):
+    keep = _overlap_len(sizes, overlap, sep_size)
+    if not keep:
+        return [], [], 0
+    kept_sizes = sizes[-keep:]
+    return current[-keep:], kept_sizes, sum(kept_sizes) + sep_size * (keep - 1)
+
+
+def _sentence_units(text: str, max_chunk_size: int, counter: SizeCounter) -> Iterable[str]:
+    """Yield sentences, splitting any sentence over budget into words."""
+    for sentence in split_sentences(text):
+        if counter(sentence) > max_chunk_size:
+            yield from sentence.split()
+        else:
+            yield sentence
+
+
+def chunk_text(
+    text: str,
+    max_chunk_size: int = 500,
+    boundary: str = "word",
+    overlap: int = 0,
+    counter: Optional[SizeCounter] = None,
+) -> List[str]:
+    """
+    Split text into chunks of at most ``max_chunk_size``.
+
+    Args:
+        text: Text to split
+        max_chunk_size: Budget per chunk, in the unit measured by ``counter``
+        boundary: "word" to cut between words, "sentence" to cut between sentences
+        overlap: Budget of trailing context repeated at the start of the next chunk
+        counter: Size counter; characters by default, see ``get_token_counter``
+
+    Returns:
+        List[str]: The chunks, in order
+    """
+    counter = counter or char_counter
+    if boundary == "sentence":
+        units = _sentence_units(text, max_chunk_size, counter)
+    elif boundary == "word":
+        units = text.split()
+    else:
+        raise ValueError(f"Unknown chunk boundary: {boundary}")
+    return chunk_units(units, max_chunk_size, counter=counter, overlap=overlap)
+
+
+class TimedChunk(NamedTuple):
+    """A chunk of transcript text and the time range (seconds) it covers."""
+    text: str
+    start: float
+    end: float
+
+
+def _timed_pieces(
+    segments: List[Dict],
+    max_chunk_size: int,
+    counter: SizeCounter,
+    boundary: str,
+    sizes: Optional[Sequence[int]] = None,
+) -> List[Tuple[Dict, str, int]]:
+    """``(segment, text, size)`` for each non-empty segment, oversized ones split within the budget."""
+    pieces: List[Tuple[Dict, str, int]] = []
+    for index, segment in enumerate(segments):
+        text = segment["text"].strip()
+        if not text:
+            continue
+        size = sizes[index] if sizes is not None else counter(text)
+        if size <= max_chunk_size:
+            pieces.append((segment, text, size))
+            continue
+        parts = chunk_text(text, max_chunk_size, boundary=boundary, counter=counter)
+        start = float(segment.get("start", 0.0))
+        duration = float(segment.get("duration", 0.0))
+        total = sum(len(part) for part in parts)
+        offset = 0
+        for part in parts:
+            piece = {
+                "text": part,
+                "start": start + duration * offset / total,
+                "duration": duration * len(part) / total,
+            }
+            pieces.append((piece, part, counter(part)))
+            offset += len(part)
+    return pieces
+
+
+def chunk_timed_segments(
+    segments: List[Dict],
+    max_chunk_size: int = 500,
+    overlap: int = 0,
+    counter: Optional[SizeCounter] = None,
+    separator: str = " ",
+    boundary: str = "sentence",
+    sizes: Optional[Sequence[int]] = None,
+) -> List[TimedChunk]:
+    """
+    Split transcript segments (sorted by start time) into timed chunks,
+    cutting only between segments.
+
+    Each segment is measured once; cut points are then found by binary
+    search over cumulative offsets, and only the text of each chunk is
+    joined. Overlap and budget behaviour match ``chunk_units``. A segment
+    larger than the budget (e.g. a plain-text transcript given as one
+    segment) is first split like ``chunk_text`` with ``boundary``, each
+    piece getting a share of the segment's time range proportional to its
+    length. ``sizes`` are the segments' (stripped) sizes under ``counter``,
+    when the caller has already measured them.
+    """
+    counter = counter or char_counter
+    pieces = _timed_pieces(segments, max_chunk_size, counter, boundary, sizes)
+    if not pieces:
+        return []
+    segments = [piece[0] for piece in pieces]
+    texts = [piece[1] for piece in pieces]
+    sep_size = counter(separator) if separator else 0
+    # offsets[k] = size of texts[:k], counting one separator after each text
+    offsets = [0, *accumulate(size + sep_size for _, _, size in pieces)]
+
+    chunks: List[TimedChunk] = []
+    i = 0
+    while i < len(texts):
+        # Largest j with size(texts[i:j]) = offsets[j] - offsets[i] - sep <= budget; at least one segment
+        j = max(i + 1, bisect_right(offsets, offsets[i] + max_chunk_size + sep_size) - 1)
+        last = segments[j - 1]
+        end = float(last.get("start", 0.0)) + float(last.get("duration", 0.0))
+        chunks.append(TimedChunk(separator.join(texts[i:j]), float(segments[i].get("start", 0.0)), end))
+        if j >= len(texts):
+            break
+        next_i = j
+        if overlap > 0:
+            # Earliest start whose tail of this chunk fits within the overlap budget
+            carry = max(i + 1, bisect_left(offsets, offsets[j] - sep_size - overlap))
+            # Only carry if the next segment still fits after the overlap
+            if carry < j and offsets[j + 1] - offsets[carry] - sep_size <= max_chunk_size:
+                next_i = carry
+        i = next_i
+    return chunks
+
+
+def chunk_segments(
+    segments: List[Dict],
+    max_chunk_size: int = 500,
+    overlap: int = 0,
+    counter: Optional[SizeCounter] = None,
+) -> List[str]:
+    """Split transcript segments into chunks, cutting only between segments."""
+    return [chunk.text for chunk in chunk_timed_segments(segments, max_chunk_size, overlap, counter)]
+
+
 def chunk_transcript(transcript, max_chunk_size=500):
-    return chunk_text(transcript, max_chunk_size)
\ No newline at end of file
+    return chunk_text(transcript, max_chunk_size)
@@ -0,0 +1,255 @@
+"""
+Local, CPU-only extractive reduction of transcripts before summarization.
+
+Three passes, all in pure Python:
+
+1. Repeated runs. Any run of ``REPEAT_RUN_WORDS`` words that already
+   appeared earlier is cut, wherever it falls. This catches rolling
+   captions and sponsor reads regardless of how the text splits into units.
+2. Near-duplicate removal. Each unit (sentence, or window of words for
+   unpunctuated auto-captions) is shingled into word 3-grams; MinHash
+   signatures split into LSH bands find candidate pairs, which are then
+   confirmed with the exact Jaccard similarity of their shingle sets. Later
+   paraphrased copies of a unit are dropped.
+3. Sentence selection. Units are scored by TF-IDF cosine similarity to the
+   transcript's centroid, and the best ones are kept, in original order,
+   until the target fraction of the transcript is reached.
+
+``extractive_reduce_segments`` runs the same passes on timed transcript
+segments: repeated runs are cut across segment boundaries (segments left
+empty are dropped), and each remaining segment is one unit, so whatever is
+kept keeps its timing.
+"""
+import math
+import random
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Sequence, Set
+
+from app.utils.chunking import SizeCounter, char_counter, split_sentences
+
+# Sentences longer than this (typical of unpunctuated auto-captions) are cut into word windows.
+MAX_UNIT_WORDS = 40
+
+# Shortest word run treated as a verbatim repeat.
+REPEAT_RUN_WORDS = 8
+
+SHINGLE_SIZE = 3
+NUM_PERM = 32
+LSH_BANDS = 8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)
+]
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+# Function words and spoken filler that say nothing about what a sentence is about.
+_STOPWORDS = frozenset("""
+a about after all also am an and any are as at be because been being but by can could did do does
+doing don't for from get got had has have he her here him his how i i'm if in into is it it's its
+just know like me more my no not now of on one or our out really right so some such than that
+that's the their them then there these they thing things think this those to too um uh up us very
+was we we're well were what when where which who will with would yeah you you're your okay oh
+actually basically gonna kind literally mean sort stuff want
+""".split())
+
+def _repeated_run_mask(words: Sequence[str], run_words: int) -> List[bool]:
+    """Which words belong to a run of ``run_words`` words (case- and punctuation-insensitive) seen before."""
+    normalized = [w.lower().strip(".,!?;:\"'()") for w in words]
+    seen: Set[tuple] = set()
+    drop = [False] * len(words)
+    for i in range(len(words) - run_words + 1):
+        run = tuple(normalized[i:i + run_words])
+        if run in seen:
+            for j in range(i, i + run_words):
+                drop[j] = True
+        else:
+            seen.add(run)
+    return drop
+
+def drop_repeated_runs(text: str, run_words: int = REPEAT_RUN_WORDS) -> str:
+    """Remove every run of ``run_words`` words (compared case- and punctuation-insensitively) seen before."""
+    words = text.split()
+    drop = _repeated_run_mask(words, run_words)
+    return " ".join(w for w, dropped in zip(words, drop) if not dropped)
+
+def drop_repeated_runs_segments(segments: Sequence[Dict], run_words: int = REPEAT_RUN_WORDS) -> List[Dict]:
+    """
+    ``drop_repeated_runs`` across segment boundaries: segments keep their
+    timing, and segments left without words are dropped.
+    """
+    words: List[str] = []
+    owners: List[int] = []
+    for index, segment in enumerate(segments):
+        segment_words = segment["text"].split()
+        words.extend(segment_words)
+        owners.extend([index] * len(segment_words))
+    drop = _repeated_run_mask(words, run_words)
+    kept: List[List[str]] = [[] for _ in segments]
+    for word, owner, dropped in zip(words, owners, drop):
+        if not dropped:
+            kept[owner].append(word)
+    return [
+        segment if len(kept_words) == len(segment["text"].split()) else dict(segment, text=" ".join(kept_words))
+        for segment, kept_words in zip(segments, kept)
+        if kept_words
+    ]
+
+def split_units(text: str, max_words: int = MAX_UNIT_WORDS) -> List[str]:
+    """Split text into sentences, cutting overlong ones into ``max_words`` windows."""
+    units: List[str] = []
+    for sentence in split_sentences(text):
+        words = sentence.split()
+        if len(words) <= max_words:
+            units.append(sentence)
+            continue
+        for i in range(0, len(words), max_words):
+            units.append(" ".join(words[i:i + max_words]))
+    return units
+
+def _tokens(unit: str) -> List[str]:
+    return _WORD.findall(unit.lower())
+
+def _shingles(tokens: Sequence[str]) -> Set[int]:
+    if len(tokens) < SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(tokens).encode())} if tokens else set()
+    return {
+        zlib.crc32(" ".join(tokens[i:i + SHINGLE_SIZE]).encode())
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+def text_shingles(text: str) -> Set[int]:
+    """Hashed word ``SHINGLE_SIZE``-gram shingles of ``text`` (case- and punctuation-insensitive)."""
+    return _shingles(_tokens(text))
+
+def minhash_signature(shingles: Set[int]) -> List[int]:
+    """MinHash signature of a shingle set (``NUM_PERM`` universal hash permutations)."""
+    return [min((a * h + b) % _MERSENNE_PRIME for h in shingles) for a, b in _PERMUTATIONS]
+
+def _distinct_indices(units: Sequence[str], threshold: float) -> List[int]:
+    rows = NUM_PERM // LSH_BANDS
+    buckets: Dict[tuple, List[int]] = {}
+    kept_shingles: List[Set[int]] = []
+    kept: List[int] = []
+    for position, unit in enumerate(units):
+        shingles = _shingles(_tokens(unit))
+        if not shingles:
+            continue
+        signature = minhash_signature(shingles)
+        bands = [tuple([band, *signature[band * rows:(band + 1) * rows]]) for band in range(LSH_BANDS)]
+        candidates = {index for key in bands for index in buckets.get(key, ())}
+        if any(_jaccard(shingles, kept_shingles[index]) >= threshold for index in candidates):
+            continue
+        index = len(kept)
+        kept.append(position)
+        kept_shingles.append(shingles)
+        for key in bands:
+            buckets.setdefault(key, []).append(index)
+    return kept
+
+def drop_near_duplicates(units: Sequence[str], threshold: float = 0.8) -> List[str]:
+    """
+    Drop units whose word-shingle Jaccard similarity to an earlier kept unit
+    is at least ``threshold``. The first occurrence is kept.
+    """
+    return [units[i] for i in _distinct_indices(units, threshold)]
+
+def _jaccard(a: Set[int], b: Set[int]) -> float:
+    return len(a & b) / len(a | b)
+
+def score_units(units: Sequence[str]) -> List[float]:
+    """
+    Score units by TF-IDF cosine similarity to the centroid of all units,
+    i.e. by how representative they are of the transcript as a whole.
+    """
+    term_counts = [Counter(t for t in _tokens(unit) if t not in _STOPWORDS) for unit in units]
+    document_frequency: Counter = Counter()
+    for counts in term_counts:
+        document_frequency.update(counts.keys())
+    n = len(units)
+    idf = {term: math.log((1 + n) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+    vectors = [{term: tf * idf[term] for term, tf in counts.items()} for counts in term_counts]
+    centroid: Counter = Counter()
+    for vector in vectors:
+        centroid.update(vector)
+
+    scores = []
+    for vector in vectors:
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        scores.append(sum(w * centroid[t] for t, w in vector.items()) / norm if norm else 0.0)
+    return scores
+
+def _select_indices(sizes: Sequence[int], scores: Sequence[float], budget: float) -> List[int]:
+    chosen: List[int] = []
+    used = 0
+    for index in sorted(range(len(sizes)), key=lambda i: scores[i], reverse=True):
+        if used >= budget:
+            break
+        chosen.append(index)
+        used += sizes[index]
+    return sorted(chosen)
+
+def select_units(
+    units: Sequence[str],
+    scores: Sequence[float],
+    ratio: float,
+    counter: SizeCounter = char_counter,
+) -> List[str]:
+    """Keep the best-scoring units, in original order, up to ``ratio`` of the total size."""
+    sizes = [counter(unit) for unit in units]
+    return [units[i] for i in _select_indices(sizes, scores, ratio * sum(sizes))]
+
+def _reduce_indices(units: Sequence[str], ratio: float, dedup_threshold: float, counter: SizeCounter) -> List[int]:
+    """Indices of the units to keep: distinct ones, then the best up to ``ratio`` of the original size."""
+    sizes = [counter(unit) for unit in units]
+    keep = _distinct_indices(units, dedup_threshold)
+    budget = ratio * sum(sizes)
+    if sum(sizes[i] for i in keep) > budget:
+        picked = _select_indices([sizes[i] for i in keep], score_units([units[i] for i in keep]), budget)
+        keep = [keep[i] for i in picked]
+    return keep
+
+def extractive_reduce(
+    text: str,
+    ratio: float = 1.0,
+    dedup_threshold: float = 0.8,
+    counter: SizeCounter = char_counter,
+) -> str:
+    """
+    Shrink a transcript to about ``ratio`` of its size: drop repeated runs and
+    near-duplicate units, then, if that was not enough, keep the most
+    representative of the remaining ones (``ratio=1.0`` only dedups).
+    """
+    original_size = sum(counter(unit) for unit in split_units(text))
+    units = split_units(drop_repeated_runs(text))
+    remaining_size = sum(counter(unit) for unit in units)
+    if not remaining_size:
+        return ""
+    keep = _reduce_indices(units, min(1.0, ratio * original_size / remaining_size), dedup_threshold, counter)
+    return " ".join(units[i] for i in keep)
+
+def extractive_reduce_segments(
+    segments: Sequence[Dict],
+    ratio: float = 1.0,
+    dedup_threshold: float = 0.8,
+    counter: SizeCounter = char_counter,
+) -> List[Dict]:
+    """
+    Like ``extractive_reduce``, but on transcript segments: repeated runs are
+    cut across segment boundaries, then each segment is one unit. Kept
+    segments keep their timing.
+    """
+    original_size = sum(counter(s["text"]) for s in segments if s["text"].strip())
+    segments = drop_repeated_runs_segments(segments)
+    remaining_size = sum(counter(s["text"]) for s in segments)
+    if not remaining_size:
+        return []
+    keep = _reduce_indices(
+        [s["text"] for s in segments], min(1.0, ratio * original_size / remaining_size), dedup_threshold, counter
+    )
+    return [segments[i] for i in keep]
@@ -0,0 +1,131 @@
+"""
+Compact binary encoding for transcripts stored in Redis.
+
+Layout (little-endian):
+
+    header   magic "YTTC" | version u8 | codec u8 | segment count u32
+    payload  compressed( starts f32[n] | durations f32[n] | texts utf-8 joined by "\\n" )
+
+Timing lives in two float32 columns instead of a JSON dict per segment, and
+the text is stored once; the segment list and the plain-text view are both
+decoded lazily from the same value.
+"""
+from array import array
+from typing import Dict, List, Optional
+import struct
+import sys
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"YTTC"
+VERSION = 1
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+_HEADER = struct.Struct("<4sBBI")
+
+
+def _compress(data: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("Transcript is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown transcript codec: {codec}")
+
+
+def _float_column(values) -> bytes:
+    column = array("f", values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_float_column(data: bytes, offset: int, count: int) -> List[float]:
+    column = array("f")
+    column.frombytes(data[offset:offset + 4 * count])
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column.tolist()
+
+
+def encode_transcript(segments: List[Dict], compression: str = "zstd") -> bytes:
+    """
+    Encode transcript segments (dicts with text/start/duration) into bytes.
+
+    Segments are sorted by start time. ``compression`` is "zstd" or "zlib";
+    zstd falls back to zlib when the zstandard package is not installed.
+    """
+    codec = CODEC_ZSTD if compression == "zstd" and zstandard is not None else CODEC_ZLIB
+    parts = sorted(segments, key=lambda s: s["start"])
+    texts = "\n".join(p["text"].replace("\n", " ") for p in parts).encode("utf-8")
+    payload = (
+        _float_column(p["start"] for p in parts)
+        + _float_column(p.get("duration", 0.0) for p in parts)
+        + texts
+    )
+    return _HEADER.pack(MAGIC, VERSION, codec, len(parts)) + _compress(payload, codec)
+
+
+def is_encoded_transcript(data: bytes) -> bool:
+    return data[:len(MAGIC)] == MAGIC
+
+
+class CompactTranscript:
+    """Lazily decoded view over an encoded transcript."""
+
+    def __init__(self, data: bytes):
+        magic, version, codec, count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not an encoded transcript")
+        if version != VERSION:
+            raise ValueError(f"Unsupported transcript format version: {version}")
+        self.data = data
+        self.codec = codec
+        self.count = count
+        self._payload: Optional[bytes] = None
+        self._segments: Optional[List[Dict]] = None
+        self._text: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _decoded(self) -> bytes:
+        if self._payload is None:
+            self._payload = _decompress(self.data[_HEADER.size:], self.codec)
+        return self._payload
+
+    def _texts(self) -> List[str]:
+        raw = self._decoded()[8 * self.count:].decode("utf-8")
+        return raw.split("\n") if self.count else []
+
+    @property
+    def segments(self) -> List[Dict]:
+        """Segment dicts (text/start/duration), sorted by start time."""
+        if self._segments is None:
+            payload = self._decoded()
+            starts = _read_float_column(payload, 0, self.count)
+            durations = _read_float_column(payload, 4 * self.count, self.count)
+            self._segments = [
+                {"text": text, "start": start, "duration": duration}
+                for text, start, duration in zip(self._texts(), starts, durations)
+            ]
+        return self._segments
+
+    @property
+    def text(self) -> str:
+        """Plain-text view, equivalent to ``transcript_to_text(self.segments)``."""
+        if self._text is None:
+            self._text = " ".join(t.strip() for t in self._texts() if t.strip())
+        return self._text
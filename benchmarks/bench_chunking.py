@@ -0,0 +1,72 @@
+"""
+Micro-benchmark for app.utils.chunking.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_chunking
+"""
+import random
+import time
+
+from app.utils.chunking import chunk_text, get_token_counter
+
+WORD_COUNTS = [10_000, 50_000, 100_000, 250_000, 500_000]
+MAX_CHARS = 12000
+MAX_TOKENS = 3000
+
+_VOCAB = [
+    "the", "a", "video", "about", "transcript", "summary", "and", "we", "are",
+    "going", "to", "talk", "podcast", "really", "interesting", "so", "like",
+    "you", "know", "basically", "model", "language", "episode", "guest",
+]
+
+
+def make_text(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = []
+    for i in range(words):
+        word = rng.choice(_VOCAB)
+        out.append(word + "." if i % 17 == 16 else word)
+    return " ".join(out)
+
+
+def legacy_chunk_text(text, max_chunk_size=500):
+    """The original quadratic implementation, kept for comparison."""
+    words = text.split()
+    chunks = []
+    current_chunk = []
+    for word in words:
+        current_chunk.append(word)
+        if len(' '.join(current_chunk)) >= max_chunk_size:
+            chunks.append(' '.join(current_chunk))
+            current_chunk = []
+    if current_chunk:
+        chunks.append(' '.join(current_chunk))
+    return chunks
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, len(result)
+
+
+def main() -> None:
+    token_counter = get_token_counter("gpt-4.1-mini")
+    cases = [
+        ("legacy", lambda t: legacy_chunk_text(t, MAX_CHARS)),
+        ("words", lambda t: chunk_text(t, MAX_CHARS)),
+        ("sentences", lambda t: chunk_text(t, MAX_CHARS, boundary="sentence")),
+        ("sentences+overlap", lambda t: chunk_text(t, MAX_CHARS, boundary="sentence", overlap=500)),
+        ("tokens", lambda t: chunk_text(t, MAX_TOKENS, boundary="sentence", counter=token_counter)),
+    ]
+    print(f"{'words':>8}  {'mode':<18} {'seconds':>9} {'chunks':>7}")
+    for words in WORD_COUNTS:
+        text = make_text(words)
+        for name, fn in cases:
+            seconds, chunks = timed(fn, text)
+            print(f"{words:>8}  {name:<18} {seconds:>9.4f} {chunks:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark for the extractive pre-filter (app.utils.extractive).
+
+Shows how much of each fixture transcript reaches the LLM, how many map
+chunks that makes, and how long the local pass takes, for both the text
+and the segment variant. Run from the
+repository root:
+
+    python -m benchmarks.bench_prefilter
+"""
+import time
+
+from app.utils.chunking import chunk_text, get_token_counter
+from app.utils.extractive import extractive_reduce, extractive_reduce_segments
+from benchmarks.fixtures import make_segments
+
+MINUTES = [10, 30, 60, 180]
+RATIOS = [1.0, 0.8, 0.6, 0.4]
+MAX_CHARS = 12000
+
+
+def reduce_segments(segments, ratio):
+    return " ".join(s["text"] for s in extractive_reduce_segments(segments, ratio=ratio))
+
+
+def main() -> None:
+    count_tokens = get_token_counter("gpt-4.1-mini")
+    print(
+        f"{'topic':<8} {'min':>4} {'input':<8} {'ratio':>5} {'chars':>8} {'tokens':>7}"
+        f" {'kept':>6} {'chunks':>6} {'seconds':>8}"
+    )
+    for topic in ("ml", "cooking"):
+        for minutes in MINUTES:
+            segments = make_segments(minutes, topic)
+            text = " ".join(s["text"] for s in segments)
+            base_chunks = len(chunk_text(text, MAX_CHARS, boundary="sentence"))
+            print(
+                f"{topic:<8} {minutes:>4} {'-':<8} {'off':>5} {len(text):>8} {count_tokens(text):>7}"
+                f" {'100%':>6} {base_chunks:>6} {0:>8.4f}"
+            )
+            for mode, ratio in [(m, r) for m in ("text", "segments") for r in RATIOS]:
+                start = time.perf_counter()
+                if mode == "text":
+                    reduced = extractive_reduce(text, ratio=ratio)
+                else:
+                    reduced = reduce_segments(segments, ratio)
+                seconds = time.perf_counter() - start
+                chunks = len(chunk_text(reduced, MAX_CHARS, boundary="sentence"))
+                print(
+                    f"{topic:<8} {minutes:>4} {mode:<8} {ratio:>5} {len(reduced):>8} {count_tokens(reduced):>7}"
+                    f" {len(reduced) / len(text):>6.0%} {chunks:>6} {seconds:>8.4f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
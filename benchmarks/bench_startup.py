@@ -0,0 +1,124 @@
+"""
+Worker boot benchmark: how long until a fresh worker serves its first
+requests quickly.
+
+Each run is a fresh interpreter that imports ``app.main``, runs the app's
+lifespan startup, then sends a first ``GET /health`` and a first
+``POST /summarize`` (over an in-process ASGI transport). External services
+are local stand-ins: the fake OpenAI server (started once, in this
+process), fakeredis and a fake transcript client. fakeredis is required
+(``pip install fakeredis``).
+
+Runs alternate between ``STARTUP_WARMUP=true`` and ``false``; medians are
+reported for each. Run from the repository root:
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ["openai", "redis", "youtube_transcript_api", "requests", "tiktoken"]
+
+
+async def _child_main(fetch_latency: float) -> dict:
+    started = time.perf_counter()
+    from app.main import app
+    import_seconds = time.perf_counter() - started
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    import fakeredis
+    import httpx
+    from app.services import cache, youtube_service
+    from app.services.proxy_pool import ProxyEndpoint, ProxyPool
+    from benchmarks.load_test import FakeYouTubeClient
+
+    server = fakeredis.FakeServer()
+    cache._redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    cache._binary_redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=False)
+    youtube_service.proxy_pool = ProxyPool(
+        [ProxyEndpoint("fake", FakeYouTubeClient(fetch_latency))], runner=youtube_service.fetch_executor.run
+    )
+
+    result = {"import_seconds": import_seconds, "heavy_modules_after_import": loaded}
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        result["startup_seconds"] = time.perf_counter() - started
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            started = time.perf_counter()
+            await client.get("/health")
+            result["first_health_seconds"] = time.perf_counter() - started
+            started = time.perf_counter()
+            response = await client.post("/summarize", json={"url_or_id": "bench000001"})
+            result["first_summarize_seconds"] = time.perf_counter() - started
+            result["first_summarize_status"] = response.status_code
+    return result
+
+
+def _run_child(base_url: str, warmup: bool, fetch_latency: float) -> dict:
+    env = dict(
+        os.environ,
+        OPENAI_API_KEY="sk-fake",
+        OPENAI_BASE_URL=base_url,
+        STARTUP_WARMUP="true" if warmup else "false",
+        JOB_BACKEND="memory",
+        CACHE_NAMESPACE=f"bench-startup-{time.time_ns()}",
+    )
+    command = [sys.executable, "-m", "benchmarks.bench_startup", "--child", "--fetch-latency", str(fetch_latency)]
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+async def run(args) -> dict:
+    from benchmarks.fake_openai import FakeOpenAIServer
+
+    llm = FakeOpenAIServer(latency=args.llm_latency, jitter=0.0)
+    await llm.start()
+    runs = {True: [], False: []}
+    try:
+        for i in range(args.runs * 2):
+            warmup = i % 2 == 0
+            runs[warmup].append(await asyncio.to_thread(_run_child, llm.base_url, warmup, args.fetch_latency))
+    finally:
+        await llm.stop()
+
+    results = {"runs": args.runs}
+    for warmup, samples in runs.items():
+        prefix = "warmup" if warmup else "no_warmup"
+        for field in ("import_seconds", "startup_seconds", "first_health_seconds", "first_summarize_seconds"):
+            results[f"{prefix}_{field}"] = round(statistics.median(s[field] for s in samples), 4)
+        results[f"{prefix}_statuses"] = sorted({s["first_summarize_status"] for s in samples})
+    results["heavy_modules_after_import"] = runs[True][0]["heavy_modules_after_import"]
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per mode")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="fake LLM latency, seconds")
+    parser.add_argument("--fetch-latency", type=float, default=0.05, help="fake transcript fetch latency, seconds")
+    parser.add_argument("--json", help="also write results to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_child_main(args.fetch_latency))))
+        return
+
+    results = asyncio.run(run(args))
+    width = max(len(key) for key in results)
+    for key, value in results.items():
+        print(f"{key:<{width}}  {value}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+A local OpenAI-compatible chat completions server for benchmarks.
+
+Answers ``POST /v1/chat/completions`` (plain and ``stream=True``) after a
+configurable, jittered latency, and rejects a configurable fraction of
+calls with 429 so retry/backoff behaviour shows up in the numbers.
+``GET /v1/models`` (used by the startup warmup) answers immediately. Point
+the app at it with ``OPENAI_BASE_URL=http://127.0.0.1:{port}/v1``.
+"""
+import asyncio
+import json
+import random
+import time
+from typing import Optional
+
+from aiohttp import web
+
+
+class FakeOpenAIServer:
+    def __init__(
+        self,
+        latency: float = 0.5,
+        jitter: float = 0.2,
+        rate_limit_ratio: float = 0.0,
+        retry_after: float = 0.1,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.calls = 0
+        self.completed = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.port: Optional[int] = None
+        self._rng = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._chat_completions)
+        app.router.add_get("/v1/models", self._models)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _models(self, request: web.Request) -> web.Response:
+        return web.json_response({"object": "list", "data": []})
+
+    def _summarize(self, body: dict) -> str:
+        # Deterministic "summary": the first words of the last message
+        words = body["messages"][-1]["content"].split()
+        return "Summary: " + " ".join(words[:40])
+
+    async def _chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.calls += 1
+        if self._rng.random() < self.rate_limit_ratio:
+            self.rate_limited += 1
+            return web.json_response(
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                status=429,
+                headers={"retry-after": str(self.retry_after)},
+            )
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(max(0.0, self._rng.gauss(self.latency, self.jitter * self.latency)))
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+
+        content = self._summarize(body)
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_tokens + len(content) // 4,
+        }
+        created = int(time.time())
+        if not body.get("stream"):
+            return web.json_response({
+                "id": f"chatcmpl-{self.calls}",
+                "object": "chat.completion",
+                "created": created,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+
+        async def send(choices, usage=None):
+            chunk = {
+                "id": f"chatcmpl-{self.calls}",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": body["model"],
+                "choices": choices,
+            }
+            if usage is not None:
+                chunk["usage"] = usage
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        for word in content.split(" "):
+            await send([{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}])
+        await send([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if body.get("stream_options", {}).get("include_usage"):
+            await send([], usage)
+        await response.write(b"data: [DONE]\n\n")
+        return response
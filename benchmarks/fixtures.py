@@ -0,0 +1,72 @@
+"""
+Synthetic transcripts for benchmarks.
+
+Shaped like YouTube auto-captions: short unpunctuated segments, spoken
+filler, phrases repeated across neighbouring segments, and a sponsor read
+that comes back every few minutes. The phrase pool is small, so long
+fixtures repeat themselves more than a real talk would.
+"""
+import random
+from typing import Dict, List
+
+# Sentences are assembled from (opener, subject, claim) parts, so most are unique.
+_TOPICS = {
+    "ml": (
+        ["so", "now", "the thing is", "remember that", "in practice", "in this paper"],
+        ["the transformer", "gradient descent", "the optimizer", "dropout", "the tokenizer",
+         "the learning rate schedule", "the embedding layer", "the validation set", "batch norm"],
+        ["decides which tokens matter for each prediction", "moves every weight against the loss gradient",
+         "keeps the network from memorizing the training data", "warms up and then decays over the run",
+         "maps words into a space where similar meanings sit together", "trades gradient noise against memory",
+         "is the only number that really counts at the end", "makes training much more stable"],
+    ),
+    "cooking": (
+        ["so", "now", "the trick is", "remember that", "at home", "in a restaurant"],
+        ["the onions", "the pasta water", "the dough", "the pan sauce", "a sharp knife",
+         "cold butter", "the seasoning", "the roasting tray", "the stock"],
+        ["needs far more salt than you would expect", "should rest for an hour before shaping",
+         "browns better when nothing is crowded", "picks up all the brown bits from the pan",
+         "makes the sauce glossy right at the end", "is safer because it does not slip",
+         "should be tasted and adjusted before serving", "caramelizes slowly over low heat"],
+    ),
+}
+
+_FILLER = [
+    "um", "uh", "so yeah", "you know", "like", "i mean", "basically", "right",
+    "okay so", "kind of", "sort of", "actually",
+]
+
+_SPONSOR = (
+    "this video is sponsored by acme vpn use code talk for twenty percent off "
+    "your first month link in the description"
+)
+
+def make_segments(minutes: int, topic: str = "ml", seed: int = 0) -> List[Dict]:
+    """About ``minutes`` of caption segments (roughly 150 spoken words per minute)."""
+    rng = random.Random(seed)
+    openers, subjects, claims = _TOPICS[topic]
+    segments: List[Dict] = []
+    start = 0.0
+    words_said = 0
+    last = ""
+    while words_said < minutes * 150:
+        roll = rng.random()
+        if roll < 0.04:
+            text = _SPONSOR
+        elif roll < 0.12 and last:
+            text = last                      # speaker repeats themselves / rolling caption
+        else:
+            words = f"{rng.choice(openers)} {rng.choice(subjects)} {rng.choice(claims)}".split()
+            for _ in range(rng.randint(1, 3)):
+                words.insert(rng.randrange(len(words) + 1), rng.choice(_FILLER))
+            text = " ".join(words)
+        duration = len(text.split()) / 2.5
+        segments.append({"text": text, "start": round(start, 2), "duration": round(duration, 2)})
+        start += duration
+        words_said += len(text.split())
+        last = text
+    return segments
+
+def make_transcript(minutes: int, topic: str = "ml", seed: int = 0) -> str:
+    """The segments of ``make_segments`` joined the way ``transcript_to_text`` does."""
+    return " ".join(s["text"] for s in make_segments(minutes, topic, seed))
@@ -0,0 +1,214 @@
+"""
+Offline load test for ``POST /summarize``.
+
+Drives ``app.main:app`` in process (over an ASGI transport) at a fixed
+concurrency, with every external dependency replaced by a local stand-in:
+
+- OpenAI: ``benchmarks.fake_openai.FakeOpenAIServer`` (latency, 429s)
+- YouTube: a fake transcript client in the proxy pool, serving synthetic
+  transcripts of various lengths from ``benchmarks.fixtures``
+- Redis: fakeredis when installed (``pip install fakeredis``), otherwise
+  the Redis at ``--redis-url``; each run uses a fresh cache namespace
+
+Videos are requested with a Zipf-like popularity, so repeat requests
+exercise the caches. Reports p50/p95/p99 latency, requests/s, LLM calls
+per request and cache hit ratios. Run from the repository root:
+
+    python -m benchmarks.load_test --requests 500 --concurrency 32
+    python -m benchmarks.load_test --llm-429-ratio 0.1 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.fixtures import make_segments
+
+# Transcript lengths in minutes, cycled across videos
+VIDEO_MINUTES = [5, 10, 20, 45, 90]
+
+
+class FakeYouTubeClient:
+    """Stands in for TranscriptClient: synthetic transcripts after a fixed latency per round trip."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _call(self) -> None:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+
+    def list_tracks(self, video_id: str) -> Dict:
+        self._call()
+        track = {"language_code": "en", "language": "English", "is_generated": True, "translatable": False, "url": ""}
+        return {"tracks": [track], "translation_languages": []}
+
+    def fetch_track(self, video_id: str, track: Dict, translate_to=None) -> List[Dict]:
+        self._call()
+        index = int(video_id[-6:])
+        minutes = VIDEO_MINUTES[index % len(VIDEO_MINUTES)]
+        topic = "ml" if index % 2 else "cooking"
+        return make_segments(minutes, topic, seed=index)
+
+
+def video_id(index: int) -> str:
+    return f"bench{index:06d}"   # 11 characters, like a real video ID
+
+
+def make_workload(requests: int, videos: int, zipf: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** zipf for rank in range(videos)]
+    return [video_id(i) for i in rng.choices(range(videos), weights=weights, k=requests)]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _cache_hit_ratio(before: Dict, after: Dict, kind: str) -> float:
+    def delta(tier, result):
+        key = (tier, kind, result)
+        return after.get(key, 0.0) - before.get(key, 0.0)
+
+    hits = delta("l1", "hit") + delta("redis", "hit")
+    lookups = delta("l1", "hit") + delta("l1", "miss")
+    if not lookups:
+        lookups = delta("redis", "hit") + delta("redis", "miss") + delta("redis", "error")
+    return hits / lookups if lookups else 0.0
+
+
+def _cache_samples() -> Dict:
+    from app.services.metrics import CACHE_REQUESTS
+
+    samples = {}
+    for metric in CACHE_REQUESTS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total"):
+                labels = sample.labels
+                samples[(labels["tier"], labels["kind"], labels["result"])] = sample.value
+    return samples
+
+
+def _use_fake_redis(redis_url: str) -> str:
+    try:
+        import fakeredis
+    except ImportError:
+        return redis_url
+    from app.services import cache
+
+    server = fakeredis.FakeServer()
+    cache._redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    cache._binary_redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=False)
+    return "fakeredis"
+
+
+async def run(args) -> Dict:
+    llm = FakeOpenAIServer(
+        latency=args.llm_latency, rate_limit_ratio=args.llm_429_ratio, seed=args.seed
+    )
+    await llm.start()
+
+    # Settings are read at import time, so configure before importing the app
+    os.environ["OPENAI_API_KEY"] = "sk-fake"
+    os.environ["OPENAI_BASE_URL"] = llm.base_url
+    os.environ["REDIS_URL"] = args.redis_url
+    os.environ["CACHE_NAMESPACE"] = f"bench-{uuid.uuid4().hex[:8]}"
+    os.environ.setdefault("JOB_BACKEND", "memory")
+
+    import httpx
+    from app.main import app
+    from app.services import youtube_service
+    from app.services.proxy_pool import ProxyEndpoint, ProxyPool
+
+    redis_backend = _use_fake_redis(args.redis_url)
+    youtube = FakeYouTubeClient(args.fetch_latency)
+    youtube_service.proxy_pool = ProxyPool(
+        [ProxyEndpoint("fake", youtube)], runner=youtube_service.fetch_executor.run, hedging=False
+    )
+
+    workload = make_workload(args.requests, args.videos, args.zipf, args.seed)
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for vid in workload:
+        queue.put_nowait(vid)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    before = _cache_samples()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            while not queue.empty():
+                vid = queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.post("/summarize", json={"url_or_id": vid})
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    after = _cache_samples()
+    await llm.stop()
+    youtube_service.fetch_executor.shutdown()
+
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "videos": args.videos,
+        "redis": redis_backend,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(args.requests / elapsed, 2),
+        "latency_p50": round(percentile(latencies, 0.50), 4),
+        "latency_p95": round(percentile(latencies, 0.95), 4),
+        "latency_p99": round(percentile(latencies, 0.99), 4),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "llm_calls": llm.calls,
+        "llm_calls_per_request": round(llm.calls / args.requests, 3),
+        "llm_rate_limited": llm.rate_limited,
+        "llm_max_in_flight": llm.max_in_flight,
+        "transcript_fetches": youtube.calls,
+        "summary_cache_hit_ratio": round(_cache_hit_ratio(before, after, "summary"), 3),
+        "transcript_cache_hit_ratio": round(_cache_hit_ratio(before, after, "transcript"), 3),
+        "chunk_cache_hit_ratio": round(_cache_hit_ratio(before, after, "chunk"), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--videos", type=int, default=50, help="distinct videos in the workload")
+    parser.add_argument("--zipf", type=float, default=1.1, help="popularity skew (0 = uniform)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="mean fake LLM latency, seconds")
+    parser.add_argument("--llm-429-ratio", type=float, default=0.0, help="fraction of LLM calls answered with 429")
+    parser.add_argument("--fetch-latency", type=float, default=0.1, help="fake transcript fetch latency, seconds")
+    parser.add_argument("--redis-url", default="redis://localhost:6379", help="used when fakeredis is not installed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    width = max(len(key) for key in results)
+    for key, value in results.items():
+        print(f"{key:<{width}}  {value}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
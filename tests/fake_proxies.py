@@ -0,0 +1,66 @@
+"""
+Local stand-ins for proxy-backed YouTubeTranscriptApi clients, so the proxy
+pool can be exercised without the network.
+"""
+import asyncio
+import threading
+import time
+
+class RequestBlocked(Exception):
+    """Mimics youtube_transcript_api's error for a blocked exit IP."""
+
+class NoTranscriptFound(Exception):
+    """Mimics youtube_transcript_api's error for a video without captions."""
+
+class FakeTranscriptClient:
+    """
+    Behaves like a TranscriptClient behind a proxy with a given latency.
+    ``blocked=True`` makes every call fail like a banned exit IP. Videos have
+    the caption ``tracks`` given (an English manual track by default), except
+    "no-captions", which has none.
+    """
+
+    def __init__(self, name, latency=0.0, blocked=False, tracks=None):
+        self.name = name
+        self.latency = latency
+        self.blocked = blocked
+        self.tracks = tracks or [_track("en")]
+        self.calls = 0
+        self.list_calls = 0
+        self._lock = threading.Lock()
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if self.blocked:
+            raise RequestBlocked(self.name)
+
+    def list_tracks(self, video_id):
+        self._call()
+        with self._lock:
+            self.list_calls += 1
+        if video_id == "no-captions":
+            raise NoTranscriptFound(video_id)
+        return {
+            "tracks": self.tracks,
+            "translation_languages": [{"language_code": code, "language": code} for code in ("de", "en", "fr")],
+        }
+
+    def fetch_track(self, video_id, track, translate_to=None):
+        self._call()
+        language = translate_to or track["language_code"]
+        return [{"text": f"{video_id} via {self.name} in {language}", "start": 0.0, "duration": 1.0}]
+
+def _track(language_code, is_generated=False, translatable=True):
+    return {
+        "language_code": language_code,
+        "language": language_code,
+        "is_generated": is_generated,
+        "translatable": translatable,
+        "url": f"https://www.youtube.com/api/timedtext?lang={language_code}",
+    }
+
+async def run_inline(fn, *args):
+    """Runner that executes the blocking fetch in a thread, like the fetch executor."""
+    return await asyncio.to_thread(fn, *args)
@@ -0,0 +1,22 @@
+from app.services import cache_keys
+from app.services.youtube_service import extract_video_id
+
+def test_url_variants_share_one_summary_key():
+    variants = [
+        "dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=30",
+    ]
+    keys = {cache_keys.summary_key(extract_video_id(v)) for v in variants}
+    assert len(keys) == 1
+
+def test_keys_are_namespaced_and_versioned():
+    prefix = cache_keys.key_prefix()
+    assert cache_keys.summary_key("abc", "de").startswith(f"{prefix}:summary:abc:de:")
+    assert cache_keys.transcript_key("abc") == f"{prefix}:transcript:abc:en"
+    assert cache_keys.singleflight_lock_key("summarize", "abc:en") == f"{prefix}:lock:summarize:abc:en"
+
+def test_legacy_summary_keys_only_for_default_language():
+    url = "https://youtu.be/abc"
+    assert cache_keys.legacy_summary_keys("abc", "en", url) == ["summary:abc", f"summary:{url}"]
+    assert cache_keys.legacy_summary_keys("abc", "de", url) == []
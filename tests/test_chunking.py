@@ -0,0 +1,49 @@
+from app.utils.chunking import TimedChunk, chunk_segments, chunk_text, chunk_timed_segments, chunk_units
+
+TEXT = " ".join(f"word{i}" for i in range(1000))
+
+def test_chunk_text_respects_budget_and_keeps_words():
+    chunks = chunk_text(TEXT, max_chunk_size=100)
+    assert all(len(c) <= 100 for c in chunks)
+    assert " ".join(chunks).split() == TEXT.split()
+
+def test_chunk_text_sentence_boundary():
+    text = "One two three. Four five six. Seven eight nine."
+    assert chunk_text(text, max_chunk_size=30, boundary="sentence") == [
+        "One two three. Four five six.",
+        "Seven eight nine.",
+    ]
+
+def test_chunk_text_overlap_repeats_tail():
+    chunks = chunk_text("a b c d e f g h", max_chunk_size=7, overlap=3)
+    assert chunks == ["a b c d", "c d e f", "e f g h"]
+
+def test_chunk_text_token_counter():
+    chunks = chunk_text(TEXT, max_chunk_size=10, counter=lambda s: len(s.split()))
+    assert len(chunks) == 100
+    assert all(len(c.split()) == 10 for c in chunks)
+
+def test_chunk_segments_cuts_between_segments():
+    segments = [{"text": "hello there"}, {"text": " "}, {"text": "general"}, {"text": "kenobi"}]
+    assert chunk_segments(segments, max_chunk_size=15) == ["hello there", "general kenobi"]
+
+def test_timed_chunks_carry_time_ranges_and_match_chunk_units():
+    segments = [
+        {"text": f"segment number {i}", "start": i * 2.0, "duration": 2.5}
+        for i in range(20)
+    ]
+    chunks = chunk_timed_segments(segments, max_chunk_size=60, overlap=20)
+    assert [c.text for c in chunks] == chunk_units([s["text"] for s in segments], 60, overlap=20)
+    assert chunks[0] == TimedChunk("segment number 0 segment number 1 segment number 2", 0.0, 6.5)
+    assert chunks[-1].end == 19 * 2.0 + 2.5
+    assert all(a.start <= b.start for a, b in zip(chunks, chunks[1:]))
+
+def test_oversized_segment_is_split_with_proportional_times():
+    text = " ".join(f"Sentence number {i} is here." for i in range(40))
+    chunks = chunk_timed_segments([{"text": text, "start": 100.0, "duration": 400.0}], max_chunk_size=200)
+    assert len(chunks) > 1
+    assert all(len(c.text) <= 200 for c in chunks)
+    assert " ".join(c.text for c in chunks) == text
+    assert chunks[0].start == 100.0
+    assert abs(chunks[-1].end - 500.0) < 1e-6
+    assert all(abs(a.end - b.start) < 1e-6 for a, b in zip(chunks, chunks[1:]))
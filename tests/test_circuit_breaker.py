@@ -0,0 +1,41 @@
+import pytest
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+def test_opens_after_threshold_and_recovers_after_trial():
+    breaker = CircuitBreaker("redis", failure_threshold=2, reset_timeout_seconds=60)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # After the reset timeout a single trial call is allowed through
+    breaker.reset_timeout_seconds = 0
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+def test_trial_is_released_when_the_call_is_cancelled_or_redis_answers_with_an_error(monkeypatch):
+    import asyncio
+    from redis.exceptions import ResponseError
+    from app.services import cache
+
+    breaker = CircuitBreaker("redis", failure_threshold=1, reset_timeout_seconds=0)
+    breaker.record_failure()
+    monkeypatch.setattr(cache, "redis_breaker", breaker)
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    async def response_error():
+        raise ResponseError("WRONGTYPE")
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cache._guarded(cancelled))
+    assert not breaker._trial_in_progress
+    with pytest.raises(ResponseError):
+        asyncio.run(cache._guarded(response_error))
+    assert breaker.state == "closed"
@@ -0,0 +1,80 @@
+import asyncio
+import random
+import pytest
+from app.services import duplicates
+from app.services.cache import SummaryEntry
+from app.services.duplicates import fingerprint_segments, similarity
+
+WORDS = [f"word{i}" for i in range(2000)]
+
+def make_segments(seed, count=100, seconds=3.0):
+    rng = random.Random(seed)
+    return [
+        {"text": " ".join(rng.choice(WORDS) for _ in range(8)), "start": i * seconds, "duration": seconds}
+        for i in range(count)
+    ]
+
+class FakeCache:
+    def __init__(self):
+        self.fingerprints = {}
+        self.bands = {}
+        self.summaries = {}
+
+    async def index_fingerprint(self, video_id, language, fingerprint, bands):
+        self.fingerprints[video_id] = fingerprint
+        for band in bands:
+            self.bands.setdefault(band, set()).add(video_id)
+
+    async def fingerprint_candidates(self, language, bands):
+        return set().union(*(self.bands.get(band, set()) for band in bands))
+
+    async def get_fingerprints(self, video_ids, language):
+        return {video_id: self.fingerprints.get(video_id) for video_id in video_ids}
+
+    async def get_summary_entry(self, video_id, language="en", url_or_id=None):
+        return self.summaries.get(video_id)
+
+    async def set_summary(self, video_id, summary, language="en", chapters=None):
+        self.summaries[video_id] = SummaryEntry(summary, None, chapters)
+
+@pytest.fixture
+def cache(monkeypatch):
+    fake = FakeCache()
+    monkeypatch.setattr(duplicates, "cache_service", fake)
+    monkeypatch.setattr(duplicates.settings, "duplicate_similarity_threshold", 0.9)
+    monkeypatch.setattr(duplicates.settings, "duplicate_min_words", 300)
+    return fake
+
+def test_mirrors_reuse_the_summary_with_rescaled_chapters(cache):
+    original = make_segments(seed=1)
+    chapters = [{"start": 0.0, "end": 150.0, "summary": "first"}, {"start": 150.0, "end": 300.0, "summary": "second"}]
+
+    async def run():
+        reused, fingerprint = await duplicates.reuse_summary("original", "en", original)
+        assert reused is None
+        await cache.set_summary("original", "the summary", chapters=chapters)
+        await duplicates.remember("original", "en", fingerprint)
+
+        # A sped-up mirror with slightly different captions
+        mirror = [dict(s, start=s["start"] * 0.8, duration=s["duration"] * 0.8) for s in original]
+        mirror[10] = dict(mirror[10], text="completely different words here")
+        reused_mirror, _ = await duplicates.reuse_summary("mirror", "en", mirror)
+        unrelated, _ = await duplicates.reuse_summary("other", "en", make_segments(seed=2))
+        return reused_mirror, unrelated
+
+    reused_mirror, unrelated = asyncio.run(run())
+    assert reused_mirror == ("the summary", [
+        {"start": 0.0, "end": 120.0, "summary": "first"},
+        {"start": 120.0, "end": 240.0, "summary": "second"},
+    ])
+    assert cache.summaries["mirror"].summary == "the summary"
+    assert unrelated is None
+    assert "other" not in cache.summaries
+
+def test_short_transcripts_are_not_fingerprinted_and_length_bounds_similarity(cache):
+    assert fingerprint_segments(make_segments(seed=1, count=10)) is None
+    full = fingerprint_segments(make_segments(seed=1))
+    half = fingerprint_segments(make_segments(seed=1)[:50])
+    assert similarity(full, full) == 1.0
+    # A clip shares all its shingles with the full video but is not a duplicate of it
+    assert similarity(full, half) <= 0.51
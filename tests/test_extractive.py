@@ -0,0 +1,58 @@
+from app.utils.extractive import drop_near_duplicates, extractive_reduce, extractive_reduce_segments, split_units
+
+SPONSOR = "This episode is sponsored by Acme VPN, use code TALK for twenty percent off your first month."
+
+def test_long_unpunctuated_captions_are_cut_into_windows():
+    units = split_units(" ".join(["word"] * 100), max_words=40)
+    assert [len(u.split()) for u in units] == [40, 40, 20]
+
+def test_near_duplicates_keep_first_occurrence():
+    units = [
+        SPONSOR,
+        "Gradient descent moves the weights against the gradient of the loss.",
+        SPONSOR.replace("twenty", "20"),
+        "Backpropagation computes those gradients layer by layer.",
+    ]
+    assert drop_near_duplicates(units, threshold=0.6) == [units[0], units[1], units[3]]
+
+def test_reduce_hits_ratio_and_keeps_order():
+    topical = [
+        "The transformer model uses attention to weigh tokens in the sequence.",
+        "Each attention head learns a different relation between tokens.",
+        "Positional encodings tell the model where each token sits in the sequence.",
+        "Training the model on more tokens improves attention patterns.",
+        "Layer normalization keeps the transformer stable during training.",
+    ]
+    filler = [
+        "Um so yeah.",
+        "You know what I mean, right?",
+        "Okay okay.",
+        "I mean it's kind of like that.",
+        "Yeah, well, actually.",
+    ]
+    text = " ".join(t for pair in zip(topical, filler) for t in pair)
+
+    reduced = extractive_reduce(text, ratio=0.6)
+    assert len(reduced) <= 0.6 * len(text) + max(len(t) for t in topical)
+    kept = split_units(reduced)
+    assert all(unit in topical for unit in kept)
+    assert kept == sorted(kept, key=topical.index)
+
+def test_ratio_one_only_dedups():
+    text = f"{SPONSOR} Something else entirely happens here. {SPONSOR}"
+    assert extractive_reduce(text, ratio=1.0) == f"{SPONSOR} Something else entirely happens here."
+
+def test_segments_lose_repeated_runs_across_boundaries():
+    words = SPONSOR.split()
+    segments = [
+        {"text": " ".join(words[:6]), "start": 0.0, "duration": 2.0},
+        {"text": " ".join(words[6:]), "start": 2.0, "duration": 3.0},
+        {"text": "Now the actual topic: how attention works.", "start": 5.0, "duration": 4.0},
+        # The same ad, looped later with different caption boundaries
+        {"text": " ".join(words[:10]), "start": 9.0, "duration": 3.0},
+        {"text": " ".join(words[10:]), "start": 12.0, "duration": 2.0},
+        {"text": "Attention weighs every token against the others.", "start": 14.0, "duration": 4.0},
+    ]
+    kept = extractive_reduce_segments(segments, ratio=1.0)
+    assert [s["start"] for s in kept] == [0.0, 2.0, 5.0, 14.0]
+    assert " ".join(s["text"] for s in kept).count("Acme") == 1
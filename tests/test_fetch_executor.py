@@ -0,0 +1,35 @@
+import asyncio
+import threading
+import pytest
+from app.services.fetch_executor import FetchExecutor, FetchPoolSaturated, FetchTimeout
+
+def test_rejects_when_queue_is_full():
+    executor = FetchExecutor(max_workers=1, max_queue=1, timeout_seconds=5)
+    release = threading.Event()
+
+    async def run():
+        first = asyncio.ensure_future(executor.run(release.wait))
+        second = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(FetchPoolSaturated):
+            await executor.run(release.wait)
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(run())
+    assert executor.pending == 0
+    executor.shutdown()
+
+def test_times_out_slow_fetches():
+    executor = FetchExecutor(max_workers=1, max_queue=0, timeout_seconds=0.01)
+    release = threading.Event()
+
+    async def run():
+        with pytest.raises(FetchTimeout):
+            await executor.run(release.wait)
+
+    asyncio.run(run())
+    # The timed-out fetch still holds its thread until it returns
+    assert executor.pending == 1
+    release.set()
+    executor.shutdown()
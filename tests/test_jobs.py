@@ -0,0 +1,200 @@
+import asyncio
+from fastapi import HTTPException
+from app.services.jobs import InMemoryJobBackend, JobQueue
+
+def test_batch_items_are_processed_and_reported():
+    async def processor(video_id, language):
+        if video_id == "missing":
+            raise HTTPException(status_code=404, detail="Transcript not found")
+        return f"summary of {video_id}"
+
+    async def run():
+        queue = JobQueue(InMemoryJobBackend(), processor, workers=2)
+        job_id = await queue.submit(["a", "b", "missing"], invalid=["not a url"])
+        for _ in range(100):
+            job = await queue.get(job_id)
+            if job["status"] == "done":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    items = {item["video_id"]: item for item in job["items"]}
+    assert job["counts"] == {"done": 2, "failed": 2}
+    assert items["a"]["summary"] == "summary of a"
+    assert items["missing"]["error"] == "Transcript not found"
+    assert items["not a url"]["status"] == "failed"
+
+def test_videos_shared_across_jobs_are_processed_once():
+    calls = []
+    release = asyncio.Event()
+
+    async def processor(video_id, language):
+        calls.append(video_id)
+        await release.wait()
+        return "shared"
+
+    async def run():
+        queue = JobQueue(InMemoryJobBackend(), processor, workers=2)
+        first = await queue.submit(["x"])
+        second = await queue.submit(["x"])
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.sleep(0.01)
+        jobs = [await queue.get(first), await queue.get(second)]
+        await queue.stop()
+        return jobs
+
+    jobs = asyncio.run(run())
+    assert calls == ["x"]
+    assert all(job["items"][0]["summary"] == "shared" for job in jobs)
+
+def test_known_summaries_finish_without_queueing():
+    calls = []
+
+    async def processor(video_id, language):
+        calls.append(video_id)
+        return "fresh"
+
+    async def run():
+        queue = JobQueue(InMemoryJobBackend(), processor, workers=1)
+        job_id = await queue.submit(["cached", "new"], done={"cached": "from cache"})
+        for _ in range(100):
+            job = await queue.get(job_id)
+            if job["status"] == "done":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    items = {item["video_id"]: item for item in job["items"]}
+    assert calls == ["new"]
+    assert items["cached"]["summary"] == "from cache"
+
+def test_batch_endpoint_dedupes_inputs_and_uses_the_requested_language(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.routers import jobs
+
+    submitted = {}
+
+    async def get_summaries(video_ids, language):
+        submitted["cache_language"] = language
+        return {}
+
+    async def submit(video_ids, language="en", invalid=None, done=None):
+        submitted.update(video_ids=video_ids, language=language, invalid=invalid)
+        return "job"
+
+    monkeypatch.setattr(jobs.cache_service, "get_summaries", get_summaries)
+    monkeypatch.setattr(jobs.job_queue, "submit", submit)
+    response = TestClient(app).post("/summarize/batch", json={
+        "url_or_ids": ["dQw4w9WgXcQ", "https://youtu.be/dQw4w9WgXcQ", "bad url", "bad url"],
+        "language": "de",
+    })
+
+    assert response.json() == {"job_id": "job", "items": 2}
+    assert submitted == {
+        "cache_language": "de", "video_ids": ["dQw4w9WgXcQ"], "language": "de", "invalid": ["bad url"],
+    }
+
+def test_items_interrupted_by_shutdown_are_requeued():
+    started = asyncio.Event()
+
+    async def hanging(video_id, language):
+        started.set()
+        await asyncio.sleep(60)
+
+    async def quick(video_id, language):
+        return "after restart"
+
+    async def run():
+        backend = InMemoryJobBackend()
+        queue = JobQueue(backend, hanging, workers=1)
+        job_id = await queue.submit(["x"])
+        await started.wait()
+        await queue.stop()
+        interrupted = await queue.get(job_id)
+
+        restarted = JobQueue(backend, quick, workers=1)
+        await restarted.recover()
+        restarted.start()
+        for _ in range(100):
+            job = await restarted.get(job_id)
+            if job["status"] == "done":
+                break
+            await asyncio.sleep(0.01)
+        await restarted.stop()
+        return interrupted, job
+
+    interrupted, job = asyncio.run(run())
+    assert interrupted["items"][0]["status"] == "queued"
+    assert job["items"][0]["summary"] == "after restart"
+
+def test_redis_backend_leases_recovers_and_finishes_items(monkeypatch):
+    import fakeredis
+    from app.services import cache
+    from app.services.jobs import RedisJobBackend
+
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(cache, "_redis_client", redis)
+    backend = RedisJobBackend()
+    processing = backend._processing_key()
+    lease = backend._lease_key("v", "de")
+
+    async def run():
+        await backend.create_job("j1", {"v": {"status": "queued"}})
+        await backend.create_job("j2", {"v": {"status": "queued"}})
+        assert await backend.enqueue("j1", "v", "de")
+        assert not await backend.enqueue("j2", "v", "de")
+        assert await backend.dequeue(timeout=0.1) == ("v", "de")
+        assert await redis.lrange(processing, 0, -1) == ["v:de"]
+        assert await redis.ttl(lease) > 0
+
+        # Its worker dies: nothing is recovered while the lease is alive, then the item is re-queued
+        assert await backend.recover() == 0
+        await redis.delete(lease)
+        assert await backend.recover() == 1
+        assert await redis.lrange(processing, 0, -1) == []
+
+        # Interrupted again (shutdown): back at the head of the queue, still marked in flight
+        assert await backend.dequeue(timeout=0.1) == ("v", "de")
+        await backend.release("v", "de")
+        assert await redis.lrange(backend._queue_key(), 0, -1) == ["v:de"]
+        assert await redis.exists(backend._inflight_key("v", "de"))
+
+        # Finished: both jobs get the result and no queue state is left behind
+        assert await backend.dequeue(timeout=0.1) == ("v", "de")
+        await backend.update_item("v", "de", {"status": "done", "summary": "s"}, final=True)
+        jobs = [await backend.get_job("j1"), await backend.get_job("j2")]
+        return jobs, await redis.keys("*:jobs:*")
+
+    jobs, leftovers = asyncio.run(run())
+    assert all(job["items"]["v"] == {"status": "done", "summary": "s"} for job in jobs)
+    assert leftovers == []
+
+def test_workers_recover_abandoned_items_periodically(monkeypatch):
+    from app.services.jobs import settings
+
+    monkeypatch.setattr(settings, "job_lease_seconds", 0.05)
+    monkeypatch.setattr(settings, "job_poll_timeout_seconds", 0.01)
+    recoveries = []
+
+    class Backend(InMemoryJobBackend):
+        async def recover(self):
+            recoveries.append(1)
+            return 0
+
+    async def processor(video_id, language):
+        return "s"
+
+    async def run():
+        queue = JobQueue(Backend(), processor, workers=2)
+        queue.start()
+        await asyncio.sleep(0.2)
+        await queue.stop()
+
+    asyncio.run(run())
+    assert 2 <= len(recoveries) <= 5
@@ -0,0 +1,28 @@
+import asyncio
+import subprocess
+import sys
+import time
+from app import lifespan
+
+def test_importing_the_app_does_not_import_heavy_clients():
+    code = (
+        "import sys, app.main; "
+        "print([m for m in ('openai', 'redis', 'youtube_transcript_api') if m in sys.modules])"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+def test_warmup_steps_run_concurrently_and_failures_are_skipped(monkeypatch):
+    async def slow():
+        await asyncio.sleep(0.1)
+
+    async def broken():
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(lifespan, "WARMUP_STEPS", {"a": slow, "b": slow, "redis": broken})
+    started = time.perf_counter()
+    durations = asyncio.run(lifespan.warm_up())
+
+    assert time.perf_counter() - started < 0.19
+    assert durations["redis"] is None
+    assert durations["a"] >= 0.1 and durations["b"] >= 0.1
@@ -0,0 +1,38 @@
+from app.services.llm_routing import (
+    MIN_CHUNK_SUMMARY_TOKENS, estimate_cost, model_spec, pick_model, plan_summary, settings,
+)
+
+def test_short_transcripts_skip_the_map_phase(monkeypatch):
+    monkeypatch.setattr(settings, "summary_single_call_max_tokens", 6000)
+    plan = plan_summary(3000)
+    assert plan.single_call
+    assert plan.summary_model == settings.openai_reduce_model
+    assert not plan_summary(6001).single_call
+
+def test_mid_sized_transcripts_get_fewer_larger_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "summary_single_call_max_tokens", 0)
+    monkeypatch.setattr(settings, "max_tokens_per_chunk", 2000)
+    monkeypatch.setattr(settings, "summary_max_chunks", 4)
+    monkeypatch.setattr(settings, "summary_max_chunk_tokens", 10000)
+    monkeypatch.setattr(settings, "chunk_summary_output_ratio", 0.05)
+
+    mid = plan_summary(20000)
+    assert mid.chunk_tokens == 5000                 # 4 chunks instead of 10
+    assert mid.chunk_max_tokens == 250
+    # Small transcripts keep the configured chunk size and the minimum summary length
+    small = plan_summary(3000)
+    assert (small.chunk_tokens, small.chunk_max_tokens) == (2000, MIN_CHUNK_SUMMARY_TOKENS)
+    # Long ones are capped, so the chunk count grows again
+    assert plan_summary(200000).chunk_tokens == 10000
+
+def test_models_are_swapped_when_the_prompt_does_not_fit(monkeypatch):
+    monkeypatch.setattr(settings, "llm_models", {
+        "small": {"context_tokens": 8000, "max_output_tokens": 1000, "input_price": 0.1, "output_price": 0.4},
+        "big-cheap": {"context_tokens": 200000, "max_output_tokens": 4000, "input_price": 0.5, "output_price": 1.0},
+        "big-pricey": {"context_tokens": 200000, "max_output_tokens": 4000, "input_price": 5.0, "output_price": 10.0},
+    })
+    assert model_spec("small").context_tokens == 8000
+    assert pick_model("small", 5000, 500, ["big-pricey", "big-cheap"]) == "small"
+    assert pick_model("small", 50000, 500, ["small", "big-pricey", "big-cheap"]) == "big-cheap"
+    assert pick_model("small", 500000, 500, ["big-cheap"]) == "small"
+    assert estimate_cost("big-cheap", 1_000_000, 1_000_000) == 1.5
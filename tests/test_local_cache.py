@@ -0,0 +1,25 @@
+import time
+from app.services.local_cache import LocalCache
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = LocalCache(max_bytes=10, default_ttl_seconds=60)
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    assert cache.get("a") == "aaaa"   # a is now most recently used
+    cache.set("c", "cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.size_bytes == 8
+
+def test_expired_entries_only_served_when_stale_allowed():
+    cache = LocalCache(max_bytes=100, default_ttl_seconds=60)
+    cache.set("k", "v", ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert cache.get("k", allow_stale=True) == "v"
+
+def test_oversized_values_are_not_cached():
+    cache = LocalCache(max_bytes=3, default_ttl_seconds=60)
+    cache.set("k", "toolong")
+    assert cache.get("k") is None
+    assert len(cache) == 0
@@ -20,4 +20,85 @@ def test_summarize_transcript():
     # This will likely fail with 400/404 since it's not a real video, but we test the endpoint structure
     assert response.status_code in [200, 400, 404]
     if response.status_code == 200:
-        assert "summary" in response.json()
\ No newline at end of file
+        assert "summary" in response.json()
+
+def test_summarize_stream_rejects_invalid_url():
+    response = client.post("/summarize/stream", json={"url_or_id": "https://example.com/not-a-video"})
+    assert response.status_code == 404
+
+def test_metrics_track_http_latency_per_route():
+    client.get("/health")
+    response = client.get("/metrics")
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+
+def test_cached_summary_read_path_supports_etags_and_compression(monkeypatch):
+    import time
+    from app.routers import summary
+    from app.services.cache import SummaryEntry
+
+    entries = {"dQw4w9WgXcQ": SummaryEntry("word " * 500, time.time() + 60, None, "abc123")}
+
+    async def get_cached_summary(video_id, language="en"):
+        return entries.get(video_id)
+
+    monkeypatch.setattr(summary, "get_cached_summary", get_cached_summary)
+
+    response = client.get("/summary/dQw4w9WgXcQ", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc123"'
+    assert response.json() == {"summary": "word " * 500, "chapters": None}
+
+    response = client.get("/summary/dQw4w9WgXcQ", headers={"If-None-Match": 'W/"abc123"'})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    assert client.get("/summary/aaaaaaaaaaa").status_code == 404
+
+def test_streamed_summary_is_shared_with_concurrent_requests(monkeypatch):
+    import asyncio
+    from app.routers import transcript
+
+    runs = []
+
+    class Summarizer:
+        async def summarize_transcript_stream(self, segments):
+            runs.append(segments)
+            yield {"event": "chunks", "count": 1}
+            await asyncio.sleep(0.05)
+            yield {"event": "summary", "summary": "shared", "chapters": []}
+
+    async def fetch_segments(video_id, language):
+        return [{"text": "hello there", "start": 0.0, "duration": 2.0}]
+
+    async def no_reuse(video_id, language, segments):
+        return None, None
+
+    async def resolve(video_id, languages, url_or_id=None):
+        return "en"
+
+    async def nothing(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(transcript, "get_summarizer_service", Summarizer)
+    monkeypatch.setattr(transcript.youtube_service, "fetch_transcript_segments", fetch_segments)
+    monkeypatch.setattr(transcript.duplicates, "reuse_summary", no_reuse)
+    monkeypatch.setattr(transcript.duplicates, "remember", nothing)
+    monkeypatch.setattr(transcript, "resolve_summary_language", resolve)
+    monkeypatch.setattr(transcript.cache_svc, "get_summary_entry", nothing)
+    monkeypatch.setattr(transcript.cache_svc, "set_summary", nothing)
+    monkeypatch.setattr(transcript.summary_refresher, "record_access", lambda *args: None)
+
+    async def scenario():
+        async def stream():
+            return [event async for event in transcript._summarize_events("sharedvid01", ["en"], "sharedvid01")]
+
+        streaming = asyncio.ensure_future(stream())
+        await asyncio.sleep(0.01)
+        summary = await transcript.summarize_video("sharedvid01", "en")
+        return await streaming, summary
+
+    events, summary = asyncio.run(scenario())
+    assert summary == "shared"
+    assert len(runs) == 1
+    assert [e["event"] for e in events] == ["transcript", "chunks", "summary"]
@@ -0,0 +1,56 @@
+import asyncio
+import time
+import pytest
+from app.services.fetch_executor import FetchPoolSaturated
+from app.services.proxy_pool import ProxyEndpoint, ProxyPool, settings
+from app.services.youtube_service import _fetch_transcript_blocking
+from tests.fake_proxies import FakeTranscriptClient, NoTranscriptFound, run_inline
+
+def fetch(pool, video_id="vid"):
+    return asyncio.run(pool.fetch(lambda client: _fetch_transcript_blocking(video_id, "en", client)))
+
+def test_blocked_proxy_is_ejected_and_traffic_fails_over(monkeypatch):
+    monkeypatch.setattr(settings, "proxy_eject_after_errors", 2)
+    bad = FakeTranscriptClient("bad", blocked=True)
+    good = FakeTranscriptClient("good", latency=0.01)
+    pool = ProxyPool([ProxyEndpoint("bad", bad), ProxyEndpoint("good", good)], runner=run_inline)
+    # Make the bad proxy look fastest so it is tried first
+    pool.endpoints[0].ewma_latency = 0.001
+
+    for _ in range(4):
+        assert fetch(pool)[0]["text"] == "vid via good in en"
+
+    assert bad.calls == 2
+    assert pool.endpoints[0].ejected_until > time.monotonic()
+
+def test_slow_proxy_is_hedged(monkeypatch):
+    monkeypatch.setattr(settings, "proxy_hedge_default_delay_seconds", 0.02)
+    slow = FakeTranscriptClient("slow", latency=0.5)
+    fast = FakeTranscriptClient("fast", latency=0.01)
+    pool = ProxyPool([ProxyEndpoint("slow", slow), ProxyEndpoint("fast", fast)], runner=run_inline)
+    pool.endpoints[0].ewma_latency = 0.001
+
+    assert fetch(pool)[0]["text"] == "vid via fast in en"
+
+def test_video_errors_do_not_count_against_the_proxy():
+    client = FakeTranscriptClient("only")
+    pool = ProxyPool([ProxyEndpoint("only", client)], runner=run_inline, hedging=False)
+    with pytest.raises(NoTranscriptFound):
+        fetch(pool, "no-captions")
+    assert pool.endpoints[0].errors == 0
+
+def test_saturated_fetch_pool_is_neither_blamed_nor_failed_over():
+    first = FakeTranscriptClient("first")
+    second = FakeTranscriptClient("second")
+
+    attempts = []
+
+    async def saturated(fn, client):
+        attempts.append(client.name)
+        raise FetchPoolSaturated()
+
+    pool = ProxyPool([ProxyEndpoint("first", first), ProxyEndpoint("second", second)], runner=saturated)
+    with pytest.raises(FetchPoolSaturated):
+        fetch(pool)
+    assert [e.errors for e in pool.endpoints] == [0, 0]
+    assert len(attempts) == 1
@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from app.services.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test", distributed=False)
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "summary"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("abc:en", work) for _ in range(20)))
+
+    assert asyncio.run(run()) == ["summary"] * 20
+    assert calls == 1
+    assert not flight.in_flight("abc:en")
+
+def test_errors_propagate_to_all_waiters_and_are_not_cached():
+    flight = SingleFlight("test", distributed=False)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("k", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        return await flight.do("k", lambda: asyncio.sleep(0, result="ok"))
+
+    assert asyncio.run(run()) == "ok"
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    flight = SingleFlight("test", distributed=False)
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return 42
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == 42
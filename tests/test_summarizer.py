@@ -0,0 +1,185 @@
+import asyncio
+from app.services.summarizer import SummarizerService, settings
+
+def make_service(reduce_fn):
+    # Skip __init__ so no OpenAI client (or API key) is needed
+    service = SummarizerService.__new__(SummarizerService)
+    service._reduce = reduce_fn
+    return service
+
+def test_short_summaries_are_joined_without_reduce():
+    async def reduce(text, on_delta=None):
+        raise AssertionError("reduce should not be called")
+
+    service = make_service(reduce)
+    assert asyncio.run(service._combine_summaries(["a", "b"])) == "a b"
+
+def test_long_inputs_are_reduced_as_a_bounded_tree(monkeypatch):
+    monkeypatch.setattr(settings, "max_tokens_per_chunk", None)
+    monkeypatch.setattr(settings, "max_chars_per_chunk", 1000)
+    prompt_sizes = []
+
+    async def reduce(text, on_delta=None):
+        prompt_sizes.append(len(text))
+        return "r" * 100
+
+    service = make_service(reduce)
+    summaries = ["s" * 199 for _ in range(200)]
+    result = asyncio.run(service._combine_summaries(summaries))
+
+    assert result == "r" * 100
+    assert max(prompt_sizes) <= 1000
+    # 200 summaries -> 40 batches of 5 -> 5 batches of 9 -> 1 final reduce
+    assert len(prompt_sizes) == 40 + 5 + 1
+
+def test_final_reduce_stays_within_budget_when_levels_run_out(monkeypatch):
+    monkeypatch.setattr(settings, "max_tokens_per_chunk", None)
+    monkeypatch.setattr(settings, "max_chars_per_chunk", 1000)
+    monkeypatch.setattr(settings, "reduce_max_levels", 1)
+    prompt_sizes = []
+
+    async def reduce(text, on_delta=None):
+        prompt_sizes.append(len(text))
+        return "r " * 150
+
+    service = make_service(reduce)
+    summaries = ["s" * 199 for _ in range(200)]
+    asyncio.run(service._combine_summaries(summaries))
+
+    # One level of 40 batches leaves 12000 chars; the final prompt is cut to the budget
+    assert len(prompt_sizes) == 40 + 1
+    assert max(prompt_sizes) <= 1000
+
+class FakeChunkCache:
+    def __init__(self):
+        self.data = {}
+
+    async def get_chunk_summary(self, digest):
+        return self.data.get(digest)
+
+    async def set_chunk_summary(self, digest, summary):
+        self.data[digest] = summary
+
+def test_only_changed_chunks_call_the_llm():
+    calls = []
+
+    async def complete(model, messages, max_tokens):
+        calls.append(messages[1]["content"])
+        return f"summary {len(calls)}"
+
+    service = make_service(None)
+    service.cache = FakeChunkCache()
+    service._complete = complete
+
+    asyncio.run(service._summarize_chunks(["chunk one", "chunk two"]))
+    asyncio.run(service._summarize_chunks(["chunk one", "chunk two, revised"]))
+
+    assert len(calls) == 3
+    assert calls[-1].endswith("chunk two, revised")
+
+def test_segments_are_summarized_into_timed_chapters(monkeypatch):
+    monkeypatch.setattr(settings, "max_tokens_per_chunk", None)
+    monkeypatch.setattr(settings, "max_chars_per_chunk", 40)
+    monkeypatch.setattr(settings, "prefilter_enabled", False)
+    monkeypatch.setattr(settings, "summary_single_call_max_tokens", 0)
+
+    async def complete(model, messages, max_tokens):
+        return "about " + messages[1]["content"].split()[-1]
+
+    service = make_service(None)
+    service.cache = FakeChunkCache()
+    service._complete = complete
+    segments = [
+        {"text": "intro to the topic", "start": 0.0, "duration": 4.0},
+        {"text": "first main point", "start": 4.0, "duration": 5.0},
+        {"text": "second main point", "start": 9.0, "duration": 6.0},
+    ]
+    summary, chapters = asyncio.run(service.summarize_segments(segments))
+
+    assert chapters == [
+        {"start": 0.0, "end": 9.0, "summary": "about point"},
+        {"start": 9.0, "end": 15.0, "summary": "about point"},
+    ]
+    assert summary == "about point about point"
+
+def test_short_transcripts_are_summarized_in_one_call(monkeypatch):
+    monkeypatch.setattr(settings, "prefilter_enabled", False)
+    monkeypatch.setattr(settings, "summary_single_call_max_tokens", 1000)
+    calls = []
+
+    async def complete(model, messages, max_tokens):
+        calls.append((model, max_tokens))
+        return "whole video"
+
+    service = make_service(None)
+    service.cache = FakeChunkCache()
+    service._complete = complete
+    segments = [
+        {"text": "intro to the topic", "start": 0.0, "duration": 4.0},
+        {"text": "first main point", "start": 4.0, "duration": 5.0},
+    ]
+    summary, chapters = asyncio.run(service.summarize_segments(segments))
+
+    assert summary == "whole video"
+    assert chapters == [{"start": 0.0, "end": 9.0, "summary": "whole video"}]
+    assert calls == [(settings.openai_reduce_model, settings.summary_max_tokens)]
+
+def test_prefilter_runs_off_the_event_loop(monkeypatch):
+    import threading
+    from app.services import summarizer
+
+    monkeypatch.setattr(settings, "prefilter_enabled", True)
+    threads = []
+
+    def reduce_segments(segments, ratio, dedup_threshold):
+        threads.append(threading.current_thread())
+        return segments
+
+    monkeypatch.setattr(summarizer, "extractive_reduce_segments", reduce_segments)
+    segments = [{"text": "only segment", "start": 0.0, "duration": 1.0}]
+    assert asyncio.run(make_service(None)._prefilter_segments(segments)) == segments
+    assert threads and threads[0] is not threading.main_thread()
+
+def test_plain_text_goes_through_the_segment_path(monkeypatch):
+    monkeypatch.setattr(settings, "max_tokens_per_chunk", None)
+    monkeypatch.setattr(settings, "max_chars_per_chunk", 40)
+    monkeypatch.setattr(settings, "prefilter_enabled", False)
+    monkeypatch.setattr(settings, "summary_single_call_max_tokens", 0)
+    prompts = []
+
+    async def complete(model, messages, max_tokens):
+        prompts.append(messages[1]["content"])
+        return "s"
+
+    service = make_service(None)
+    service.cache = FakeChunkCache()
+    service._complete = complete
+    text = "First point here. Second point here. Third point here. Fourth point here."
+
+    assert asyncio.run(service.summarize_transcript(text)) == "s s"
+    assert len(prompts) == 2
+
+def test_segments_are_measured_once_for_routing_and_chunking(monkeypatch):
+    from app.services import summarizer
+
+    monkeypatch.setattr(settings, "max_tokens_per_chunk", 8)
+    monkeypatch.setattr(settings, "prefilter_enabled", False)
+    monkeypatch.setattr(settings, "summary_single_call_max_tokens", 0)
+    measured = []
+
+    def counter(text):
+        measured.append(text)
+        return len(text.split())
+
+    monkeypatch.setattr(summarizer, "get_token_counter", lambda model=None: counter)
+
+    async def complete(model, messages, max_tokens):
+        return "s"
+
+    service = make_service(None)
+    service.cache = FakeChunkCache()
+    service._complete = complete
+    segments = [{"text": f"segment number {i} words", "start": float(i), "duration": 1.0} for i in range(6)]
+    asyncio.run(service.summarize_segments(segments))
+
+    assert sorted(m for m in measured if m.startswith("segment")) == sorted(s["text"] for s in segments)
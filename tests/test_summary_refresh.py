@@ -0,0 +1,79 @@
+import asyncio
+import time
+from app.services import summary_refresh
+from app.services.cache import SummaryEntry, _unwrap_summary, _wrap_summary
+from app.services.summary_refresh import SummaryRefresher
+
+def test_summary_envelope_round_trip_and_plain_text_is_stale():
+    entry = _unwrap_summary(_wrap_summary("fresh summary"))
+    assert entry.summary == "fresh summary"
+    assert not entry.is_stale()
+    legacy = _unwrap_summary("an old plain-text summary")
+    assert legacy == SummaryEntry("an old plain-text summary", None)
+    assert legacy.is_stale()
+
+def test_stale_entry_is_refreshed_once(monkeypatch):
+    locks = set()
+
+    async def try_lock(name, ttl_seconds):
+        if name in locks:
+            return False
+        locks.add(name)
+        return True
+
+    monkeypatch.setattr(summary_refresh.cache_service, "try_lock", try_lock)
+    calls = []
+
+    async def refresh(video_id, language):
+        calls.append(video_id)
+        await asyncio.sleep(0.01)
+        return "new"
+
+    async def run():
+        refresher = SummaryRefresher(refresh, top_n=0)
+        for _ in range(5):
+            refresher.schedule("abc", "en")
+        await asyncio.sleep(0.05)
+        # The lock is still held, so another worker (or a later request) skips it
+        refresher.schedule("abc", "en")
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+    assert calls == ["abc"]
+
+def test_prewarm_refreshes_popular_entries_that_are_missing_or_about_to_go_stale(monkeypatch):
+    now = time.time()
+    entries = {
+        ("fresh", "en"): SummaryEntry("s", now + 3600),
+        ("soon", "en"): SummaryEntry("s", now + 30),
+        ("missing", "en"): None,
+    }
+    cache = summary_refresh.cache_service
+    decayed = []
+
+    async def try_lock(name, ttl_seconds):
+        return True
+
+    async def most_requested(n):
+        return list(entries)
+
+    async def get_summary_entries(items):
+        return {item: entries[item] for item in items}
+
+    async def decay_accesses(factor, keep):
+        decayed.append(keep)
+
+    monkeypatch.setattr(cache, "try_lock", try_lock)
+    monkeypatch.setattr(cache, "most_requested", most_requested)
+    monkeypatch.setattr(cache, "get_summary_entries", get_summary_entries)
+    monkeypatch.setattr(cache, "decay_accesses", decay_accesses)
+    calls = []
+
+    async def refresh(video_id, language):
+        calls.append(video_id)
+        return "new"
+
+    refresher = SummaryRefresher(refresh, top_n=3, interval_seconds=60)
+    assert asyncio.run(refresher.prewarm()) == ["soon:en", "missing:en"]
+    assert calls == ["soon", "missing"]
+    assert decayed == [30]
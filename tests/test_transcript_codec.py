@@ -0,0 +1,32 @@
+from app.services.youtube_service import transcript_to_text
+from app.utils.transcript_codec import CompactTranscript, encode_transcript, is_encoded_transcript
+
+SEGMENTS = [
+    {"text": "second line", "start": 2.5, "duration": 1.25},
+    {"text": "first\nline ", "start": 0.0, "duration": 2.5},
+    {"text": "  ", "start": 3.75, "duration": 0.5},
+]
+
+def test_round_trip_keeps_timing_and_text():
+    for compression in ("zstd", "zlib"):
+        data = encode_transcript(SEGMENTS, compression)
+        assert is_encoded_transcript(data)
+        decoded = CompactTranscript(data)
+        assert len(decoded) == 3
+        assert [s["start"] for s in decoded.segments] == [0.0, 2.5, 3.75]
+        assert [s["duration"] for s in decoded.segments] == [2.5, 1.25, 0.5]
+        assert decoded.segments[1]["text"] == "second line"
+
+def test_text_view_matches_transcript_to_text():
+    decoded = CompactTranscript(encode_transcript(SEGMENTS))
+    expected = transcript_to_text([dict(s, text=s["text"].replace("\n", " ")) for s in SEGMENTS])
+    assert decoded.text == expected == "first line second line"
+
+def test_encoding_is_smaller_than_json():
+    import json
+    segments = [{"text": f"segment number {i} of a long video", "start": i * 2.0, "duration": 2.0} for i in range(5000)]
+    assert len(encode_transcript(segments)) * 4 < len(json.dumps(segments))
+
+def test_empty_transcript():
+    decoded = CompactTranscript(encode_transcript([]))
+    assert decoded.segments == [] and decoded.text == ""
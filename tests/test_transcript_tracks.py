@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from app.services import youtube_service
+from app.services.proxy_pool import ProxyEndpoint, ProxyPool
+from app.services.youtube_service import TranscriptNotFound, choose_track
+from tests.fake_proxies import FakeTranscriptClient, _track, run_inline
+
+def listing(*tracks, translation_languages=("de", "en", "fr")):
+    return {
+        "tracks": list(tracks),
+        "translation_languages": [{"language_code": code, "language": code} for code in translation_languages],
+    }
+
+def test_choose_track_follows_preference_order_and_prefers_manual():
+    tracks = listing(_track("fr", is_generated=True), _track("de", is_generated=True), _track("de"))
+    assert choose_track(tracks, ["es", "de", "fr"]) == (_track("de"), None)
+    assert choose_track(tracks, ["fr", "de"]) == (_track("fr", is_generated=True), None)
+
+def test_choose_track_falls_back_to_translation():
+    tracks = listing(_track("de", is_generated=True), _track("fr"))
+    # A native track in any preferred language beats translating into the first
+    assert choose_track(tracks, ["en", "de"]) == (_track("de", is_generated=True), None)
+    # Otherwise the manual track is translated
+    assert choose_track(tracks, ["en"]) == (_track("fr"), "en")
+    with pytest.raises(TranscriptNotFound):
+        choose_track(tracks, ["ja"])
+    with pytest.raises(TranscriptNotFound):
+        choose_track(listing(_track("fr", translatable=False)), ["en"])
+
+@pytest.fixture
+def tracks_cache(monkeypatch):
+    stored = {}
+
+    async def get_transcript_tracks(video_id):
+        return stored.get(video_id, (None, None))[0]
+
+    async def set_transcript_tracks(video_id, tracks, ttl=None):
+        stored[video_id] = (tracks, ttl)
+
+    async def delete_transcript_tracks(video_id):
+        stored.pop(video_id, None)
+
+    cache = youtube_service.cache_service
+    monkeypatch.setattr(cache, "get_transcript_tracks", get_transcript_tracks)
+    monkeypatch.setattr(cache, "set_transcript_tracks", set_transcript_tracks)
+    monkeypatch.setattr(cache, "delete_transcript_tracks", delete_transcript_tracks)
+    return stored
+
+def use_client(monkeypatch, client):
+    pool = ProxyPool([ProxyEndpoint(client.name, client)], runner=run_inline, hedging=False)
+    monkeypatch.setattr(youtube_service, "proxy_pool", pool)
+
+def test_track_listing_is_cached_across_languages(monkeypatch, tracks_cache):
+    client = FakeTranscriptClient("only", tracks=[_track("en"), _track("de", is_generated=True)])
+    use_client(monkeypatch, client)
+
+    async def run():
+        en = await youtube_service.fetch_transcript_async("vid", "en")
+        de = await youtube_service.fetch_transcript_async("vid", "de")
+        fr = await youtube_service.fetch_transcript_async("vid", "fr")
+        return en, de, fr
+
+    en, de, fr = asyncio.run(run())
+    assert [en[0]["text"], de[0]["text"], fr[0]["text"]] == [
+        "vid via only in en", "vid via only in de", "vid via only in fr",
+    ]
+    assert client.list_calls == 1
+    assert asyncio.run(youtube_service.resolve_language("vid", ["ja", "de"])) == "de"
+    assert client.list_calls == 1
+
+def test_missing_transcripts_are_negatively_cached(monkeypatch, tracks_cache):
+    client = FakeTranscriptClient("only")
+    use_client(monkeypatch, client)
+    monkeypatch.setattr(youtube_service.settings, "cache_ttl_negative_seconds", 42)
+
+    for _ in range(3):
+        with pytest.raises(TranscriptNotFound):
+            asyncio.run(youtube_service.fetch_transcript_async("no-captions", "en"))
+    assert client.list_calls == 1
+    assert tracks_cache["no-captions"] == ({"error": "NoTranscriptFound"}, 42)
+
+def test_expired_cached_listing_is_refreshed_once(monkeypatch, tracks_cache):
+    client = FakeTranscriptClient("only")
+    use_client(monkeypatch, client)
+    expired = dict(_track("en"), url="expired")
+    tracks_cache["vid"] = (listing(expired), None)
+    fetch_track = client.fetch_track
+
+    def fail_on_expired_url(video_id, track, translate_to=None):
+        if track["url"] == "expired":
+            raise RuntimeError("403 Forbidden")
+        return fetch_track(video_id, track, translate_to)
+
+    monkeypatch.setattr(client, "fetch_track", fail_on_expired_url)
+    transcript = asyncio.run(youtube_service.fetch_transcript_async("vid", "en"))
+    assert transcript[0]["text"] == "vid via only in en"
+    assert client.list_calls == 1
+    assert tracks_cache["vid"][0]["tracks"] == [_track("en")]